@@ -1,6 +1,7 @@
 from django.contrib import admin
 from rest_framework.authtoken.models import Token
-from .models import CVUpload
+from . import search
+from .models import CVBatch, CVUpload
 import os
 
 
@@ -10,14 +11,16 @@ class CVUploadAdmin(admin.ModelAdmin):
         "display_filename",
         "uploaded_at",
         "processed",
+        "status",
         "target_job_role",
         "overall_score",
     )
 
+    # Extracted text is searched through the full-text index (analyzer.search)
+    # rather than an ILIKE scan over every CV
     search_fields = (
         "file",
         "target_job_role",
-        "raw_text",
     )
 
     list_filter = (
@@ -26,10 +29,35 @@ class CVUploadAdmin(admin.ModelAdmin):
         "uploaded_at",
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        unsearched = queryset
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            hits = search.search(search_term, limit=500)
+            queryset = queryset | unsearched.filter(pk__in=[hit["upload_id"] for hit in hits])
+        return queryset, may_have_duplicates
+
     def display_filename(self, obj):
         if obj.file:
             return os.path.basename(obj.file.name)
         return "(no file)"
 
+@admin.register(CVBatch)
+class CVBatchAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "user",
+        "job_name",
+        "status",
+        "total_files",
+        "created_at",
+        "finished_at",
+    )
+
+    list_filter = (
+        "status",
+        "created_at",
+    )
+
 # Register Token model to view tokens in admin
 admin.site.register(Token)
@@ -0,0 +1,125 @@
+"""
+CV files packed in an uploaded archive (.zip, .tar, .tar.gz/.tgz, .tar.bz2).
+
+ArchiveReader streams members: each one is decompressed only when the
+consumer asks for it, read into memory (at most one CV's size limit) and
+handed over as a file, and nothing is extracted to disk. Consumers hold
+few members at once: jobs.enqueue_batch stores each CV before the next is
+read, and jobs.receive_chunks keeps at most two chunks of them in memory.
+Members that break the CV file rules, and hidden or system files, are
+skipped and listed in `rejected`; going over the archive's member count or total decompressed
+size limit raises ArchiveError.
+"""
+import os
+import tarfile
+import zipfile
+import zlib
+from typing import Callable, IO, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from .models import CV_FILE_EXTENSIONS, CV_MAX_FILE_SIZE
+
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2")
+
+
+class ArchiveError(ValueError):
+    """Raised for an unreadable archive or one over the archive limits."""
+
+
+def is_archive(name: str) -> bool:
+    return (name or "").lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def max_members() -> int:
+    return max(1, int(getattr(settings, "CV_ARCHIVE_MAX_MEMBERS", 500)))
+
+
+def max_total_size() -> int:
+    return max(1, int(getattr(settings, "CV_ARCHIVE_MAX_TOTAL_SIZE", 200 * 1024 * 1024)))
+
+
+def check_cv_file(name: str, size: int) -> Optional[str]:
+    """Why a file may not be queued as a CV, or None if it may."""
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in CV_FILE_EXTENSIONS:
+        return f"unsupported file type: {ext or '(none)'}"
+    if size <= 0:
+        return "file is empty"
+    if size > CV_MAX_FILE_SIZE:
+        return "exceeds 5MB limit"
+    return None
+
+
+def _is_hidden(path: str) -> bool:
+    # macOS resource forks (__MACOSX/, ._name) and dotfiles; "" and "." are
+    # not names ("./cv.pdf", as written by `tar -czf cvs.tgz .`)
+    return any(
+        part.startswith((".", "__MACOSX")) for part in path.split("/") if part not in ("", ".")
+    )
+
+
+def _read_member(name: str, open_member: Callable[[], IO[bytes]]) -> Tuple[Optional[str], bytes]:
+    # Read one member: (why it may not be queued, or None; its bytes)
+    try:
+        with open_member() as member:
+            data = member.read(CV_MAX_FILE_SIZE + 1)
+    except NotImplementedError:
+        return "unsupported compression method", b""
+    except RuntimeError:
+        # zipfile's error for a password protected member
+        return "encrypted", b""
+    return check_cv_file(name, len(data)), data
+
+
+class ArchiveReader:
+    """
+    Iterate over the acceptable CV files of an uploaded archive. Each
+    iteration re-reads the archive from the start.
+    """
+
+    def __init__(self, upload, member_limit: Optional[int] = None, size_limit: Optional[int] = None):
+        self.upload = upload
+        self.member_limit = member_limit or max_members()
+        self.size_limit = size_limit or max_total_size()
+        self.rejected: List[str] = []
+
+    def __iter__(self) -> Iterator[ContentFile]:
+        self.rejected = []
+        members = total_size = 0
+        try:
+            for path, size, open_member in self._entries():
+                members += 1
+                total_size += size
+                if members > self.member_limit:
+                    raise ArchiveError(f"{self.upload.name}: more than {self.member_limit} files")
+                if total_size > self.size_limit:
+                    raise ArchiveError(
+                        f"{self.upload.name}: more than {self.size_limit // (1024 * 1024)}MB uncompressed"
+                    )
+                name = os.path.basename(path)
+                reason = "hidden or system file" if _is_hidden(path) else check_cv_file(name, size)
+                if reason is None:
+                    reason, data = _read_member(name, open_member)
+                if reason:
+                    self.rejected.append(f"{path}: {reason}")
+                    continue
+                yield ContentFile(data, name=name)
+        except (zipfile.BadZipFile, zipfile.LargeZipFile, tarfile.TarError, EOFError, zlib.error) as e:
+            raise ArchiveError(f"{self.upload.name}: not a readable archive ({e})") from e
+
+    def _entries(self) -> Iterator[Tuple[str, int, Callable[[], IO[bytes]]]]:
+        # (path, uncompressed size, opener) for regular file members
+        self.upload.seek(0)
+        if self.upload.name.lower().endswith(".zip"):
+            with zipfile.ZipFile(self.upload) as zf:
+                for info in zf.infolist():
+                    if not info.is_dir():
+                        yield info.filename, info.file_size, lambda info=info: zf.open(info)
+        else:
+            # Stream mode: members are read in order, without seeking back
+            with tarfile.open(fileobj=self.upload, mode="r|*") as tf:
+                for member in tf:
+                    if member.isfile():
+                        yield member.name, member.size, lambda member=member: tf.extractfile(member)
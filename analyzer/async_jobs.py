@@ -0,0 +1,185 @@
+"""
+Batch submission for the async (ASGI) views.
+
+asubmit_batch() mirrors jobs.submit_batch(). Batches that run after the
+request are stored and queued off the event loop. The rest are read a
+chunk at a time (jobs.receive_chunks), the next chunk being read while
+the files of the current one are extracted concurrently, with results
+saved as files finish; if processing fails, the batch's unfinished rows
+are marked failed. Extraction runs on one bounded executor shared by
+every request in the process: CV_PARSER_WORKERS spawned processes, or a
+single thread when that is 1. A slow PDF therefore holds one executor
+slot, not the event loop, and a burst of uploads queues for the executor
+instead of oversubscribing the CPU.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+
+from . import jobs, parse_cache
+from .cv_scorer import CVScorer
+from .models import CVBatch, CVUpload
+from .parser import CVParser, Source, _parse_job
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor: Optional[Executor] = None
+
+
+# --------------------------------------------------
+# EXTRACTION
+# --------------------------------------------------
+
+def extraction_executor() -> Executor:
+    """The process-wide executor extraction is offloaded to, created on first use."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            workers = jobs.parser_workers()
+            if workers > 1:
+                _executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cv-extract")
+        return _executor
+
+
+def _discard_executor(executor: Executor) -> None:
+    # A dead worker process breaks the whole pool; the next caller gets a new one
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aparse(parser: CVParser, source: Source, extension: str) -> Dict:
+    """
+    parser.parse_cv() on the extraction executor, with CV_PARSE_TIMEOUT
+    applied in worker processes. A file whose worker dies is retried once
+    on a fresh pool, then reported failed, as in CVParser.parse_many().
+    """
+    loop = asyncio.get_running_loop()
+    for _ in range(2):
+        executor = extraction_executor()
+        try:
+            return await loop.run_in_executor(
+                executor, _parse_job, parser, source, extension, jobs.parse_timeout()
+            )
+        except BrokenProcessPool:
+            _discard_executor(executor)
+        except Exception as e:
+            logger.error(f"Parse error: {e}")
+            return parser.failed_result(f"Error parsing file: {e}")
+    logger.error("Parser worker crashed")
+    return parser.failed_result("Error: parser worker crashed")
+
+
+async def _extract(parser: CVParser, key: int, name: str, content_hash: str, data: bytes) -> Tuple[int, Dict]:
+    # (key, parsed data), from the parse cache when the content was seen before
+    extension = os.path.splitext(name)[1].lower()
+    cached = await sync_to_async(parse_cache.get_parsed, thread_sensitive=False)(content_hash, extension, parser)
+    if cached is not None:
+        return key, cached
+    parsed_data = await aparse(parser, data, extension)
+    await sync_to_async(parse_cache.store_parsed, thread_sensitive=False)(
+        content_hash, extension, parser, parsed_data
+    )
+    return key, parsed_data
+
+
+# --------------------------------------------------
+# SUBMISSION
+# --------------------------------------------------
+
+def _enqueue_and_dispatch(user, files: Iterable, job_name: str, criteria: Dict) -> CVBatch:
+    batch = jobs.enqueue_batch(user, files, job_name, criteria)
+    jobs.dispatch_batch(batch)
+    return batch
+
+
+async def asubmit_batch(user, files: Iterable, job_name: str, criteria: Dict, store: bool = True) -> CVBatch:
+    """
+    jobs.submit_batch() for async views: same modes, same rows, same
+    EmptyBatch and archives.ArchiveError. Returns once the batch is queued,
+    or processed when it is processed in the request.
+    """
+    if store and jobs.queue_mode() != jobs.QUEUE_MODE_SYNC:
+        return await sync_to_async(_enqueue_and_dispatch)(user, files, job_name, criteria)
+
+    # Reading may decompress archive members, and inserts the rows: off the
+    # event loop, in the request's database thread. The next chunk is read
+    # while the current one extracts.
+    chunks = jobs.receive_chunks(user, files, job_name, criteria, store)
+    parser = jobs.build_parser()
+    scorer = CVScorer()
+    batch = None
+    error = None
+    upcoming = asyncio.ensure_future(sync_to_async(next)(chunks, None))
+    try:
+        while True:
+            chunk = await upcoming
+            if chunk is None:
+                return batch
+            batch, sources = chunk
+            files = await sync_to_async(_chunk_files)(list(sources))
+            upcoming = asyncio.ensure_future(sync_to_async(next)(chunks, None))
+            await process_chunk(sources, parser, scorer, files)
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        # The generator cannot be closed while a read is running in it
+        await asyncio.gather(upcoming, return_exceptions=True)
+        await sync_to_async(chunks.close)()
+        if error is not None and batch is not None:
+            await sync_to_async(jobs.fail_unfinished)(batch.pk, error)
+
+
+async def process_chunk(
+    sources: Dict[int, bytes],
+    parser: CVParser,
+    scorer: CVScorer,
+    files: Optional[List[Tuple[int, str, str]]] = None
+) -> int:
+    """
+    Extract, score and save claimed rows from their bytes (upload id ->
+    bytes): every file is extracted concurrently, and whatever finished
+    while the previous save ran is saved in one go. `files` is the rows'
+    _chunk_files(), looked up when not given. Returns the number of rows
+    processed.
+    """
+    if files is None:
+        files = await sync_to_async(_chunk_files)(list(sources))
+    pending = {
+        asyncio.ensure_future(_extract(parser, pk, name, content_hash, sources[pk]))
+        for pk, name, content_hash in files
+    }
+    count = 0
+    unsaved = set(sources)
+    renewed_at = time.monotonic()
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        results = dict(task.result() for task in done)
+        count += await sync_to_async(jobs.save_parsed)(results, scorer)
+        unsaved.difference_update(results)
+        if pending and time.monotonic() - renewed_at >= jobs.progress_flush_interval():
+            await sync_to_async(jobs.renew_claims)(unsaved)
+            renewed_at = time.monotonic()
+    return count
+
+
+def _chunk_files(ids: List[int]) -> List[Tuple[int, str, str]]:
+    # (id, file name, content hash) of a chunk's rows
+    return list(CVUpload.objects.filter(pk__in=ids).order_by("id").values_list("id", "file", "content_hash"))
@@ -0,0 +1,207 @@
+"""
+Synthetic CV corpus and timing helpers for the benchmark_* management
+commands. Nothing here touches the database.
+"""
+import math
+import os
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import docx
+
+from utiliy.keyword import KEYWORDS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FIRST_NAMES = ["Alex", "Sam", "Priya", "Chen", "Maria", "Omar", "Lena", "Kofi"]
+LAST_NAMES = ["Smith", "Patel", "Garcia", "Nguyen", "Okafor", "Muller", "Kim"]
+CITIES = ["Berlin", "London", "Toronto", "Nairobi", "Austin", "Pune"]
+ACTION_VERBS = ["Developed", "Designed", "Implemented", "Managed", "Led", "Optimized", "Built"]
+DEGREES = ["Bachelor of Science", "Master of Science", "MBA", "PhD", "BA"]
+SCHOOLS = ["State University", "Institute of Technology", "City College"]
+SOFT_SKILLS = ["communication", "teamwork", "leadership", "problem solving", "analytical"]
+
+
+def synthetic_cv(rng: random.Random, size: int = 1) -> Dict[str, str]:
+    """
+    One parsed CV in the shape CVParser.parse_cv() returns. `size` scales
+    the number of roles and bullet points.
+    """
+    role = rng.choice(list(KEYWORDS))
+    skills = rng.sample(KEYWORDS[role], min(len(KEYWORDS[role]), 4 + size)) + rng.sample(SOFT_SKILLS, 2)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    contact = f"{name.lower().replace(' ', '.')}@example.com\n+1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}"
+
+    experience = []
+    for _ in range(2 * size):
+        start = rng.randint(2000, 2018)
+        experience.append(f"{role.title()} at Company {rng.randint(1, 99)} {start} - {start + rng.randint(1, 5)}")
+        for _ in range(3):
+            experience.append(
+                f"- {rng.choice(ACTION_VERBS)} {rng.choice(KEYWORDS[role])} work, "
+                f"improving throughput by {rng.randint(5, 60)}%"
+            )
+    education = f"{rng.choice(DEGREES)}\n{rng.choice(SCHOOLS)} {rng.randint(1995, 2020)}\nGPA 3.{rng.randint(0, 9)}"
+
+    raw_text = "\n".join([
+        name, contact, f"Location: {rng.choice(CITIES)} city",
+        "Summary", f"Experienced {role} with a focus on {skills[0]}.",
+        "Experience", *experience,
+        "Education", education,
+        "Skills", "Technical: " + ", ".join(skills),
+        "Projects", f"- Built an internal {skills[-1]} dashboard",
+    ])
+    return {
+        "raw_text": raw_text,
+        "contact_info": contact.replace("\n", "; "),
+        "experience": "\n".join(experience[:15]),
+        "education": education,
+        "skills": "\n".join(skills),
+        "summary": f"Experienced {role}",
+        "projects": f"Built an internal {skills[-1]} dashboard",
+        "certifications": "No certifications section found",
+    }
+
+
+def synthetic_corpus(count: int, seed: int = 0, max_size: int = 3) -> List[Dict[str, str]]:
+    rng = random.Random(seed)
+    return [synthetic_cv(rng, rng.randint(1, max_size)) for _ in range(count)]
+
+
+# --------------------------------------------------
+# FILE CORPUS
+# --------------------------------------------------
+
+def write_txt(path: str, text: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_docx(path: str, text: str) -> None:
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def _pdf_escape(line: str) -> bytes:
+    line = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return line.encode("latin-1", "replace")
+
+
+def write_pdf(path: str, text: str, lines_per_page: int = 45) -> None:
+    """Write `text` as a minimal multi-page PDF with one Helvetica text block per page."""
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Object 1: catalog, 2: page tree, 3: font, then a (page, content) pair per page
+    objects = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_lines in pages:
+        stream = b"BT /F1 10 Tf 12 TL 50 800 Td " + b" ".join(
+            b"(" + _pdf_escape(line) + b") Tj T*" for line in page_lines
+        ) + b" ET"
+        page_number = len(objects) + 1
+        kids.append(f"{page_number} 0 R".encode())
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents " + f"{page_number + 1} 0 R".encode() + b" >>"
+        )
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count " + str(len(kids)).encode() + b" >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+FILE_WRITERS = {".txt": write_txt, ".docx": write_docx, ".pdf": write_pdf}
+
+
+def build_file_corpus(
+    directory: str,
+    count: int,
+    seed: int = 0,
+    max_size: int = 6,
+    extensions: Tuple[str, ...] = (".pdf", ".docx", ".txt")
+) -> List[Tuple[str, str]]:
+    """
+    Write `count` synthetic CVs into `directory`, cycling through
+    `extensions`, with sizes from 1 to `max_size` (larger sizes spill PDFs
+    onto several pages). Returns (path, extension) pairs.
+    """
+    rng = random.Random(seed)
+    files = []
+    for index in range(count):
+        extension = extensions[index % len(extensions)]
+        parsed = synthetic_cv(rng, rng.randint(1, max_size))
+        path = os.path.join(directory, f"cv_{index:05d}{extension}")
+        FILE_WRITERS[extension](path, parsed["raw_text"])
+        files.append((path, extension))
+    return files
+
+
+# --------------------------------------------------
+# TIMING
+# --------------------------------------------------
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    divisor = 1024 * 1024 if os.uname().sysname == "Darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted sample list."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[float], items: Optional[int] = None) -> Dict[str, float]:
+    """
+    Throughput and latency percentiles for per-call samples in ms. `items`
+    is the number of CVs processed across all calls (default: one per call).
+    """
+    total_s = sum(samples) / 1000
+    items = len(samples) if items is None else items
+    return {
+        "calls": len(samples),
+        "items": items,
+        "total_s": round(total_s, 3),
+        "throughput_per_s": round(items / total_s, 2) if total_s else None,
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p50_ms": round(percentile(samples, 50), 4),
+        "p95_ms": round(percentile(samples, 95), 4),
+        "p99_ms": round(percentile(samples, 99), 4),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def time_each(func: Callable, items: List, repeat: int = 1) -> Dict[str, float]:
+    """Call func(item) for every item and summarise per-call latency."""
+    samples = []
+    for _ in range(repeat):
+        for item in items:
+            started = time.perf_counter()
+            func(item)
+            samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
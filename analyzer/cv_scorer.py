@@ -1,6 +1,16 @@
-import re
 from typing import Dict, List, Tuple, Optional
+
+import numpy as np
+
 from utiliy.keyword import KEYWORDS
+from utiliy.keyword_matcher import KEYWORD_MATCHER
+from utiliy.title_index import resolve_job_title
+
+from .patterns import EMAIL_RE, METRIC_RE, PHONE_RE, SKILL_LIST_SPLIT_RE, YEAR_RE
+
+# Bump whenever scoring or matching changes in a way that alters stored
+# results; it is part of the results page cache keys and ETags.
+SCORING_VERSION = 1
 
 # ------------------ SCORING CONSTANTS ------------------
 CONTACT_EMAIL_SCORE = 40
@@ -19,31 +29,76 @@ EDU_YEAR_SCORE = 20
 EDU_HONORS_SCORE = 10
 
 SKILL_COUNT_MAX_SCORE = 40
+SKILL_COUNT_MID_SCORE = 30
+SKILL_COUNT_MIN_SCORE = 20
 SKILL_TECH_SCORE = 30
 SKILL_SOFT_SCORE = 20
 SKILL_CATEGORY_SCORE = 10
 
-# ------------------ HELPER FUNCTIONS ------------------
-def normalize_text(text: str) -> str:
-    """Lowercase and remove non-alphabetic characters for comparison."""
-    return re.sub(r'[^a-z\s]', '', text.lower())
+FORMAT_LENGTH_SCORE = 30
+FORMAT_HEADERS_SCORE = 25
+FORMAT_STRUCTURE_SCORE = 25
+FORMAT_BULLETS_SCORE = 20
+
+# ------------------ SCORING FEATURES ------------------
+# Each section score is the sum of the points of the features a CV hits,
+# capped at 100. A missed feature adds its suggestion (if any). The skill
+# count tiers are cumulative: 3+ skills = 20, 5+ = 30, 8+ = 40.
+SECTION_FEATURES = {
+    "contact": [
+        (CONTACT_EMAIL_SCORE, "Add a professional email address."),
+        (CONTACT_PHONE_SCORE, "Include a phone number."),
+        (CONTACT_LOCATION_SCORE, "Add your location (city/country)."),
+        (CONTACT_LINK_SCORE, "Add LinkedIn, GitHub, or portfolio links."),
+    ],
+    "experience": [
+        (EXPERIENCE_DETAIL_SCORE, "Add more detailed bullet points to your experience."),
+        (EXPERIENCE_DATE_SCORE, "Include employment dates for each role."),
+        (EXPERIENCE_ACTION_SCORE, "Use strong action verbs to describe your work."),
+        (EXPERIENCE_METRIC_SCORE, "Add measurable results (numbers, %, impact)."),
+    ],
+    "education": [
+        (EDU_DEGREE_SCORE, "Specify your degree type."),
+        (EDU_INSTITUTE_SCORE, "Include institution name."),
+        (EDU_YEAR_SCORE, "Add graduation or expected graduation year."),
+        (EDU_HONORS_SCORE, "Add GPA or academic honors if strong."),
+    ],
+    "skills": [
+        (SKILL_COUNT_MIN_SCORE, "List at least 5–10 relevant skills."),
+        (SKILL_COUNT_MID_SCORE - SKILL_COUNT_MIN_SCORE, None),
+        (SKILL_COUNT_MAX_SCORE - SKILL_COUNT_MID_SCORE, None),
+        (SKILL_TECH_SCORE, "Add more technical skills relevant to your field."),
+        (SKILL_SOFT_SCORE, "Add key soft skills."),
+        (SKILL_CATEGORY_SCORE, "Group skills into categories (Technical / Soft)."),
+    ],
+    "format": [
+        (FORMAT_LENGTH_SCORE, "Keep CV length between 1–2 pages."),
+        (FORMAT_HEADERS_SCORE, "Use clear section headers."),
+        (FORMAT_STRUCTURE_SCORE, "Improve spacing and structure."),
+        (FORMAT_BULLETS_SCORE, "Use bullet points for readability."),
+    ],
+}
+
+# Returned instead of feature suggestions when a section is empty
+EMPTY_SECTION_SUGGESTIONS = {
+    "experience": "Add a work experience section with roles and achievements.",
+    "education": "Add your education details.",
+    "skills": "Add a skills section.",
+}
 
+LOCATION_KEYWORDS = ["city", "country", "location", "address"]
+PROFILE_LINK_KEYWORDS = ["linkedin", "github", "portfolio"]
+ACTION_VERBS = ["developed","designed","implemented","managed","led","optimized","improved","built","created"]
+DEGREE_KEYWORDS = ["bachelor","master","phd","degree","bs","ba","ms","mba"]
+HONORS_KEYWORDS = ["gpa","honors","cum laude","dean"]
+TECH_SKILLS = ["python","java","sql","javascript","tensorflow","pytorch","aws","react","database"]
+SOFT_SKILLS = ["communication","teamwork","leadership","problem solving","analytical"]
+FORMAT_SECTIONS = ["experience","education","skills","summary","projects"]
+
+# ------------------ HELPER FUNCTIONS ------------------
 def find_matching_job_title(user_job_title: str) -> Optional[str]:
     """Return the best matching job title from KEYWORDS."""
-    if not user_job_title:
-        return None
-    user_norm = normalize_text(user_job_title)
-    best_match = None
-    best_score = 0
-    user_words = set(user_norm.split())
-    
-    for job_title in KEYWORDS.keys():
-        job_words = set(normalize_text(job_title).split())
-        overlap = len(user_words & job_words) / max(len(user_words), len(job_words))
-        if overlap > best_score:
-            best_score = overlap
-            best_match = job_title
-    return best_match if best_score >= 0.3 else None
+    return resolve_job_title(user_job_title)
 
 def generate_job_keyword_suggestions(resume_text: str, job_name: str) -> List[str]:
     """Return a list of targeted keyword suggestions based on job keywords."""
@@ -56,10 +111,7 @@ def generate_job_keyword_suggestions(resume_text: str, job_name: str) -> List[st
         return [f"No keyword data found for '{job_name}'. Available roles: {', '.join(KEYWORDS.keys())}"]
     
     expected_keywords = KEYWORDS[matched_job]
-    resume_norm = normalize_text(resume_text)
-    
-    present = [k for k in expected_keywords if normalize_text(k) in resume_norm]
-    missing = [k for k in expected_keywords if k not in present]
+    present, missing = KEYWORD_MATCHER.match_role(matched_job, resume_text)
     
     if present:
         suggestions.append(f"✅ Keywords found for {matched_job}: {', '.join(present[:8])}{'...' if len(present) > 8 else ''}")
@@ -108,168 +160,150 @@ class CVScorer:
             "format": 0.10
         }
 
-    # ---------------- Contact Info ----------------
-    def score_contact_info(self, contact_info: str, raw_text: str) -> Tuple[float, List[str]]:
-        score = 0
-        suggestions = []
-
+    # ---------------- Feature Hits ----------------
+    # Each *_features method returns one bool per SECTION_FEATURES entry,
+    # or None when the section is empty.
+    def contact_features(self, contact_info: str, raw_text: str) -> List[bool]:
         text = f"{contact_info}\n{raw_text}".lower()
-        email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"
-        phone_pattern = r"(?:\+\d{1,3}\s?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}"
-
-        if re.search(email_pattern, text):
-            score += CONTACT_EMAIL_SCORE
-        else:
-            suggestions.append("Add a professional email address.")
-        if re.search(phone_pattern, text):
-            score += CONTACT_PHONE_SCORE
-        else:
-            suggestions.append("Include a phone number.")
-        if any(k in text for k in ["city", "country", "location", "address"]):
-            score += CONTACT_LOCATION_SCORE
-        else:
-            suggestions.append("Add your location (city/country).")
-        if any(k in text for k in ["linkedin", "github", "portfolio"]):
-            score += CONTACT_LINK_SCORE
-        else:
-            suggestions.append("Add LinkedIn, GitHub, or portfolio links.")
-        return min(score, 100), suggestions
-
-    # ---------------- Experience ----------------
-    def score_experience(self, experience: str) -> Tuple[float, List[str]]:
-        score = 0
-        suggestions = []
+        return [
+            bool(EMAIL_RE.search(text)),
+            bool(PHONE_RE.search(text)),
+            any(k in text for k in LOCATION_KEYWORDS),
+            any(k in text for k in PROFILE_LINK_KEYWORDS),
+        ]
+
+    def experience_features(self, experience: str) -> Optional[List[bool]]:
         if not experience.strip():
-            return 0, ["Add a work experience section with roles and achievements."]
+            return None
         lines = [l.strip() for l in experience.split("\n") if l.strip()]
-        if len(lines) >= 3:
-            score += EXPERIENCE_DETAIL_SCORE
-        else:
-            suggestions.append("Add more detailed bullet points to your experience.")
-        year_pattern = r"\b(19|20)\d{2}\b"
-        if any(re.search(year_pattern, line) for line in lines):
-            score += EXPERIENCE_DATE_SCORE
-        else:
-            suggestions.append("Include employment dates for each role.")
-        action_verbs = ["developed","designed","implemented","managed","led","optimized","improved","built","created"]
-        if any(v in experience.lower() for v in action_verbs):
-            score += EXPERIENCE_ACTION_SCORE
-        else:
-            suggestions.append("Use strong action verbs to describe your work.")
-        metric_pattern = r"\b\d+%|\$\d+|\b\d+\s?(k|m|million|thousand)\b"
-        if re.search(metric_pattern, experience.lower()):
-            score += EXPERIENCE_METRIC_SCORE
-        else:
-            suggestions.append("Add measurable results (numbers, %, impact).")
-        return min(score, 100), suggestions
-
-    # ---------------- Education ----------------
-    def score_education(self, education: str) -> Tuple[float, List[str]]:
-        score = 0
-        suggestions = []
+        lower = experience.lower()
+        return [
+            len(lines) >= 3,
+            any(YEAR_RE.search(line) for line in lines),
+            any(v in lower for v in ACTION_VERBS),
+            bool(METRIC_RE.search(lower)),
+        ]
+
+    def education_features(self, education: str) -> Optional[List[bool]]:
         if not education.strip():
-            return 0, ["Add your education details."]
+            return None
         text = education.lower()
-        degree_keywords = ["bachelor","master","phd","degree","bs","ba","ms","mba"]
-        if any(k in text for k in degree_keywords):
-            score += EDU_DEGREE_SCORE
-        else:
-            suggestions.append("Specify your degree type.")
-        if len(education.split("\n")) >= 2:
-            score += EDU_INSTITUTE_SCORE
-        else:
-            suggestions.append("Include institution name.")
-        if re.search(r"\b(19|20)\d{2}\b", text):
-            score += EDU_YEAR_SCORE
-        else:
-            suggestions.append("Add graduation or expected graduation year.")
-        if any(k in text for k in ["gpa","honors","cum laude","dean"]):
-            score += EDU_HONORS_SCORE
-        else:
-            suggestions.append("Add GPA or academic honors if strong.")
-        return min(score, 100), suggestions
-
-    # ---------------- Skills ----------------
-    def score_skills(self, skills: str) -> Tuple[float, List[str]]:
-        score = 0
-        suggestions = []
+        return [
+            any(k in text for k in DEGREE_KEYWORDS),
+            len(education.split("\n")) >= 2,
+            bool(YEAR_RE.search(text)),
+            any(k in text for k in HONORS_KEYWORDS),
+        ]
+
+    def skills_features(self, skills: str) -> Optional[List[bool]]:
         if not skills.strip():
-            return 0, ["Add a skills section."]
-        skill_list = re.split(r"[,\n•\-*]+", skills)
+            return None
+        skill_list = SKILL_LIST_SPLIT_RE.split(skills)
         skill_list = [s.strip().lower() for s in skill_list if s.strip()]
         count = len(skill_list)
-        if count >= 8:
-            score += SKILL_COUNT_MAX_SCORE
-        elif count >= 5:
-            score += 30
-        elif count >= 3:
-            score += 20
-        else:
-            suggestions.append("List at least 5–10 relevant skills.")
-        tech_keywords = ["python","java","sql","javascript","tensorflow","pytorch","aws","react","database"]
-        if any(s in skill_list for s in tech_keywords):
-            score += SKILL_TECH_SCORE
-        else:
-            suggestions.append("Add more technical skills relevant to your field.")
-        soft_keywords = ["communication","teamwork","leadership","problem solving","analytical"]
-        if any(s in skill_list for s in soft_keywords):
-            score += SKILL_SOFT_SCORE
-        else:
-            suggestions.append("Add key soft skills.")
-        if ":" in skills or "technical" in skills.lower():
-            score += SKILL_CATEGORY_SCORE
-        else:
-            suggestions.append("Group skills into categories (Technical / Soft).")
-        return min(score, 100), suggestions
-
-    # ---------------- Format ----------------
+        return [
+            count >= 3,
+            count >= 5,
+            count >= 8,
+            any(s in skill_list for s in TECH_SKILLS),
+            any(s in skill_list for s in SOFT_SKILLS),
+            ":" in skills or "technical" in skills.lower(),
+        ]
+
+    def format_features(self, raw_text: str) -> List[bool]:
+        lower = raw_text.lower()
+        return [
+            200 <= len(raw_text.split()) <= 800,
+            sum(1 for s in FORMAT_SECTIONS if s in lower) >= 4,
+            len([l for l in raw_text.split("\n") if l.strip()]) > 12,
+            any(c in raw_text for c in ["•","-","*"]),
+        ]
+
+    def feature_hits(self, parsed_data: Dict) -> Dict[str, Optional[List[bool]]]:
+        raw_text = parsed_data.get("raw_text", "")
+        return {
+            "contact": self.contact_features(parsed_data.get("contact_info", ""), raw_text),
+            "experience": self.experience_features(parsed_data.get("experience", "")),
+            "education": self.education_features(parsed_data.get("education", "")),
+            "skills": self.skills_features(parsed_data.get("skills", "")),
+            "format": self.format_features(raw_text),
+        }
+
+    def section_suggestions(self, section: str, hits: Optional[List[bool]]) -> List[str]:
+        if hits is None:
+            return [EMPTY_SECTION_SUGGESTIONS[section]]
+        return [
+            suggestion for (_, suggestion), hit in zip(SECTION_FEATURES[section], hits)
+            if not hit and suggestion
+        ]
+
+    def section_score(self, section: str, hits: Optional[List[bool]]) -> Tuple[float, List[str]]:
+        if hits is None:
+            return 0, self.section_suggestions(section, hits)
+        score = sum(points for (points, _), hit in zip(SECTION_FEATURES[section], hits) if hit)
+        return min(score, 100), self.section_suggestions(section, hits)
+
+    # ---------------- Section Scores ----------------
+    def score_contact_info(self, contact_info: str, raw_text: str) -> Tuple[float, List[str]]:
+        return self.section_score("contact", self.contact_features(contact_info, raw_text))
+
+    def score_experience(self, experience: str) -> Tuple[float, List[str]]:
+        return self.section_score("experience", self.experience_features(experience))
+
+    def score_education(self, education: str) -> Tuple[float, List[str]]:
+        return self.section_score("education", self.education_features(education))
+
+    def score_skills(self, skills: str) -> Tuple[float, List[str]]:
+        return self.section_score("skills", self.skills_features(skills))
+
     def score_format(self, raw_text: str) -> Tuple[float, List[str]]:
-        score = 0
-        suggestions = []
-        word_count = len(raw_text.split())
-        if 200 <= word_count <= 800:
-            score += 30
-        else:
-            suggestions.append("Keep CV length between 1–2 pages.")
-        sections = ["experience","education","skills","summary","projects"]
-        if sum(1 for s in sections if s in raw_text.lower()) >= 4:
-            score += 25
-        else:
-            suggestions.append("Use clear section headers.")
-        if len([l for l in raw_text.split("\n") if l.strip()]) > 12:
-            score += 25
-        else:
-            suggestions.append("Improve spacing and structure.")
-        if any(c in raw_text for c in ["•","-","*"]):
-            score += 20
-        else:
-            suggestions.append("Use bullet points for readability.")
-        return min(score, 100), suggestions
+        return self.section_score("format", self.format_features(raw_text))
 
     # ---------------- Final Scoring ----------------
-    def score_cv(self, parsed_data: Dict, job_name: Optional[str] = "") -> Dict:
-        scores = {}
-        suggestions = []
-
-        scores["contact"], s = self.score_contact_info(
-            parsed_data.get("contact_info", ""), parsed_data.get("raw_text", "")
-        )
-        suggestions.extend(s)
+    def overall_score(self, scores: Dict[str, float]) -> float:
+        """Weighted overall score; every scoring path rounds this same sum."""
+        return round(sum(scores[k]*self.weights[k] for k in self.weights), 1)
 
-        scores["experience"], s = self.score_experience(parsed_data.get("experience", ""))
-        suggestions.extend(s)
+    def overall_scores(self, section_scores: np.ndarray) -> List[float]:
+        """
+        overall_score() of each row of a (CVs x sections) matrix, columns
+        in self.weights order. The weighted sums are computed for the whole
+        batch at once, column by column in weights order rather than with a
+        matrix product: BLAS may fuse multiply-adds or reorder the sum (a
+        one-row product gives 18.7 for 18.75), and .x5 boundaries must
+        round as in overall_score().
+        """
+        totals = np.zeros(len(section_scores))
+        for column, weight in enumerate(self.weights.values()):
+            totals += section_scores[:, column] * weight
+        return [round(total, 1) for total in totals.tolist()]
 
-        scores["education"], s = self.score_education(parsed_data.get("education", ""))
-        suggestions.extend(s)
+    def score_hits(self, all_hits: Dict[str, Optional[List[bool]]]) -> Dict:
+        """Section and overall scores from stored feature hits, no text needed."""
+        scores = {section: self.section_score(section, hits)[0] for section, hits in all_hits.items()}
+        return {
+            "overall_score": self.overall_score(scores),
+            "section_scores": scores,
+        }
 
-        scores["skills"], s = self.score_skills(parsed_data.get("skills", ""))
-        suggestions.extend(s)
+    def score_cv(
+        self,
+        parsed_data: Dict,
+        job_name: Optional[str] = "",
+        hits: Optional[Dict[str, Optional[List[bool]]]] = None
+    ) -> Dict:
+        """`hits` may pass in feature_hits(parsed_data) when the caller already has it."""
+        if hits is None:
+            hits = self.feature_hits(parsed_data)
+        scores = {}
+        suggestions = []
 
-        scores["format"], s = self.score_format(parsed_data.get("raw_text", ""))
-        suggestions.extend(s)
+        for section, section_hits in hits.items():
+            scores[section], s = self.section_score(section, section_hits)
+            suggestions.extend(s)
 
         # Overall weighted score
-        overall_score = round(sum(scores[k]*self.weights[k] for k in self.weights), 1)
+        overall_score = self.overall_score(scores)
 
         # ---------------- Job-specific keyword suggestions ----------------
         if job_name:
@@ -281,3 +315,48 @@ class CVScorer:
             "section_scores": scores,
             "suggestions": suggestions[:15]  # limit to avoid overload
         }
+
+    # ---------------- Batch Scoring ----------------
+    def score_batch(self, parsed_list: List[Dict], job_name: Optional[str] = "") -> List[Dict]:
+        """
+        Score many CVs against one job; returns the same dicts as calling
+        score_cv() on each. Feature hits for all CVs go into one
+        (CVs x features) matrix; section scores come from one matrix
+        product with the points, and overall scores are weighted over the
+        whole batch (see overall_scores()). Only suggestions are built row
+        by row.
+        """
+        if not parsed_list:
+            return []
+
+        sections = list(self.weights)
+        features = [(section, points) for section in sections for points, _ in SECTION_FEATURES[section]]
+
+        # points[f, s] = points feature f adds to section s
+        points = np.zeros((len(features), len(sections)))
+        for f, (section, value) in enumerate(features):
+            points[f, sections.index(section)] = value
+
+        all_hits = [self.feature_hits(parsed) for parsed in parsed_list]
+        hit_matrix = np.array([
+            [hit for section in sections for hit in (hits[section] or [False] * len(SECTION_FEATURES[section]))]
+            for hits in all_hits
+        ], dtype=float)
+
+        section_scores = np.minimum(hit_matrix @ points, 100)
+        overall_scores = self.overall_scores(section_scores)
+
+        results = []
+        for parsed, hits, row, overall in zip(parsed_list, all_hits, section_scores, overall_scores):
+            scores = {section: int(score) for section, score in zip(sections, row)}
+            suggestions = []
+            for section in sections:
+                suggestions.extend(self.section_suggestions(section, hits[section]))
+            if job_name:
+                suggestions.extend(generate_job_keyword_suggestions(parsed.get("raw_text", ""), job_name))
+            results.append({
+                "overall_score": overall,
+                "section_scores": scores,
+                "suggestions": suggestions[:15]
+            })
+        return results
@@ -0,0 +1,127 @@
+"""
+Structured features derived once from a parsed CV and stored with the
+upload (CVUpload.features, plus the experience_years and degree_level
+columns), so scoring, matching and filtering can run on them without
+touching the extracted text again.
+"""
+import re
+from typing import Dict, List, Optional
+
+from .patterns import EMAIL_RE, PHONE_RE
+
+# Bump whenever extraction below changes in a way that alters stored
+# records; `manage.py refresh_cv_features` recomputes out-of-date rows.
+FEATURES_VERSION = 1
+
+# Education criteria values (forms.EDUCATION_CHOICES, lowercased) and their
+# order, lowest first
+EDUCATION_LEVELS = {"high school": 1, "diploma": 2, "bachelors": 3, "masters": 4, "phd": 5}
+
+# Wording that signals a degree level, for degree_level
+DEGREE_LEVEL_KEYWORDS = [
+    ("high school", 1), ("secondary school", 1),
+    ("diploma", 2), ("associate", 2),
+    ("bachelor", 3), ("b.sc", 3), ("undergraduate", 3),
+    ("master", 4), ("m.sc", 4), ("mba", 4),
+    ("phd", 5), ("ph.d", 5), ("doctor", 5),
+]
+
+DATE_RANGE_RE = re.compile(r'(\d{4})\s*[-–]\s*(\d{4})')
+CENTURY_RE = re.compile(r'\b(19|20)\d{2}\b')
+MATCH_SKILL_SPLIT_RE = re.compile(r',|;')
+
+
+def experience_years(experience: str) -> int:
+    """Years covered by the date ranges in an experience section."""
+    years = 0
+    for start, end in DATE_RANGE_RE.findall(experience or ""):
+        years += max(0, int(end) - int(start))
+    if years == 0:
+        # Kept from the original matcher: findall() returns the century
+        # group, so this is 1 when both 19xx and 20xx years appear.
+        centuries = [int(s) for s in CENTURY_RE.findall(experience or "")]
+        if centuries:
+            years = max(centuries) - min(centuries)
+    return years
+
+
+def degree_level(education: str) -> int:
+    """Highest level in DEGREE_LEVEL_KEYWORDS mentioned, 0 for none."""
+    text = (education or "").lower()
+    return max((level for keyword, level in DEGREE_LEVEL_KEYWORDS if keyword in text), default=0)
+
+
+def education_terms(education: str) -> List[str]:
+    """The EDUCATION_LEVELS criteria values that occur in the section text."""
+    text = (education or "").lower()
+    return [term for term in EDUCATION_LEVELS if term in text]
+
+
+def skill_set(skills: str) -> List[str]:
+    """Sorted, de-duplicated skills as criteria matching splits them."""
+    return sorted({s.strip().lower() for s in MATCH_SKILL_SPLIT_RE.split(skills or "") if s.strip()})
+
+
+def match_features(experience: str, education: str, skills: str) -> Dict:
+    """The features job matching needs, derived from section text."""
+    return {
+        "experience_years": experience_years(experience),
+        "degree_level": degree_level(education),
+        "education_terms": education_terms(education),
+        "skills": skill_set(skills),
+    }
+
+
+def extract_features(parsed_data: Dict, hits: Optional[Dict[str, Optional[List[bool]]]] = None) -> Dict:
+    """
+    The full feature record for a parsed CV. `hits` is CVScorer.feature_hits()
+    for the same CV; storing it lets section scores be recomputed with
+    CVScorer.score_hits() alone.
+    """
+    raw_text = parsed_data.get("raw_text", "")
+    contact_text = f"{parsed_data.get('contact_info', '')}\n{raw_text}"
+    return {
+        "version": FEATURES_VERSION,
+        **match_features(
+            parsed_data.get("experience", ""),
+            parsed_data.get("education", ""),
+            parsed_data.get("skills", ""),
+        ),
+        "has_email": bool(EMAIL_RE.search(contact_text)),
+        "has_phone": bool(PHONE_RE.search(contact_text)),
+        "word_count": len(raw_text.split()),
+        "hits": hits,
+    }
+
+
+def is_current(features: Optional[Dict]) -> bool:
+    return bool(features) and features.get("version") == FEATURES_VERSION
+
+
+def match_score(features: Dict, criteria: Dict) -> float:
+    """Score stored features against batch criteria as a 0-100 percentage."""
+    required_experience = criteria.get("required_experience")
+    required_education = (criteria.get("required_education") or "").lower()
+    required_skills = criteria.get("required_skills") or []
+
+    matching_score = 0
+    total_criteria = 0
+
+    if required_experience is not None:
+        total_criteria += 1
+        if features["experience_years"] >= required_experience:
+            matching_score += 1
+
+    if required_education:
+        total_criteria += 1
+        if required_education in features["education_terms"]:
+            matching_score += 1
+
+    if required_skills:
+        total_criteria += 1
+        cv_skills = features["skills"]
+        if cv_skills:
+            matched_skills = set(required_skills) & set(cv_skills)
+            matching_score += len(matched_skills) / len(required_skills)
+
+    return round((matching_score / total_criteria) * 100, 2) if total_criteria else 0
@@ -1,5 +1,7 @@
 from django import forms
-import os
+
+from .archives import check_cv_file, is_archive
+from .features import EDUCATION_LEVELS
 
 # ---------------- EDUCATION OPTIONS ----------------
 EDUCATION_CHOICES = [
@@ -11,16 +13,8 @@ EDUCATION_CHOICES = [
     ('PhD', 'PhD'),
 ]
 
-class CVUploadForm(forms.Form):
-    job_name = forms.CharField(
-        max_length=100,
-        required=True,
-        label="Job Role",
-        widget=forms.TextInput(attrs={
-            "class": "form-control",
-            "placeholder": "e.g. Data Analyst"
-        })
-    )
+class MatchCriteriaForm(forms.Form):
+    """Job criteria a batch is matched against; also used to re-match a batch."""
 
     required_experience = forms.IntegerField(
         required=False,
@@ -58,31 +52,101 @@ class CVUploadForm(forms.Form):
             return []
         return [s.strip().lower() for s in skills.split(",") if s.strip()]
 
+    @classmethod
+    def for_batch(cls, batch):
+        """Unbound form pre-filled with a batch's current criteria."""
+        education = {value.lower(): value for value, _ in EDUCATION_CHOICES}
+        return cls(initial={
+            "required_experience": batch.required_experience,
+            "required_education": education.get(batch.required_education, ""),
+            "required_skills": ", ".join(batch.required_skills or []),
+        })
+
+    def criteria(self):
+        """Cleaned criteria in the shape jobs.enqueue_batch / rematch_batch expect."""
+        return {
+            "required_experience": self.cleaned_data.get('required_experience'),
+            "required_education": (self.cleaned_data.get('required_education') or '').lower(),
+            "required_skills": self.cleaned_data.get('required_skills', []),  # Already a list
+        }
+
+
+class CandidateFilterForm(forms.Form):
+    """Hard filters for ranked results; applied in SQL by analyzer.ranking."""
+
+    min_years = forms.IntegerField(
+        required=False,
+        min_value=0,
+        label="Min. Years",
+        widget=forms.NumberInput(attrs={"class": "form-control form-control-sm"})
+    )
+
+    min_degree = forms.ChoiceField(
+        required=False,
+        label="Min. Degree",
+        choices=EDUCATION_CHOICES,
+        widget=forms.Select(attrs={"class": "form-control form-control-sm"})
+    )
+
+    must_have = forms.CharField(
+        required=False,
+        label="Must-have Skills",
+        widget=forms.TextInput(attrs={
+            "class": "form-control form-control-sm",
+            "placeholder": "e.g. Python, SQL"
+        })
+    )
+
+    def clean_must_have(self):
+        skills = self.cleaned_data.get("must_have", "")
+        return [s.strip().lower() for s in skills.split(",") if s.strip()]
+
+    def filters(self):
+        """Cleaned filters as keyword arguments for ranking.rank_candidates()."""
+        return {
+            "min_years": self.cleaned_data.get("min_years"),
+            "min_degree_level": EDUCATION_LEVELS.get((self.cleaned_data.get("min_degree") or "").lower()),
+            "must_have_skills": self.cleaned_data.get("must_have", []),
+        }
+
+
+class CVUploadForm(MatchCriteriaForm):
+    field_order = ["job_name"]
+
+    job_name = forms.CharField(
+        max_length=100,
+        required=True,
+        label="Job Role",
+        widget=forms.TextInput(attrs={
+            "class": "form-control",
+            "placeholder": "e.g. Data Analyst"
+        })
+    )
+
+    analyze_only = forms.BooleanField(
+        required=False,
+        label="Analyze only (don't keep the files)",
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"})
+    )
+
     # ---------------- FILE VALIDATION ----------------
     def validate_multiple_files(self, files):
         """
-        Validate uploaded CV files.
+        Validate uploaded CV files. Archives pass; their members are checked
+        as they are read (see analyzer.archives).
         Call in the view: form.validate_multiple_files(request.FILES.getlist("cv_files"))
         """
         if not files:
             raise forms.ValidationError("Please upload at least one CV.")
 
-        allowed_extensions = {".pdf", ".doc", ".docx", ".txt"}
-        max_size = 5 * 1024 * 1024  # 5MB
-
         errors = []
 
         for file in files:
-            ext = os.path.splitext(file.name)[1].lower()
-
-            if ext not in allowed_extensions:
-                errors.append(f"{file.name}: unsupported file format.")
-
-            if file.size <= 0:
-                errors.append(f"{file.name}: file is empty.")
-
-            if file.size > max_size:
-                errors.append(f"{file.name}: exceeds 5MB limit.")
+            if is_archive(file.name):
+                continue
+            reason = check_cv_file(file.name, file.size)
+            if reason:
+                errors.append(f"{file.name}: {reason}.")
 
         if errors:
             raise forms.ValidationError(errors)
@@ -0,0 +1,669 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from . import parse_cache, search, skill_index
+from .models import CONTENT_TEXT_FIELDS, FEATURE_FIELDS, CVBatch, CVContent, CVUpload
+from .parser import CVParser
+from .cv_scorer import CVScorer
+from .features import extract_features, is_current, match_score
+
+logger = logging.getLogger(__name__)
+
+# Queue modes (settings.CV_QUEUE_MODE):
+#   "thread" - drain the batch on a background thread pool inside the web process
+#   "worker" - leave queued rows to `manage.py process_cv_queue`
+#   "sync"   - process inside the request (tests, debugging)
+QUEUE_MODE_THREAD = "thread"
+QUEUE_MODE_WORKER = "worker"
+QUEUE_MODE_SYNC = "sync"
+
+
+def queue_mode() -> str:
+    return getattr(settings, "CV_QUEUE_MODE", QUEUE_MODE_THREAD)
+
+
+def queue_workers() -> int:
+    return max(1, int(getattr(settings, "CV_QUEUE_WORKERS", 1)))
+
+
+def parser_workers() -> int:
+    return max(1, int(getattr(settings, "CV_PARSER_WORKERS", None) or os.cpu_count() or 1))
+
+
+def parse_timeout() -> Optional[float]:
+    return getattr(settings, "CV_PARSE_TIMEOUT", None)
+
+
+def bulk_batch_size() -> int:
+    return max(1, int(getattr(settings, "CV_BULK_BATCH_SIZE", 500)))
+
+
+def claim_lease() -> float:
+    return float(getattr(settings, "CV_CLAIM_LEASE", 600))
+
+
+def progress_flush_interval() -> float:
+    return float(getattr(settings, "CV_PROGRESS_FLUSH_INTERVAL", 1.0))
+
+
+def build_parser() -> CVParser:
+    return CVParser(
+        max_pages=getattr(settings, "CV_PDF_MAX_PAGES", None),
+        max_chars=getattr(settings, "CV_PDF_MAX_CHARS", None),
+        early_stop=getattr(settings, "CV_PDF_EARLY_STOP", False),
+    )
+
+
+# --------------------------------------------------
+# ENQUEUE
+# --------------------------------------------------
+
+class EmptyBatch(ValueError):
+    """Raised by enqueue_batch() when there is no file to queue."""
+
+
+def store_files(files: Iterable) -> List[Tuple[str, str]]:
+    """
+    Write uploaded files to storage one at a time and return their (stored
+    name, SHA-256) pairs. `files` may be a generator such as an
+    archives.ArchiveReader, so each file can be dropped once stored. Runs
+    before (and outside) the row inserts; if reading or writing fails,
+    files stored so far are removed again.
+    """
+    field = CVUpload._meta.get_field("file")
+    stored = []
+    try:
+        for file in files:
+            content_hash = parse_cache.file_digest(file)
+            stored.append((field.storage.save(field.generate_filename(None, file.name), file), content_hash))
+    except Exception:
+        delete_stored_files([name for name, _ in stored])
+        raise
+    return stored
+
+
+def delete_stored_files(names: List[str]) -> None:
+    storage = CVUpload._meta.get_field("file").storage
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning(f"Could not remove stored file {name}: {e}")
+
+
+def enqueue_batch(user, files: Iterable, job_name: str, criteria: Dict) -> CVBatch:
+    """
+    Store the uploaded files, then queue one CVUpload row per file with
+    chunked bulk inserts in a single transaction. Raises EmptyBatch if
+    `files` yields nothing.
+    """
+    stored = store_files(files)
+    if not stored:
+        raise EmptyBatch("No CV files to queue.")
+    try:
+        return _create_batch(user, job_name, criteria, stored)
+    except Exception:
+        delete_stored_files([name for name, _ in stored])
+        raise
+
+
+def _create_batch(
+    user,
+    job_name: str,
+    criteria: Dict,
+    files: List[Tuple[str, str]],
+    status: str = CVUpload.STATUS_QUEUED,
+    file_stored: bool = True
+) -> CVBatch:
+    # One CVUpload row per (file name, content hash), in order
+    with transaction.atomic():
+        batch = CVBatch.objects.create(
+            user=user,
+            job_name=job_name,
+            required_experience=criteria.get("required_experience"),
+            required_education=criteria.get("required_education") or "",
+            required_skills=criteria.get("required_skills") or [],
+            total_files=len(files),
+        )
+        CVUpload.objects.bulk_create(_upload_rows(batch, files, status, file_stored), batch_size=bulk_batch_size())
+    return batch
+
+
+def _add_uploads(batch: CVBatch, files: List[Tuple[str, str]], status: str, file_stored: bool) -> List[int]:
+    # _create_batch() rows appended to an existing batch; returns their ids
+    with transaction.atomic():
+        last = batch.uploads.order_by("-id").values_list("id", flat=True).first() or 0
+        CVUpload.objects.bulk_create(_upload_rows(batch, files, status, file_stored), batch_size=bulk_batch_size())
+        CVBatch.objects.filter(pk=batch.pk).update(total_files=F("total_files") + len(files))
+        batch.total_files += len(files)
+        return list(batch.uploads.filter(id__gt=last).order_by("id").values_list("id", flat=True))
+
+
+def _upload_rows(batch: CVBatch, files: List[Tuple[str, str]], status: str, file_stored: bool) -> List[CVUpload]:
+    claimed_at = timezone.now() if status == CVUpload.STATUS_PROCESSING else None
+    return [
+        CVUpload(
+            user=batch.user,
+            batch=batch,
+            file=name,
+            file_stored=file_stored,
+            content_hash=content_hash,
+            target_job_role=batch.job_name,
+            status=status,
+            claimed_at=claimed_at,
+        )
+        for name, content_hash in files
+    ]
+
+
+def dispatch_batch(batch: CVBatch) -> None:
+    """Hand a freshly queued batch to whichever runner is configured."""
+    mode = queue_mode()
+    if mode == QUEUE_MODE_SYNC:
+        run_batch(batch.pk, workers=1)
+    elif mode == QUEUE_MODE_THREAD:
+        thread = threading.Thread(
+            target=_run_batch_in_thread,
+            args=(batch.pk, queue_workers()),
+            name=f"cv-batch-{batch.pk}",
+            daemon=True,
+        )
+        thread.start()
+    # QUEUE_MODE_WORKER: `manage.py process_cv_queue` picks the rows up
+
+
+# --------------------------------------------------
+# IN-MEMORY SUBMISSION
+# --------------------------------------------------
+
+def submit_batch(user, files: Iterable, job_name: str, criteria: Dict, store: bool = True) -> CVBatch:
+    """
+    Create a batch from uploaded files and start processing it.
+
+    Files that are kept and processed after the request returns
+    (QUEUE_MODE_WORKER, QUEUE_MODE_THREAD) are stored one at a time and
+    queued, as by enqueue_batch(); the runner reads them back from storage.
+    Otherwise - QUEUE_MODE_SYNC, or `store=False` ("analyze only") batches,
+    whose bytes only exist while the request reads them - the batch is
+    processed here a chunk at a time, each file parsed from the bytes just
+    read (see receive_chunks()). Raises EmptyBatch if `files` yields nothing.
+    """
+    if store and queue_mode() != QUEUE_MODE_SYNC:
+        batch = enqueue_batch(user, files, job_name, criteria)
+        dispatch_batch(batch)
+        return batch
+
+    parser = build_parser()
+    scorer = CVScorer()
+    for batch, sources in receive_chunks(user, files, job_name, criteria, store):
+        cv_uploads = list(CVUpload.objects.select_related("batch").filter(pk__in=sources).order_by("id"))
+        _process_chunk(cv_uploads, parser, scorer, sources)
+    return batch
+
+
+def receive_chunks(
+    user,
+    files: Iterable,
+    job_name: str,
+    criteria: Dict,
+    store: bool = True
+) -> Iterator[Tuple[CVBatch, Dict[int, bytes]]]:
+    """
+    Read uploaded files chunk_size() at a time into a new batch: store them
+    unless `store` is off, insert their rows already claimed (so queue
+    workers leave them alone until the claim lease runs out) and yield
+    (batch, {upload id: bytes}) for the caller to process from memory. A
+    chunk is only yielded once the next one's rows exist, so the batch
+    cannot finish while files are still being read; at most two chunks
+    are in memory. If reading fails, the batch and its stored files are
+    removed again. Raises EmptyBatch if `files` yields nothing.
+    """
+    files = iter(files)
+    batch, previous = None, None
+    stored = []
+    try:
+        while True:
+            uploads = read_uploads(islice(files, chunk_size()))
+            if not uploads:
+                break
+            names, failed = _store_uploads(uploads) if store else ([name for name, _, _ in uploads], [])
+            if store:
+                stored.extend(name for index, name in enumerate(names) if index not in failed)
+            rows = [(name, content_hash) for name, (_, content_hash, _) in zip(names, uploads)]
+            with transaction.atomic():
+                if batch is None:
+                    batch = _create_batch(
+                        user, job_name, criteria, rows, status=CVUpload.STATUS_PROCESSING, file_stored=store
+                    )
+                    ids = list(batch.uploads.order_by("id").values_list("id", flat=True))
+                else:
+                    ids = _add_uploads(batch, rows, status=CVUpload.STATUS_PROCESSING, file_stored=store)
+                if failed:
+                    CVUpload.objects.filter(pk__in=[ids[index] for index in failed]).update(file_stored=False)
+            if previous:
+                yield batch, previous
+            previous = {pk: data for pk, (_, _, data) in zip(ids, uploads)}
+    except Exception:
+        if batch is not None:
+            batch.delete()
+        delete_stored_files(stored)
+        raise
+    if batch is None:
+        raise EmptyBatch("No CV files to queue.")
+    yield batch, previous
+
+
+def chunk_size() -> int:
+    """Rows claimed, or files read, per processing chunk."""
+    return parser_workers() * 4
+
+
+def read_uploads(files: Iterable) -> List[Tuple[str, str, bytes]]:
+    """Read uploaded files into memory as (base name, SHA-256, bytes)."""
+    uploads = []
+    for file in files:
+        file.seek(0)
+        data = file.read()
+        uploads.append((os.path.basename(file.name), hashlib.sha256(data).hexdigest(), data))
+    return uploads
+
+
+def _store_uploads(uploads: List[Tuple[str, str, bytes]]) -> Tuple[List[str], List[int]]:
+    # Write read_uploads() files to storage; returns their stored names and
+    # the indexes of the ones whose write failed (kept as analyze-only rows)
+    field = CVUpload._meta.get_field("file")
+    names, failed = [], []
+    for index, (name, _, data) in enumerate(uploads):
+        name = field.generate_filename(None, name)
+        try:
+            name = field.storage.save(name, ContentFile(data))
+        except Exception as e:
+            logger.error(f"Could not store {name}: {e}")
+            failed.append(index)
+        names.append(name)
+    return names, failed
+
+
+# --------------------------------------------------
+# WORKER
+# --------------------------------------------------
+
+def claimable() -> Q:
+    """Queued rows, and processing rows whose claim lease has run out."""
+    expired = Q(claimed_at__lt=timezone.now() - timedelta(seconds=claim_lease())) | Q(claimed_at__isnull=True)
+    return Q(status=CVUpload.STATUS_QUEUED) | Q(expired, status=CVUpload.STATUS_PROCESSING)
+
+
+def claim_next(batch_id=None, limit: int = 1) -> List[CVUpload]:
+    """
+    Atomically move up to `limit` claimable rows to "processing" and return
+    them. The conditional UPDATE makes claiming safe across threads and
+    processes without relying on SELECT ... FOR UPDATE support. Rows left
+    "processing" by a worker that died are claimed again once their lease
+    (settings.CV_CLAIM_LEASE) expires; renew_claims() keeps live ones.
+    """
+    candidates = CVUpload.objects.filter(claimable(), batch__isnull=False)
+    if batch_id is not None:
+        candidates = candidates.filter(batch_id=batch_id)
+
+    claimed = []
+    for pk in candidates.order_by("id").values_list("pk", flat=True)[:limit * 2]:
+        if CVUpload.objects.filter(claimable(), pk=pk).update(
+            status=CVUpload.STATUS_PROCESSING, claimed_at=timezone.now()
+        ):
+            claimed.append(pk)
+            if len(claimed) >= limit:
+                break
+    return list(CVUpload.objects.select_related("batch").filter(pk__in=claimed).order_by("id"))
+
+
+def renew_claims(ids: Iterable[int]) -> None:
+    """Extend the lease of rows this worker is still processing."""
+    CVUpload.objects.filter(pk__in=list(ids), status=CVUpload.STATUS_PROCESSING).update(claimed_at=timezone.now())
+
+
+PROCESSED_FIELDS = [
+    "overall_score", "contact_score", "experience_score", "education_score",
+    "skills_score", "format_score", "job_match_score",
+    "processed", "status", "error", "event_seq", "parse_ms", "score_ms", *FEATURE_FIELDS,
+]
+
+
+def score_upload(cv_upload: CVUpload, parsed_data: Dict, scorer: CVScorer) -> CVUpload:
+    """
+    Score and match a parsed upload in memory; save_uploads() persists it.
+    `parse_ms` is taken from parsed_data (absent for parse cache hits).
+    """
+    batch = cv_upload.batch
+    raw_text = parsed_data.get("raw_text", "")
+    started = time.perf_counter()
+
+    try:
+        if raw_text.startswith("Error"):
+            raise ValueError(raw_text)
+
+        hits = scorer.feature_hits(parsed_data)
+        scoring_results = scorer.score_cv(parsed_data, batch.job_name, hits=hits)
+        cv_upload.set_features(extract_features(parsed_data, hits))
+
+        cv_upload.raw_text = raw_text
+        cv_upload.contact_info = parsed_data.get("contact_info", "")
+        cv_upload.experience = parsed_data.get("experience", "")
+        cv_upload.education = parsed_data.get("education", "")
+        cv_upload.skills = parsed_data.get("skills", "")
+
+        scores = scoring_results.get("section_scores", {})
+        cv_upload.overall_score = scoring_results.get("overall_score", 0)
+        cv_upload.contact_score = scores.get("contact", 0)
+        cv_upload.experience_score = scores.get("experience", 0)
+        cv_upload.education_score = scores.get("education", 0)
+        cv_upload.skills_score = scores.get("skills", 0)
+        cv_upload.format_score = scores.get("format", 0)
+
+        cv_upload.job_match_score = match_score(cv_upload.features, batch.criteria)
+        cv_upload.processed = True
+        cv_upload.status = CVUpload.STATUS_DONE
+        cv_upload.error = ""
+    except Exception as e:
+        logger.error(f"Error processing {cv_upload.file.name}: {e}")
+        cv_upload.processed = False
+        cv_upload.status = CVUpload.STATUS_FAILED
+        cv_upload.error = str(e)
+    cv_upload.parse_ms = parsed_data.get("parse_ms")
+    cv_upload.score_ms = round((time.perf_counter() - started) * 1000, 3)
+    return cv_upload
+
+
+def save_uploads(cv_uploads: List[CVUpload]) -> None:
+    """
+    Persist scored uploads, their extracted text, its search index entries
+    and skill postings with chunked bulk writes in one transaction, then
+    refresh the status of the batches they belong to. Rows deleted while
+    they were being processed (e.g. with their batch) are simply not
+    updated, and get no content, index entries or postings. Batch rows are
+    numbered for the progress stream on the way.
+    """
+    if not cv_uploads:
+        return
+    with transaction.atomic():
+        # Lock the rows that still exist so they cannot go away before commit
+        existing = set(
+            CVUpload.objects.select_for_update()
+            .filter(pk__in=[cv_upload.pk for cv_upload in cv_uploads])
+            .values_list("pk", flat=True)
+        )
+        changed = [
+            cv_upload for cv_upload in cv_uploads
+            if cv_upload.pk in existing and getattr(cv_upload, "_texts_changed", False)
+        ]
+        contents = [CVContent.from_texts(cv_upload, cv_upload.texts) for cv_upload in changed]
+        _number_events(cv_uploads)
+        CVUpload.objects.bulk_update(cv_uploads, PROCESSED_FIELDS, batch_size=bulk_batch_size())
+        search.unindex(cv_upload.pk for cv_upload in changed)
+        CVContent.objects.bulk_create(
+            contents,
+            batch_size=bulk_batch_size(),
+            update_conflicts=True,
+            unique_fields=["upload"],
+            update_fields=[*CONTENT_TEXT_FIELDS, "packed"],
+        )
+        search.index_documents((cv_upload.pk, cv_upload.texts) for cv_upload in changed)
+        skill_index.index_skills(
+            [(cv_upload.pk, cv_upload.skills) for cv_upload in changed], batch_size=bulk_batch_size()
+        )
+    for cv_upload in cv_uploads:
+        cv_upload._texts_changed = False
+    for batch_id in {cv_upload.batch_id for cv_upload in cv_uploads}:
+        _refresh_batch_status(batch_id)
+
+
+def save_parsed(results: Dict[int, Dict], scorer: CVScorer) -> int:
+    """
+    Score rows from their parse results (upload id -> parsed data) and
+    persist them with save_uploads(). Returns the number of rows saved.
+    """
+    cv_uploads = CVUpload.objects.select_related("batch").filter(pk__in=results).order_by("id")
+    scored = [score_upload(cv_upload, results[cv_upload.pk], scorer) for cv_upload in cv_uploads]
+    save_uploads(scored)
+    return len(scored)
+
+
+def fail_unfinished(batch_id, error: str) -> int:
+    """
+    Mark a batch's queued and processing rows failed with `error`, for a
+    batch whose processing stopped, and finish the batch. Returns the
+    number of rows marked.
+    """
+    cv_uploads = list(CVUpload.objects.filter(
+        batch_id=batch_id,
+        status__in=[CVUpload.STATUS_QUEUED, CVUpload.STATUS_PROCESSING],
+    ).order_by("id"))
+    for cv_upload in cv_uploads:
+        cv_upload.processed = False
+        cv_upload.status = CVUpload.STATUS_FAILED
+        cv_upload.error = error
+    save_uploads(cv_uploads)
+    return len(cv_uploads)
+
+
+def _number_events(cv_uploads: List[CVUpload]) -> None:
+    # Give each batch's rows the next event numbers. The UPDATE holds the
+    # batch row's lock until commit, so a batch's saves commit in number
+    # order and analyzer.progress can resume from the last number it sent.
+    by_batch = defaultdict(list)
+    for cv_upload in cv_uploads:
+        if cv_upload.batch_id is not None:
+            by_batch[cv_upload.batch_id].append(cv_upload)
+    for batch_id, rows in by_batch.items():
+        CVBatch.objects.filter(pk=batch_id).update(event_seq=F("event_seq") + len(rows))
+        last = CVBatch.objects.filter(pk=batch_id).values_list("event_seq", flat=True).first()
+        if last is None:
+            continue
+        for seq, cv_upload in enumerate(rows, start=last - len(rows) + 1):
+            cv_upload.event_seq = seq
+
+
+def refresh_features(cv_uploads: List[CVUpload], scorer: Optional[CVScorer] = None) -> List[CVUpload]:
+    """
+    Recompute the feature record of processed uploads from their stored
+    text (one CVContent query), in memory. Used for rows processed before
+    features existed or under an older FEATURES_VERSION.
+    """
+    scorer = scorer or CVScorer()
+    contents = CVContent.objects.in_bulk([cv_upload.pk for cv_upload in cv_uploads])
+    for cv_upload in cv_uploads:
+        content = contents.get(cv_upload.pk)
+        parsed_data = content.texts() if content else dict.fromkeys(CONTENT_TEXT_FIELDS, "")
+        cv_upload.set_features(extract_features(parsed_data, scorer.feature_hits(parsed_data)))
+    return cv_uploads
+
+
+def rematch_batch(batch: CVBatch, criteria: Dict) -> int:
+    """
+    Store new criteria on a batch and recompute job_match_score for its
+    processed CVs from their stored features, without re-parsing or
+    re-scoring. Rows are read and scores written in chunks, all in one
+    transaction. Returns the number of CVs re-matched.
+    """
+    chunk_size = bulk_batch_size()
+    uploads = CVUpload.objects.filter(batch=batch, processed=True).only("id", "features").order_by("id")
+    count = 0
+    with transaction.atomic():
+        batch.required_experience = criteria.get("required_experience")
+        batch.required_education = criteria.get("required_education") or ""
+        batch.required_skills = criteria.get("required_skills") or []
+        batch.results_version += 1
+        batch.save(update_fields=[
+            "required_experience", "required_education", "required_skills", "results_version"
+        ])
+
+        chunk = []
+        for cv_upload in uploads.iterator(chunk_size=chunk_size):
+            chunk.append(cv_upload)
+            if len(chunk) >= chunk_size:
+                count += _rematch_chunk(chunk, batch.criteria)
+                chunk = []
+        count += _rematch_chunk(chunk, batch.criteria)
+    return count
+
+
+def _rematch_chunk(cv_uploads: List[CVUpload], criteria: Dict) -> int:
+    stale = [cv_upload for cv_upload in cv_uploads if not is_current(cv_upload.features)]
+    if stale:
+        CVUpload.objects.bulk_update(refresh_features(stale), FEATURE_FIELDS)
+    for cv_upload in cv_uploads:
+        cv_upload.job_match_score = match_score(cv_upload.features, criteria)
+    return CVUpload.objects.bulk_update(cv_uploads, ["job_match_score"])
+
+
+def _refresh_batch_status(batch_id) -> None:
+    pending = CVUpload.objects.filter(
+        batch_id=batch_id,
+        status__in=[CVUpload.STATUS_QUEUED, CVUpload.STATUS_PROCESSING],
+    ).exists()
+    if pending:
+        CVBatch.objects.filter(pk=batch_id, status=CVBatch.STATUS_QUEUED).update(
+            status=CVBatch.STATUS_RUNNING
+        )
+    else:
+        CVBatch.objects.filter(pk=batch_id).exclude(status=CVBatch.STATUS_DONE).update(
+            status=CVBatch.STATUS_DONE, finished_at=timezone.now()
+        )
+
+
+def _work(batch_id=None) -> int:
+    """
+    Claim rows in chunks until the queue (or batch) is empty and process
+    each chunk with _process_chunk().
+    """
+    parser = build_parser()
+    scorer = CVScorer()
+    count = 0
+    while True:
+        claimed = claim_next(batch_id, limit=chunk_size())
+        if not claimed:
+            break
+        count += _process_chunk(claimed, parser, scorer)
+    return count
+
+
+def _process_chunk(
+    cv_uploads: List[CVUpload],
+    parser: CVParser,
+    scorer: CVScorer,
+    sources: Optional[Dict[int, bytes]] = None
+) -> int:
+    """
+    Files already in the parse cache are scored straight away; the rest
+    are parsed across the CVParser process pool - from `sources` (upload id
+    -> bytes) when given, else from storage - and scored here as they
+    finish. Scored rows are written back with bulk updates, at least every
+    CV_PROGRESS_FLUSH_INTERVAL seconds so progress shows while the chunk
+    is still parsing.
+    """
+    sources = sources or {}
+    scored = []
+    jobs = {}
+    for cv_upload in cv_uploads:
+        extension = cv_upload.file_extension
+        cached = parse_cache.get_parsed(cv_upload.content_hash, extension, parser)
+        if cached is not None:
+            scored.append(score_upload(cv_upload, cached, scorer))
+            continue
+        try:
+            if cv_upload.pk in sources:
+                source = sources[cv_upload.pk]
+            elif cv_upload.file_stored:
+                source = cv_upload.file.path
+            else:
+                # An analyze-only row reclaimed from a worker that died: its
+                # bytes only ever existed in that worker's memory
+                raise ValueError("the file was not kept; upload it again")
+        except Exception as e:
+            scored.append(score_upload(cv_upload, parser.failed_result(f"Error: {e}"), scorer))
+            continue
+        jobs[cv_upload.pk] = (cv_upload, source)
+    files = [(pk, cv_upload.file_extension, source) for pk, (cv_upload, source) in jobs.items()]
+    saved = 0
+    finished = set()
+    flushed_at = time.monotonic()
+    for pk, parsed_data in parser.parse_many(files, workers=parser_workers(), timeout=parse_timeout()):
+        cv_upload = jobs[pk][0]
+        parse_cache.store_parsed(cv_upload.content_hash, cv_upload.file_extension, parser, parsed_data)
+        scored.append(score_upload(cv_upload, parsed_data, scorer))
+        if time.monotonic() - flushed_at >= progress_flush_interval():
+            save_uploads(scored)
+            saved += len(scored)
+            finished.update(cv_upload.pk for cv_upload in scored)
+            renew_claims(pk for pk in jobs if pk not in finished)
+            scored = []
+            flushed_at = time.monotonic()
+    save_uploads(scored)
+    return saved + len(scored)
+
+
+def _work_in_thread(batch_id=None) -> int:
+    try:
+        return _work(batch_id)
+    finally:
+        connections.close_all()
+
+
+def run_batch(batch_id=None, workers: int = 1) -> int:
+    """
+    Drain queued rows (optionally limited to one batch) with a pool of
+    `workers` threads. Returns the number of rows processed.
+    """
+    if workers <= 1:
+        return _work(batch_id)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cv-worker") as pool:
+        futures = [pool.submit(_work_in_thread, batch_id) for _ in range(workers)]
+        return sum(f.result() for f in futures)
+
+
+def _run_batch_in_thread(batch_id, workers: int) -> None:
+    try:
+        run_batch(batch_id, workers=workers)
+        # Then anything claimable elsewhere: with no process_cv_queue, this is
+        # how rows of a web process that died mid-batch get finished
+        run_batch(workers=workers)
+    except Exception:
+        logger.exception(f"Background processing of batch {batch_id} failed")
+    finally:
+        connections.close_all()
+
+
+# --------------------------------------------------
+# PROGRESS
+# --------------------------------------------------
+
+def batch_progress(batch: CVBatch) -> Dict:
+    counts = {status: 0 for status, _ in CVUpload.STATUS_CHOICES}
+    for row in batch.uploads.values("status").annotate(n=Count("id")):
+        counts[row["status"]] = row["n"]
+    finished = counts[CVUpload.STATUS_DONE] + counts[CVUpload.STATUS_FAILED]
+    return {
+        "batch_id": str(batch.pk),
+        "status": batch.status,
+        "total": batch.total_files,
+        "processed": counts[CVUpload.STATUS_DONE],
+        "failed": counts[CVUpload.STATUS_FAILED],
+        "pending": counts[CVUpload.STATUS_QUEUED] + counts[CVUpload.STATUS_PROCESSING],
+        "percent": round(finished / batch.total_files * 100, 1) if batch.total_files else 100.0,
+        "finished": batch.is_finished,
+    }
@@ -0,0 +1,154 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from analyzer.benchmark import build_file_corpus, summarize, time_each
+from analyzer.cv_scorer import CVScorer, generate_full_cv_suggestions
+from analyzer.parser import CVParser
+
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".txt": "text/plain",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the parse -> score -> match pipeline on a generated PDF/DOCX/TXT "
+        "corpus and print throughput, p50/p95/p99 latency and peak RSS as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=90, help="Number of generated CV files.")
+        parser.add_argument("--max-size", type=int, default=6, help="Largest CV size (roles x bullets).")
+        parser.add_argument("--repeat", type=int, default=1, help="Passes over the corpus per stage.")
+        parser.add_argument("--job-name", default="data analyst")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--view-batch", type=int, default=10,
+            help="Files per POST when timing the upload view."
+        )
+        parser.add_argument("--skip-view", action="store_true", help="Do not time the upload view.")
+        parser.add_argument("--output", help="Also write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp(prefix="cv-bench-")
+        try:
+            corpus_dir = os.path.join(workdir, "corpus")
+            os.makedirs(corpus_dir)
+            files = build_file_corpus(
+                corpus_dir, options["count"], seed=options["seed"], max_size=options["max_size"]
+            )
+            report = {
+                "commit": self.current_commit(),
+                "corpus": {
+                    "files": len(files),
+                    "bytes": sum(os.path.getsize(path) for path, _ in files),
+                    "by_extension": {
+                        ext: sum(1 for _, e in files if e == ext) for ext in sorted({e for _, e in files})
+                    },
+                },
+                "stages": self.run_stages(files, options, workdir),
+            }
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output)
+        self.stdout.write(output)
+
+    def run_stages(self, files, options, workdir):
+        parser = CVParser()
+        scorer = CVScorer()
+        job_name = options["job_name"]
+        repeat = options["repeat"]
+
+        stages = {
+            "extract_text": time_each(lambda job: parser.extract_text(*job), files, repeat),
+            "parse_cv": time_each(lambda job: parser.parse_cv(*job), files, repeat),
+        }
+        parsed = [parser.parse_cv(path, extension) for path, extension in files]
+        stages["score_cv"] = time_each(lambda cv: scorer.score_cv(cv, job_name), parsed, repeat)
+        stages["generate_full_cv_suggestions"] = time_each(
+            lambda cv: generate_full_cv_suggestions(cv, job_name), parsed, repeat
+        )
+        if not options["skip_view"]:
+            stages["upload_view"] = self.time_upload_view(files, options, workdir)
+        return stages
+
+    def time_upload_view(self, files, options, workdir):
+        """
+        POST the corpus to the upload view in batches against a throwaway
+        test database, with the queue in sync mode so each request covers
+        store -> parse -> score -> match. The parse cache is disabled so
+        repeated passes do real work.
+        """
+        batch_size = max(1, options["view_batch"])
+        batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+        payloads = [[self.read_upload(path, ext) for path, ext in batch] for batch in batches]
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(
+                CV_QUEUE_MODE="sync",
+                CV_PARSER_WORKERS=1,
+                MEDIA_ROOT=os.path.join(workdir, "media"),
+                CACHES={
+                    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                    "cv_parse": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+                },
+            ):
+                client = Client()
+                client.force_login(User.objects.create_user("benchmark"))
+                url = reverse("upload")
+
+                samples = []
+                for _ in range(options["repeat"]):
+                    for payload in payloads:
+                        data = {
+                            "job_name": options["job_name"],
+                            "required_experience": 2,
+                            "required_skills": "python, sql",
+                            "cv_files": [SimpleUploadedFile(*item) for item in payload],
+                        }
+                        started = time.perf_counter()
+                        response = client.post(url, data)
+                        samples.append((time.perf_counter() - started) * 1000)
+                        if response.status_code != 302:
+                            raise RuntimeError(f"upload view returned {response.status_code}")
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        stats = summarize(samples, items=len(files) * options["repeat"])
+        stats["files_per_request"] = batch_size
+        return stats
+
+    @staticmethod
+    def current_commit():
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    @staticmethod
+    def read_upload(path, extension):
+        with open(path, "rb") as f:
+            return os.path.basename(path), f.read(), CONTENT_TYPES[extension]
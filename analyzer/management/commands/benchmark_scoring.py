@@ -0,0 +1,73 @@
+import json
+import re
+from functools import partial
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+
+from analyzer import cv_scorer
+from analyzer.benchmark import synthetic_corpus, time_each
+from analyzer.cv_scorer import CVScorer
+
+# The compiled patterns CVScorer looks up in analyzer.cv_scorer
+SCORER_PATTERNS = ["EMAIL_RE", "PHONE_RE", "METRIC_RE", "SKILL_LIST_SPLIT_RE", "YEAR_RE"]
+
+
+class PatternString:
+    """
+    Stands in for a compiled pattern the way CVScorer used regexes before
+    analyzer.patterns: the pattern string is handed to re.search() /
+    re.split() on every call.
+    """
+
+    def __init__(self, regex: re.Pattern):
+        self.search = partial(re.search, regex.pattern)
+        self.split = partial(re.split, regex.pattern)
+
+
+def pattern_strings():
+    """Patch CVScorer to reach its regexes through pattern strings."""
+    return mock.patch.multiple(cv_scorer, **{
+        name: PatternString(getattr(cv_scorer, name)) for name in SCORER_PATTERNS
+    })
+
+
+class Command(BaseCommand):
+    help = (
+        "Time CVScorer.score_cv per CV over a synthetic corpus, and CVScorer.feature_hits "
+        "with regexes reached through pattern strings (the previous path) and precompiled."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=3000, help="Number of synthetic CVs.")
+        parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus.")
+        parser.add_argument("--job-name", default="data analyst", help="Job name passed to score_cv.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        corpus = synthetic_corpus(options["count"], seed=options["seed"])
+        scorer = CVScorer()
+        job_name = options["job_name"]
+        repeat = options["repeat"]
+
+        # Warm-up pass so one-off import/compile costs are not counted
+        for parsed in corpus[:50]:
+            scorer.score_cv(parsed, job_name)
+
+        stats = time_each(lambda parsed: scorer.score_cv(parsed, job_name), corpus, repeat)
+
+        # The scorer's own feature code both times; only how it reaches the
+        # patterns differs
+        with pattern_strings():
+            previous = time_each(scorer.feature_hits, corpus, repeat)
+        current = time_each(scorer.feature_hits, corpus, repeat)
+        self.stdout.write(json.dumps({
+            "benchmark": "score_cv",
+            "job_name": job_name,
+            **stats,
+            "feature_hits": {
+                "pattern_strings": previous,
+                "precompiled": current,
+                "speedup": round(previous["mean_ms"] / current["mean_ms"], 2) if current["mean_ms"] else None,
+            },
+        }, indent=2))
@@ -0,0 +1,136 @@
+import json
+import os
+import secrets
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+
+from analyzer.benchmark import build_file_corpus, summarize
+
+from .benchmark_pipeline import CONTENT_TYPES
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test running servers with concurrent bulk uploads and print per-target "
+        "throughput and p50/p95/p99 latency as JSON. Start the servers against the same "
+        "database first, for example:\n"
+        "  CV_QUEUE_MODE=sync gunicorn cv_processor.wsgi -b 127.0.0.1:8001\n"
+        "  CV_QUEUE_MODE=sync uvicorn cv_processor.asgi:application --port 8002\n"
+        "then: manage.py loadtest_upload --target sync=http://127.0.0.1:8001/upload/ "
+        "--target async=http://127.0.0.1:8002/upload/async/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target", action="append", required=True,
+            help="name=URL of an upload view; repeat to compare servers."
+        )
+        parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once.")
+        parser.add_argument("--requests", type=int, default=40, help="Uploads per target.")
+        parser.add_argument("--files", type=int, default=5, help="CV files per upload.")
+        parser.add_argument("--max-size", type=int, default=6, help="Largest CV size (roles x bullets).")
+        parser.add_argument("--job-name", default="data analyst")
+        parser.add_argument(
+            "--username", default="loadtest",
+            help="Prefix of the users uploads are made as (one per request, since an upload replaces the user's CVs)."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Also write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["target"]:
+            name, _, url = target.partition("=")
+            if not url:
+                raise CommandError(f"--target must be name=URL, got {target!r}")
+            targets.append((name, url))
+
+        logins = [self.login(f"{options['username']}-{index}") for index in range(options["requests"])]
+        report = {
+            "concurrency": options["concurrency"],
+            "requests": options["requests"],
+            "files_per_request": options["files"],
+            "targets": {},
+        }
+        for index, (name, url) in enumerate(targets):
+            # Every upload of every target gets its own CVs, so the parse
+            # cache cannot answer for a server what an earlier one parsed
+            uploads = self.build_uploads(options, seed=options["seed"] + index * 100003)
+            report["targets"][name] = self.run_target(url, list(zip(uploads, logins)), options)
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output)
+        self.stdout.write(output)
+
+    def build_uploads(self, options, seed):
+        """--requests lists of --files (name, bytes, content type) tuples."""
+        workdir = tempfile.mkdtemp(prefix="cv-loadtest-")
+        try:
+            files = build_file_corpus(
+                workdir, options["requests"] * options["files"], seed=seed, max_size=options["max_size"]
+            )
+            corpus = []
+            for path, extension in files:
+                with open(path, "rb") as f:
+                    corpus.append((os.path.basename(path), f.read(), CONTENT_TYPES[extension]))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        size = options["files"]
+        return [corpus[start:start + size] for start in range(0, len(corpus), size)]
+
+    def login(self, username):
+        """Session and CSRF cookies for `username`, created directly in the database."""
+        user, _ = User.objects.get_or_create(username=username)
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        return {settings.SESSION_COOKIE_NAME: session.session_key, settings.CSRF_COOKIE_NAME: secrets.token_hex(16)}
+
+    def run_target(self, url, uploads, options):
+        def post(upload):
+            files, cookies = upload
+            started = time.perf_counter()
+            response = requests.post(
+                url,
+                data={"job_name": options["job_name"], "csrfmiddlewaretoken": cookies[settings.CSRF_COOKIE_NAME]},
+                files=[("cv_files", upload) for upload in files],
+                cookies=cookies,
+                allow_redirects=False,
+                timeout=600,
+            )
+            # A successful upload redirects to the batch's results
+            ok = response.status_code == 302 and "/matched-results/" in response.headers.get("Location", "")
+            return (time.perf_counter() - started) * 1000, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            results = list(pool.map(post, uploads))
+        wall_s = time.perf_counter() - started
+
+        samples = [ms for ms, ok in results if ok]
+        failed = len(results) - len(samples)
+        if not samples:
+            return {"url": url, "failed": failed}
+        stats = summarize(samples, items=len(samples) * options["files"])
+        # Requests overlap, so throughput is over wall-clock time, not summed latency
+        stats.pop("peak_rss_mb")
+        stats.update({
+            "url": url,
+            "failed": failed,
+            "wall_s": round(wall_s, 3),
+            "requests_per_s": round(len(samples) / wall_s, 2),
+            "throughput_per_s": round(len(samples) * options["files"] / wall_s, 2),
+        })
+        return stats
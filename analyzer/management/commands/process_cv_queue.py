@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from analyzer import jobs
+
+
+class Command(BaseCommand):
+    help = "Process queued CV uploads from the database-backed job queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=jobs.queue_workers(),
+            help="Number of worker threads (default: settings.CV_QUEUE_WORKERS)."
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=2.0,
+            help="Seconds to sleep when the queue is empty."
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Drain the queue once and exit instead of polling forever."
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        poll_interval = options["poll_interval"]
+
+        self.stdout.write(f"Processing CV queue with {workers} worker(s)")
+        while True:
+            processed = jobs.run_batch(workers=workers)
+            if processed:
+                self.stdout.write(f"Processed {processed} CV(s)")
+            if options["once"]:
+                break
+            if not processed:
+                time.sleep(poll_interval)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from analyzer import jobs, skill_index
+from analyzer.models import CVContent, Skill
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the skill dictionary weights and every CV's skill postings "
+        "from the stored skills text (after a KEYWORDS change, or to backfill)."
+    )
+
+    def handle(self, *args, **options):
+        counts = skill_index.vocabulary()
+        skills = list(Skill.objects.all())
+        for skill in skills:
+            skill.role_count = counts.get(skill.name, 0)
+            skill.weight = skill_index.skill_weight(skill.role_count)
+        Skill.objects.bulk_update(skills, ["role_count", "weight"], batch_size=jobs.bulk_batch_size())
+
+        chunk_size = jobs.bulk_batch_size()
+        contents = CVContent.objects.filter(upload__processed=True).only("upload_id", "skills", "packed")
+        chunk, indexed, postings = [], 0, 0
+        for content in contents.order_by("upload_id").iterator(chunk_size=chunk_size):
+            chunk.append((content.upload_id, content.texts(("skills",))["skills"]))
+            if len(chunk) >= chunk_size:
+                postings += skill_index.index_skills(chunk, batch_size=chunk_size)
+                indexed += len(chunk)
+                chunk = []
+        postings += skill_index.index_skills(chunk, batch_size=chunk_size)
+        indexed += len(chunk)
+        self.stdout.write(f"Indexed {postings} skill(s) across {indexed} CV(s)")
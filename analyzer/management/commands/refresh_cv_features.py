@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from analyzer import jobs
+from analyzer.cv_scorer import CVScorer
+from analyzer.features import FEATURES_VERSION
+from analyzer.models import FEATURE_FIELDS, CVUpload
+
+
+class Command(BaseCommand):
+    help = (
+        "Derive the stored feature record of processed CVs from their extracted "
+        "text, for rows without one or from an older FEATURES_VERSION."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Recompute every processed CV.")
+
+    def handle(self, *args, **options):
+        uploads = CVUpload.objects.filter(processed=True)
+        if not options["all"]:
+            uploads = uploads.filter(Q(features__isnull=True) | ~Q(features__version=FEATURES_VERSION))
+        pks = list(uploads.order_by("id").values_list("pk", flat=True))
+
+        scorer = CVScorer()
+        chunk_size = jobs.bulk_batch_size()
+        for start in range(0, len(pks), chunk_size):
+            chunk = list(CVUpload.objects.filter(pk__in=pks[start:start + chunk_size]).only("id"))
+            CVUpload.objects.bulk_update(jobs.refresh_features(chunk, scorer), FEATURE_FIELDS)
+        self.stdout.write(f"Refreshed features of {len(pks)} CV(s)")
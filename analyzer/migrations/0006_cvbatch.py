@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:17
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0005_rename_matching_score_cvupload_job_match_score_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvupload',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        # Rows uploaded before the job queue existed were processed inline.
+        migrations.AddField(
+            model_name='cvupload',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='done', max_length=16),
+        ),
+        migrations.AlterField(
+            model_name='cvupload',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=16),
+        ),
+        migrations.CreateModel(
+            name='CVBatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done')], default='queued', max_length=16)),
+                ('total_files', models.PositiveIntegerField(default=0)),
+                ('job_name', models.CharField(blank=True, max_length=255)),
+                ('required_experience', models.PositiveIntegerField(blank=True, null=True)),
+                ('required_education', models.CharField(blank=True, max_length=100)),
+                ('required_skills', models.JSONField(blank=True, default=list)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='cv_batches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='cvupload',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='analyzer.cvbatch'),
+        ),
+    ]
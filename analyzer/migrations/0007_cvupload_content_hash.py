@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0006_cvbatch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvupload',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, help_text='SHA-256 of the uploaded bytes', max_length=64),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TEXT_FIELDS = ("raw_text", "contact_info", "experience", "education", "skills")
+CHUNK_SIZE = 500
+
+
+def copy_text_to_content(apps, schema_editor):
+    CVUpload = apps.get_model("analyzer", "CVUpload")
+    CVContent = apps.get_model("analyzer", "CVContent")
+
+    uploads = CVUpload.objects.order_by("pk").values_list("pk", *TEXT_FIELDS)
+    chunk = []
+    for pk, *texts in uploads.iterator(chunk_size=CHUNK_SIZE):
+        chunk.append(CVContent(upload_id=pk, **dict(zip(TEXT_FIELDS, texts))))
+        if len(chunk) >= CHUNK_SIZE:
+            CVContent.objects.bulk_create(chunk)
+            chunk = []
+    CVContent.objects.bulk_create(chunk)
+
+
+def copy_content_to_text(apps, schema_editor):
+    import json
+    import zlib
+
+    CVUpload = apps.get_model("analyzer", "CVUpload")
+    CVContent = apps.get_model("analyzer", "CVContent")
+
+    chunk = []
+    for content in CVContent.objects.order_by("pk").iterator(chunk_size=CHUNK_SIZE):
+        if content.packed:
+            texts = json.loads(zlib.decompress(bytes(content.packed)).decode("utf-8"))
+        else:
+            texts = {name: getattr(content, name) for name in TEXT_FIELDS}
+        chunk.append(CVUpload(pk=content.upload_id, **{name: texts.get(name, "") for name in TEXT_FIELDS}))
+        if len(chunk) >= CHUNK_SIZE:
+            CVUpload.objects.bulk_update(chunk, TEXT_FIELDS)
+            chunk = []
+    CVUpload.objects.bulk_update(chunk, TEXT_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0007_cvupload_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVContent',
+            fields=[
+                ('upload', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='content', serialize=False, to='analyzer.cvupload')),
+                ('raw_text', models.TextField(blank=True)),
+                ('contact_info', models.TextField(blank=True)),
+                ('experience', models.TextField(blank=True)),
+                ('education', models.TextField(blank=True)),
+                ('skills', models.TextField(blank=True)),
+                ('packed', models.BinaryField(blank=True, help_text='zlib-compressed JSON of the text fields', null=True)),
+            ],
+        ),
+        migrations.RunPython(copy_text_to_content, copy_content_to_text),
+        migrations.RemoveField(
+            model_name='cvupload',
+            name='contact_info',
+        ),
+        migrations.RemoveField(
+            model_name='cvupload',
+            name='education',
+        ),
+        migrations.RemoveField(
+            model_name='cvupload',
+            name='experience',
+        ),
+        migrations.RemoveField(
+            model_name='cvupload',
+            name='raw_text',
+        ),
+        migrations.RemoveField(
+            model_name='cvupload',
+            name='skills',
+        ),
+    ]
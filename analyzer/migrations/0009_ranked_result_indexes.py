@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0008_cvcontent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cvupload',
+            index=models.Index(condition=models.Q(('processed', True)), fields=['user', '-job_match_score', 'id', 'processed'], name='cvupload_user_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cvupload',
+            index=models.Index(condition=models.Q(('processed', True)), fields=['batch', '-job_match_score', 'id', 'processed'], name='cvupload_batch_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cvupload',
+            index=models.Index(fields=['user', '-uploaded_at'], name='cvupload_user_recent_idx'),
+        ),
+    ]
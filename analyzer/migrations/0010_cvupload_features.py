@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0009_ranked_result_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvupload',
+            name='degree_level',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Highest degree mentioned: 0 none, 1 high school ... 5 PhD', null=True),
+        ),
+        migrations.AddField(
+            model_name='cvupload',
+            name='experience_years',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='cvupload',
+            name='features',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,85 @@
+from django.db import migrations
+
+FTS_TABLE = "analyzer_cvcontent_fts"
+TEXT_FIELDS = ("raw_text", "contact_info", "experience", "education", "skills")
+CHUNK_SIZE = 500
+
+PG_DOCUMENT_SQL = (
+    "setweight(to_tsvector('english', %s), 'A') || "
+    "setweight(to_tsvector('english', %s), 'B') || "
+    "to_tsvector('english', %s)"
+)
+
+
+def _has_fts5(cursor):
+    cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+    if cursor.fetchone()[0]:
+        return True
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        cursor.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except Exception:
+        return False
+
+
+def _documents(apps):
+    import json
+    import zlib
+
+    CVContent = apps.get_model("analyzer", "CVContent")
+    for content in CVContent.objects.order_by("pk").iterator(chunk_size=CHUNK_SIZE):
+        if content.packed:
+            texts = json.loads(zlib.decompress(bytes(content.packed)).decode("utf-8"))
+        else:
+            texts = {name: getattr(content, name) for name in TEXT_FIELDS}
+        yield content.upload_id, texts.get("skills") or "", texts.get("experience") or "", texts.get("raw_text") or ""
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("ALTER TABLE analyzer_cvcontent ADD COLUMN search_vector tsvector")
+            cursor.execute(
+                "CREATE INDEX cvcontent_search_idx ON analyzer_cvcontent USING GIN (search_vector)"
+            )
+            cursor.executemany(
+                f"UPDATE analyzer_cvcontent SET search_vector = {PG_DOCUMENT_SQL} WHERE upload_id = %s",
+                [(skills, experience, raw_text, pk) for pk, skills, experience, raw_text in _documents(apps)],
+            )
+        elif connection.vendor == "sqlite" and _has_fts5(cursor):
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                "skills, experience, raw_text, tokenize = 'porter unicode61')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON analyzer_cvcontent "
+                f"BEGIN DELETE FROM {FTS_TABLE} WHERE rowid = old.upload_id; END"
+            )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, skills, experience, raw_text) VALUES (%s, %s, %s, %s)",
+                list(_documents(apps)),
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("DROP INDEX IF EXISTS cvcontent_search_idx")
+            cursor.execute("ALTER TABLE analyzer_cvcontent DROP COLUMN IF EXISTS search_vector")
+        elif connection.vendor == "sqlite":
+            cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0010_cvupload_features'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0011_cvcontent_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('role_count', models.PositiveIntegerField(default=0)),
+                ('weight', models.FloatField(default=1.0)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CVSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_postings', to='analyzer.cvupload')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='analyzer.skill')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('skill', 'upload'), name='cvskill_posting_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0012_skill_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvbatch',
+            name='results_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
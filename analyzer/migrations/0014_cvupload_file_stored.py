@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0013_cvbatch_results_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvupload',
+            name='file_stored',
+            field=models.BooleanField(default=True, help_text='False for analyze-only uploads, whose file was never kept'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0014_cvupload_file_stored'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvbatch',
+            name='event_seq',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='cvupload',
+            name='event_seq',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='cvupload',
+            name='parse_ms',
+            field=models.FloatField(blank=True, help_text='Extraction time; empty for parse cache hits', null=True),
+        ),
+        migrations.AddField(
+            model_name='cvupload',
+            name='score_ms',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='cvupload',
+            index=models.Index(fields=['batch', 'event_seq'], name='cvupload_batch_event_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def add_column(apps, schema_editor):
+    # PostgreSQL has had the column (and its GIN index) since 0011
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        schema_editor.execute(
+            f"ALTER TABLE analyzer_cvcontent ADD COLUMN {connection.ops.quote_name('search_vector')} text NULL"
+        )
+
+
+def drop_column(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        schema_editor.execute(
+            f"ALTER TABLE analyzer_cvcontent DROP COLUMN {connection.ops.quote_name('search_vector')}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0016_cvupload_claimed_at'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_column, drop_column),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='cvcontent',
+                    name='search_vector',
+                    field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,65 @@
+from django.db import migrations
+
+FTS_TABLE = "analyzer_cvcontent_fts"
+TEXT_FIELDS = ("raw_text", "contact_info", "experience", "education", "skills")
+CHUNK_SIZE = 500
+
+
+def _documents(apps):
+    import json
+    import zlib
+
+    CVContent = apps.get_model("analyzer", "CVContent")
+    for content in CVContent.objects.order_by("pk").iterator(chunk_size=CHUNK_SIZE):
+        if content.packed:
+            texts = json.loads(zlib.decompress(bytes(content.packed)).decode("utf-8"))
+        else:
+            texts = {name: getattr(content, name) for name in TEXT_FIELDS}
+        yield content.upload_id, texts.get("skills") or "", texts.get("experience") or "", texts.get("raw_text") or ""
+
+
+def _rebuild(apps, schema_editor, options):
+    # Recreate the SQLite FTS5 table (when 0011 made one) and reindex
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        if FTS_TABLE not in connection.introspection.table_names(cursor):
+            return
+        cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete")
+        cursor.execute(f"DROP TABLE {FTS_TABLE}")
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"skills, experience, raw_text, {options}tokenize = 'porter unicode61')"
+        )
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, skills, experience, raw_text) VALUES (%s, %s, %s, %s)",
+            list(_documents(apps)),
+        )
+
+
+def make_contentless(apps, schema_editor):
+    # The index keeps no copy of the text; entries are removed from Python
+    # (analyzer.search.unindex), so the delete trigger goes
+    _rebuild(apps, schema_editor, "content = '', ")
+
+
+def restore_content(apps, schema_editor):
+    _rebuild(apps, schema_editor, "")
+    with schema_editor.connection.cursor() as cursor:
+        if FTS_TABLE in schema_editor.connection.introspection.table_names(cursor):
+            cursor.execute(
+                f"CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON analyzer_cvcontent "
+                f"BEGIN DELETE FROM {FTS_TABLE} WHERE rowid = old.upload_id; END"
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0017_cvcontent_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(make_contentless, restore_content),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:01
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0018_contentless_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='cvupload',
+            name='cvupload_user_rank_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='cvupload',
+            name='cvupload_batch_rank_idx',
+        ),
+        migrations.AddIndex(
+            model_name='cvupload',
+            index=models.Index(models.F('user'), models.OrderBy(django.db.models.functions.comparison.Coalesce('job_match_score', django.db.models.expressions.RawSQL('0.0', (), output_field=models.FloatField())), descending=True), models.F('id'), models.F('processed'), models.F('job_match_score'), condition=models.Q(('processed', True)), name='cvupload_user_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cvupload',
+            index=models.Index(models.F('batch'), models.OrderBy(django.db.models.functions.comparison.Coalesce('job_match_score', django.db.models.expressions.RawSQL('0.0', (), output_field=models.FloatField())), descending=True), models.F('id'), models.F('processed'), models.F('job_match_score'), condition=models.Q(('processed', True)), name='cvupload_batch_rank_idx'),
+        ),
+    ]
@@ -1,12 +1,143 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.contrib.auth.models import User
+import json
 import os
+import uuid
+import zlib
+
+from . import search
+
+# Extracted text kept in CVContent rather than on CVUpload itself
+CONTENT_TEXT_FIELDS = ("raw_text", "contact_info", "experience", "education", "skills")
+
+# Columns set from an analyzer.features record by CVUpload.set_features()
+FEATURE_FIELDS = ("features", "experience_years", "degree_level")
+
+# CV files accepted for upload, on their own or inside an archive
+CV_FILE_EXTENSIONS = (".pdf", ".doc", ".docx", ".txt")
+CV_MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
 def cv_upload_path(instance, filename):
     return f"cvs/{timezone.now().strftime('%Y/%m/%d')}/{filename}"
 
+class CVBatch(models.Model):
+    """A bulk upload whose files are processed by the background job queue."""
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="cv_batches"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    total_files = models.PositiveIntegerField(default=0)
+
+    # ---------------- JOB CRITERIA ----------------
+    job_name = models.CharField(max_length=255, blank=True)
+    required_experience = models.PositiveIntegerField(null=True, blank=True)
+    required_education = models.CharField(max_length=100, blank=True)
+    required_skills = models.JSONField(default=list, blank=True)
+
+    # Bumped when finished results change (re-match, CV deletion); see
+    # analyzer.results_cache
+    results_version = models.PositiveIntegerField(default=0)
+
+    # Last progress event number handed to a finished row; see
+    # analyzer.progress
+    event_seq = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Batch {self.id} ({self.status})"
+
+    @property
+    def criteria(self):
+        return {
+            "required_experience": self.required_experience,
+            "required_education": self.required_education,
+            "required_skills": self.required_skills or [],
+        }
+
+    @property
+    def is_finished(self):
+        return self.status == self.STATUS_DONE
+
+
+def stored_rank_score():
+    """
+    job_match_score as ranked, with rows never matched (NULL) scoring 0.
+    The 0 is written into the SQL rather than passed as a parameter, so
+    ranking queries use the same expression as the ranked-result indexes.
+    """
+    return Coalesce("job_match_score", RawSQL("0.0", (), output_field=models.FloatField()))
+
+
+class CVUploadQuerySet(models.QuerySet):
+    # Columns a results listing needs; the rest (suggestions, error) stays
+    # unloaded. Extracted text lives in CVContent and is never joined here.
+    # For 1,000 synthetic CVs (~2.5 KB of text each), tracemalloc measured
+    # about 5.5 MiB for full rows, 1.0 MiB for for_listing() and 0.6 MiB for
+    # summaries(). Real CVs carry more text, so full rows cost even more.
+    LISTING_FIELDS = (
+        "id", "file", "file_stored", "uploaded_at", "processed", "status", "target_job_role",
+        "overall_score", "job_match_score",
+    )
+
+    def for_listing(self):
+        """Model instances with only the listing columns loaded."""
+        return self.only(*self.LISTING_FIELDS)
+
+    def summaries(self):
+        """Plain dicts of the listing columns, for JSON and other compact output."""
+        return self.values(*self.LISTING_FIELDS)
+
+    def with_content(self):
+        """Join the extracted text, for detail pages and re-scoring."""
+        return self.select_related("content")
+
+
+def _content_text(name):
+    def getter(self):
+        return self.texts[name]
+
+    def setter(self, value):
+        self.set_texts(**{name: value})
+
+    return property(getter, setter)
+
+
 class CVUpload(models.Model):
+    STATUS_QUEUED = "queued"
+    STATUS_PROCESSING = "processing"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_PROCESSING, "Processing"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -15,12 +146,41 @@ class CVUpload(models.Model):
         related_name="cv_uploads"
     )
 
+    batch = models.ForeignKey(
+        CVBatch,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="uploads"
+    )
+
     file = models.FileField(upload_to=cv_upload_path)
+    file_stored = models.BooleanField(
+        default=True,
+        help_text="False for analyze-only uploads, whose file was never kept"
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        help_text="SHA-256 of the uploaded bytes"
+    )
     uploaded_at = models.DateTimeField(auto_now_add=True)
     processed = models.BooleanField(default=False)
 
-    # ---------------- RAW CONTENT ----------------
-    raw_text = models.TextField(blank=True)
+    # ---------------- JOB QUEUE ----------------
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    error = models.TextField(blank=True)
+    # When the row was last claimed or its claim renewed; a "processing" row
+    # older than settings.CV_CLAIM_LEASE is claimed again (its worker died)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    # ---------------- PROGRESS ----------------
+    # Numbered per batch when the row finishes (analyzer.progress streams
+    # rows in this order), with the time spent on it
+    event_seq = models.PositiveIntegerField(null=True, blank=True)
+    parse_ms = models.FloatField(null=True, blank=True, help_text="Extraction time; empty for parse cache hits")
+    score_ms = models.FloatField(null=True, blank=True)
 
     # ---------------- CONTEXT ----------------
     target_job_role = models.CharField(
@@ -29,12 +189,6 @@ class CVUpload(models.Model):
         help_text="Job role this CV was evaluated against"
     )
 
-    # ---------------- SECTION DATA ----------------
-    contact_info = models.TextField(blank=True)
-    experience = models.TextField(blank=True)
-    education = models.TextField(blank=True)
-    skills = models.TextField(blank=True)
-
     # ---------------- SCORES ----------------
     overall_score = models.FloatField(null=True, blank=True)
     contact_score = models.FloatField(null=True, blank=True)
@@ -44,20 +198,182 @@ class CVUpload(models.Model):
     format_score = models.FloatField(null=True, blank=True)
     job_match_score = models.FloatField(null=True, blank=True)
 
+    # ---------------- FEATURES ----------------
+    # Derived once at parse time (analyzer.features); the record drives
+    # re-scoring and re-matching, the columns allow SQL filtering.
+    features = models.JSONField(blank=True, null=True)
+    experience_years = models.PositiveIntegerField(null=True, blank=True)
+    degree_level = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        help_text="Highest degree mentioned: 0 none, 1 high school ... 5 PhD"
+    )
+
     # ---------------- FEEDBACK ----------------
     suggestions = models.JSONField(blank=True, null=True)
 
+    objects = CVUploadQuerySet.as_manager()
+
+    # ---------------- CONTENT (stored in CVContent) ----------------
+    raw_text = _content_text("raw_text")
+    contact_info = _content_text("contact_info")
+    experience = _content_text("experience")
+    education = _content_text("education")
+    skills = _content_text("skills")
+
     class Meta:
         ordering = ["-uploaded_at"]
         indexes = [
             models.Index(fields=["uploaded_at"]),
             models.Index(fields=["processed"]),
             models.Index(fields=["target_job_role"]),
+            # Ranked results: processed CVs by stored_rank_score(), per user /
+            # batch. Partial on processed, which Django filters as a bare
+            # boolean column; carrying `processed` and the raw score as the
+            # last keys lets SQLite answer id/score projections from the
+            # index alone.
+            models.Index(
+                models.F("user"), stored_rank_score().desc(), models.F("id"),
+                models.F("processed"), models.F("job_match_score"),
+                condition=models.Q(processed=True),
+                name="cvupload_user_rank_idx",
+            ),
+            models.Index(
+                models.F("batch"), stored_rank_score().desc(), models.F("id"),
+                models.F("processed"), models.F("job_match_score"),
+                condition=models.Q(processed=True),
+                name="cvupload_batch_rank_idx",
+            ),
+            # A user's uploads, newest first
+            models.Index(fields=["user", "-uploaded_at"], name="cvupload_user_recent_idx"),
+            # Progress events of a batch, in order
+            models.Index(fields=["batch", "event_seq"], name="cvupload_batch_event_idx"),
         ]
 
     def __str__(self):
         return f"{os.path.basename(self.file.name)} - {self.uploaded_at:%Y-%m-%d %H:%M}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if getattr(self, "_texts_changed", False):
+            search.unindex([self.pk])
+            CVContent.from_texts(self, self._texts).save()
+            search.index_documents([(self.pk, self._texts)])
+            from .skill_index import index_skills
+            index_skills([(self.pk, self._texts.get("skills"))])
+            self._texts_changed = False
+
+    @property
+    def texts(self):
+        """Extracted text by field name, loaded from CVContent on first use."""
+        if getattr(self, "_texts", None) is None:
+            content = None
+            if self.pk is not None:
+                try:
+                    content = self.content
+                except CVContent.DoesNotExist:
+                    pass
+            self._texts = content.texts() if content else dict.fromkeys(CONTENT_TEXT_FIELDS, "")
+        return self._texts
+
+    def set_texts(self, **texts):
+        """Update extracted text; written to CVContent by save() or jobs.save_uploads()."""
+        self._texts = {**self.texts, **texts}
+        self._texts_changed = True
+
+    def set_features(self, features):
+        """Store a feature record and the columns derived from it."""
+        self.features = features
+        self.experience_years = features["experience_years"]
+        self.degree_level = features["degree_level"]
+
+    @property
+    def filename(self):
+        return os.path.basename(self.file.name)
+
     @property
     def file_extension(self):
         return os.path.splitext(self.file.name)[1].lower()
+
+
+class CVContent(models.Model):
+    """
+    Extracted text of a CV, one row per upload. Keeping it out of CVUpload
+    keeps that table narrow for listings, admin filters and score ordering.
+    With settings.CV_CONTENT_COMPRESS the text is stored zlib-compressed in
+    `packed` and the text columns are left empty.
+    """
+
+    upload = models.OneToOneField(
+        CVUpload,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="content"
+    )
+    raw_text = models.TextField(blank=True)
+    contact_info = models.TextField(blank=True)
+    experience = models.TextField(blank=True)
+    education = models.TextField(blank=True)
+    skills = models.TextField(blank=True)
+    packed = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text="zlib-compressed JSON of the text fields"
+    )
+    # PostgreSQL full-text document, GIN indexed and written only by
+    # analyzer.search.index_documents(); an unused NULL column elsewhere
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    def __str__(self):
+        return f"Content of upload {self.upload_id}"
+
+    @classmethod
+    def from_texts(cls, upload, texts, compress=None):
+        """Unsaved row holding `texts`, compressed if CV_CONTENT_COMPRESS is on."""
+        if compress is None:
+            compress = getattr(settings, "CV_CONTENT_COMPRESS", False)
+        texts = {name: texts.get(name) or "" for name in CONTENT_TEXT_FIELDS}
+        if compress:
+            return cls(upload=upload, packed=zlib.compress(json.dumps(texts).encode("utf-8")))
+        return cls(upload=upload, packed=None, **texts)
+
+    def texts(self, names=CONTENT_TEXT_FIELDS):
+        """The requested text fields; only those columns need to be loaded."""
+        if self.packed:
+            texts = json.loads(zlib.decompress(bytes(self.packed)).decode("utf-8"))
+            return {name: texts.get(name, "") for name in names}
+        return {name: getattr(self, name) for name in names}
+
+
+class Skill(models.Model):
+    """
+    Normalized skill dictionary entry (see analyzer.skill_index).
+    `role_count` is how many KEYWORDS roles list the skill; `weight` is
+    derived from it so skills specific to few roles count for more.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    role_count = models.PositiveIntegerField(default=0)
+    weight = models.FloatField(default=1.0)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class CVSkill(models.Model):
+    """Posting: the CV lists the skill. One row per (skill, CV) pair."""
+
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="postings")
+    upload = models.ForeignKey(CVUpload, on_delete=models.CASCADE, related_name="skill_postings")
+
+    class Meta:
+        constraints = [
+            # Doubles as the posting-list index: skill -> CVs, in id order
+            models.UniqueConstraint(fields=["skill", "upload"], name="cvskill_posting_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.skill_id} in upload {self.upload_id}"
@@ -0,0 +1,59 @@
+import hashlib
+import logging
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .parser import CVParser
+
+logger = logging.getLogger(__name__)
+
+
+def _cache():
+    return caches[getattr(settings, "CV_PARSE_CACHE_ALIAS", "cv_parse")]
+
+
+def file_digest(file) -> str:
+    """SHA-256 of an uploaded or stored file, read in chunks."""
+    digest = hashlib.sha256()
+    if hasattr(file, "chunks"):
+        for chunk in file.chunks():
+            digest.update(chunk)
+        if hasattr(file, "seek"):
+            file.seek(0)
+    else:
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(digest: str, extension: str, parser: CVParser) -> str:
+    return f"cvparse:{parser.version}:{extension.lower()}:{digest}"
+
+
+def get_parsed(digest: str, extension: str, parser: CVParser) -> Optional[Dict]:
+    """Return the cached parse_cv() output for these bytes, if any."""
+    if not digest:
+        return None
+    try:
+        return _cache().get(cache_key(digest, extension, parser))
+    except Exception as e:
+        logger.warning(f"Parse cache read failed: {e}")
+        return None
+
+
+def store_parsed(digest: str, extension: str, parser: CVParser, parsed: Dict) -> None:
+    """
+    Cache a successful parse_cv() result, without its parse timing;
+    failures are never cached.
+    """
+    if not digest or parsed.get("raw_text", "").startswith("Error"):
+        return
+    try:
+        _cache().set(
+            cache_key(digest, extension, parser), {k: v for k, v in parsed.items() if k != "parse_ms"}
+        )
+    except Exception as e:
+        logger.warning(f"Parse cache write failed: {e}")
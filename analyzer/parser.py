@@ -1,21 +1,156 @@
 import PyPDF2
 import docx
+import atexit
+import hashlib
+import io
+import json
 import re
-from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+import multiprocessing
 import os
+import signal
+import threading
+import time
 import logging
 
+from .patterns import CONTACT_PATTERNS, CRITERIA_SKILL_SPLIT_RE, DURATION_RE, YEAR_RANGE_RE, compile_all
+from .segmenter import SectionSegmenter
+
 logger = logging.getLogger(__name__)
 
+# Bump whenever extraction/sectioning code changes in a way that alters
+# parse_cv() output; it is part of CVParser.version and thus of cache keys.
+PARSER_VERSION = 2
+
+# What extraction reads: a file path, the file's bytes, or a binary file
+# object such as a Django UploadedFile (read from the start, left open)
+Source = Union[str, bytes, BinaryIO]
+
+
+class EncryptedPDFError(Exception):
+    """Raised when a PDF cannot be decrypted with an empty password."""
+
+
+class ParseTimeout(BaseException):
+    """
+    Raised inside a parse worker when a file exceeds its time budget. It is
+    not an Exception so the extractors' error handling cannot swallow it.
+    """
+
+
+def _raise_parse_timeout(signum, frame):
+    raise ParseTimeout("parsing timed out")
+
+
+def _missing(source: Source) -> bool:
+    return isinstance(source, str) and not os.path.exists(source)
+
+
+def _describe(source: Source) -> str:
+    return source if isinstance(source, str) else getattr(source, "name", None) or "<in-memory file>"
+
+
+@contextmanager
+def _binary(source: Source) -> Iterator[BinaryIO]:
+    """A readable binary file for a Source, positioned at the start."""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            yield f
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    else:
+        source.seek(0)
+        yield source
+
+
+_pool_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 1
+
+
+def _shared_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    The process pool parse_many() runs on, created on first use and kept
+    for the life of the process. It is sized to the most workers asked for
+    before it was created; callers bound their own in-flight files.
+    """
+    global _pool, _pool_size
+    with _pool_lock:
+        _pool_size = max(_pool_size, workers)
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_pool_size,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    # A dead worker process breaks the whole pool; the next caller gets a new one
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _parse_job(parser: "CVParser", source: Source, extension: str, timeout: Optional[float]) -> Dict:
+    """
+    Entry point for parse_many() worker processes. The per-file timeout is
+    enforced with SIGALRM, so it only applies on POSIX platforms and when
+    running in a main thread: always inside pool workers, but not when a
+    queue or request thread parses inline. The result carries `parse_ms`,
+    the time spent on the file.
+    """
+    use_alarm = (
+        bool(timeout)
+        and hasattr(signal, "SIGALRM")
+        and threading.current_thread() is threading.main_thread()
+    )
+    started = time.perf_counter()
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_parse_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        result = parser.parse_cv(source, extension)
+    except ParseTimeout:
+        result = parser.failed_result(f"Error: parsing timed out after {timeout}s")
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    result["parse_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
 class CVParser:
-    def __init__(self):
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        early_stop: bool = False
+    ):
+        # ---------------- PDF STREAMING LIMITS ----------------
+        # Stop reading a PDF after `max_pages` pages / `max_chars` characters.
+        # With `early_stop`, parse_cv() also stops once contact details and the
+        # experience, education and skills headers have all been seen.
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.early_stop = early_stop
+
         # ---------------- CONTACT PATTERNS ----------------
-        self.contact_patterns = [
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b',
-            r'(?:\+\d{1,3}\s?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}',
-            r'\b\d{10,15}\b'
-        ]
+        self.contact_patterns = list(CONTACT_PATTERNS)
 
         # ---------------- SECTION KEYWORDS ----------------
         self.experience_keywords = [
@@ -30,48 +165,167 @@ class CVParser:
             'skills', 'technical skills', 'competencies',
             'technologies', 'tools', 'expertise'
         ]
+        self.summary_keywords = [
+            'summary', 'profile', 'objective', 'about me'
+        ]
+        self.projects_keywords = [
+            'projects', 'personal projects', 'key projects', 'portfolio'
+        ]
+        self.certifications_keywords = [
+            'certifications', 'certificates', 'licenses', 'courses'
+        ]
 
         self.stop_sections = {
             'experience': ['education', 'skills', 'projects', 'certifications'],
             'education': ['experience', 'skills', 'projects'],
-            'skills': ['experience', 'education', 'projects']
+            'skills': ['experience', 'education', 'projects'],
+            'summary': ['experience', 'education', 'skills', 'projects'],
+            'projects': ['experience', 'education', 'skills', 'certifications'],
+            'certifications': ['experience', 'education', 'skills', 'projects']
         }
 
+        # Maximum body lines captured per section
+        self.section_max_lines = {
+            'experience': 15,
+            'education': 10,
+            'skills': 8,
+            'summary': 6,
+            'projects': 10,
+            'certifications': 8
+        }
+
+        self._segmenter = None
+        self._segmenter_config = None
+
+    @property
+    def version(self) -> str:
+        """
+        Fingerprint of the parser code version and its configuration. Any
+        change to patterns or section keywords yields a new version, which
+        invalidates cached parse results automatically.
+        """
+        config = {
+            "version": PARSER_VERSION,
+            "contact_patterns": self.contact_patterns,
+            "experience_keywords": self.experience_keywords,
+            "education_keywords": self.education_keywords,
+            "skills_keywords": self.skills_keywords,
+            "summary_keywords": self.summary_keywords,
+            "projects_keywords": self.projects_keywords,
+            "certifications_keywords": self.certifications_keywords,
+            "stop_sections": self.stop_sections,
+            "section_max_lines": self.section_max_lines,
+            "max_pages": self.max_pages,
+            "max_chars": self.max_chars,
+            "early_stop": self.early_stop,
+        }
+        payload = json.dumps(config, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+    @property
+    def segmenter(self) -> SectionSegmenter:
+        """Compiled single-pass segmenter, rebuilt if the keywords change."""
+        keywords = {
+            "experience": self.experience_keywords,
+            "education": self.education_keywords,
+            "skills": self.skills_keywords,
+            "summary": self.summary_keywords,
+            "projects": self.projects_keywords,
+            "certifications": self.certifications_keywords,
+        }
+        config = (
+            tuple((name, tuple(words)) for name, words in keywords.items()),
+            tuple((name, tuple(words)) for name, words in self.stop_sections.items()),
+            tuple(self.section_max_lines.items()),
+        )
+        if self._segmenter is None or self._segmenter_config != config:
+            self._segmenter = SectionSegmenter(keywords, self.stop_sections, self.section_max_lines)
+            self._segmenter_config = config
+        return self._segmenter
+
+    @property
+    def contact_regexes(self) -> Tuple[re.Pattern, ...]:
+        """contact_patterns compiled case-insensitively, cached per pattern list."""
+        return compile_all(self.contact_patterns, re.IGNORECASE)
+
     # --------------------------------------------------
     # TEXT EXTRACTION
     # --------------------------------------------------
 
-    def extract_text_from_pdf(self, file_path: str) -> str:
-        if not os.path.exists(file_path):
-            return f"Error: file not found - {file_path}"
-
-        try:
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                text = ""
-
-                if reader.is_encrypted:
-                    try:
-                        reader.decrypt("")
-                    except Exception:
-                        return "Error: PDF is password protected"
+    def iter_pdf_pages(self, source: Source) -> Iterator[str]:
+        """
+        Yield the text of each non-empty PDF page, stopping at max_pages or
+        once max_chars characters have been produced. Only one page of text
+        is held at a time.
+        """
+        with _binary(source) as f:
+            reader = PyPDF2.PdfReader(f)
+
+            if reader.is_encrypted:
+                try:
+                    reader.decrypt("")
+                except Exception:
+                    raise EncryptedPDFError(_describe(source))
+
+            remaining = self.max_chars
+            for index, page in enumerate(reader.pages):
+                if self.max_pages is not None and index >= self.max_pages:
+                    break
+                page_text = page.extract_text()
+                if not page_text:
+                    continue
+                if remaining is not None:
+                    page_text = page_text[:remaining]
+                    remaining -= len(page_text)
+                yield page_text
+                if remaining is not None and remaining <= 0:
+                    break
 
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+    def extract_text_from_pdf(self, source: Source, stop_when_complete: bool = False) -> str:
+        if _missing(source):
+            return f"Error: file not found - {source}"
 
-                return text.strip() or "No readable text found in PDF"
+        try:
+            pages = self.iter_pdf_pages(source)
+            if stop_when_complete:
+                pages = self._until_sections_found(pages)
+            text = "\n".join(pages)
+            return text.strip() or "No readable text found in PDF"
+        except EncryptedPDFError:
+            return "Error: PDF is password protected"
         except Exception as e:
             logger.error(f"PDF read error: {e}")
             return f"Error reading PDF: {e}"
 
-    def extract_text_from_docx(self, file_path: str) -> str:
-        if not os.path.exists(file_path):
-            return f"Error: file not found - {file_path}"
+    def _until_sections_found(self, pages: Iterator[str]) -> Iterator[str]:
+        """
+        Pass pages through until contact info and the experience, education
+        and skills headers have all appeared, plus one more page so the last
+        section found still gets its body lines.
+        """
+        pending = {"contact", "experience", "education", "skills"}
+        try:
+            for page_text in pages:
+                yield page_text
+                if not pending:
+                    return
+                pending.difference_update(self._sections_in(page_text))
+        finally:
+            pages.close()
+
+    def _sections_in(self, text: str) -> set:
+        found = set(self.segmenter.headers_in(text))
+        if any(p.search(text) for p in self.contact_regexes):
+            found.add("contact")
+        return found
+
+    def extract_text_from_docx(self, source: Source) -> str:
+        if _missing(source):
+            return f"Error: file not found - {source}"
 
         try:
-            doc = docx.Document(file_path)
+            with _binary(source) as f:
+                doc = docx.Document(f)
             text = ""
 
             for p in doc.paragraphs:
@@ -89,29 +343,35 @@ class CVParser:
             logger.error(f"DOCX read error: {e}")
             return f"Error reading DOCX: {e}"
 
-    def extract_text_from_txt(self, file_path: str) -> str:
-        if not os.path.exists(file_path):
-            return f"Error: file not found - {file_path}"
+    def extract_text_from_txt(self, source: Source) -> str:
+        if _missing(source):
+            return f"Error: file not found - {source}"
+
+        try:
+            with _binary(source) as f:
+                data = f.read()
+        except Exception as e:
+            logger.error(f"TXT read error: {e}")
+            return "Error reading TXT file"
 
         for encoding in ["utf-8", "utf-16", "latin-1", "cp1252"]:
             try:
-                with open(file_path, "r", encoding=encoding) as f:
-                    text = f.read()
-                    return text.strip() or "Empty text file"
+                text = data.decode(encoding)
             except UnicodeDecodeError:
                 continue
-            except Exception as e:
-                logger.error(f"TXT read error: {e}")
+            # Universal newlines, as text-mode open() gave
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+            return text.strip() or "Empty text file"
         return "Error reading TXT file"
 
-    def extract_text(self, file_path: str, extension: str) -> str:
+    def extract_text(self, source: Source, extension: str) -> str:
         extension = extension.lower()
         if extension == ".pdf":
-            return self.extract_text_from_pdf(file_path)
+            return self.extract_text_from_pdf(source)
         if extension in [".doc", ".docx"]:
-            return self.extract_text_from_docx(file_path)
+            return self.extract_text_from_docx(source)
         if extension == ".txt":
-            return self.extract_text_from_txt(file_path)
+            return self.extract_text_from_txt(source)
         return f"Unsupported file format: {extension}"
 
     # --------------------------------------------------
@@ -123,74 +383,131 @@ class CVParser:
             return "Extraction failed"
 
         matches = []
-        for pattern in self.contact_patterns:
-            matches.extend(re.findall(pattern, text, re.IGNORECASE))
+        for pattern in self.contact_regexes:
+            matches.extend(pattern.findall(text))
         return "; ".join(sorted(set(matches))) or "No contact information found"
 
-    def extract_section(
-        self,
-        text: str,
-        keywords: List[str],
-        section_name: str,
-        max_lines: int
-    ) -> str:
-        if not text or text.startswith("Error"):
-            return f"No {section_name} section found"
-
-        lines = [l.strip() for l in text.split("\n") if l.strip()]
-        capture = False
-        section_lines = []
-
-        for line in lines:
-            lower = line.lower()
-
-            if any(k in lower for k in keywords):
-                capture = True
-                continue
-
-            if capture and any(stop in lower for stop in self.stop_sections.get(section_name.lower(), [])):
-                break
-
-            if capture:
-                section_lines.append(line)
-                if len(section_lines) >= max_lines:
-                    break
-
-        return "\n".join(section_lines) or f"No {section_name} section found"
-
-    def extract_experience(self, text: str) -> str:
-        return self.extract_section(text, self.experience_keywords, "experience", 15)
-
-    def extract_education(self, text: str) -> str:
-        return self.extract_section(text, self.education_keywords, "education", 10)
-
-    def extract_skills(self, text: str) -> str:
-        return self.extract_section(text, self.skills_keywords, "skills", 8)
+    def extract_sections(self, text: str) -> Dict[str, str]:
+        """
+        Extract every known section (experience, education, skills, ...)
+        with one pass over the text. Call it once per document and read the
+        sections from the result.
+        """
+        return self.segmenter.segment(text)
 
     # --------------------------------------------------
     # MAIN PARSER
     # --------------------------------------------------
 
-    def parse_cv(self, file_path: str, extension: str) -> Dict:
-        raw_text = self.extract_text(file_path, extension)
+    def failed_result(self, raw_text: str) -> Dict:
+        result = {"raw_text": raw_text, "contact_info": "Extraction failed"}
+        for name in self.section_max_lines:
+            result[name] = "Extraction failed"
+        return result
+
+    def parse_cv(self, source: Source, extension: str) -> Dict:
+        """Parse a CV from a path, its bytes or a binary file object."""
+        if self.early_stop and extension.lower() == ".pdf":
+            raw_text = self.extract_text_from_pdf(source, stop_when_complete=True)
+        else:
+            raw_text = self.extract_text(source, extension)
 
         if raw_text.startswith("Error"):
-            return {
-                "raw_text": raw_text,
-                "contact_info": "Extraction failed",
-                "experience": "Extraction failed",
-                "education": "Extraction failed",
-                "skills": "Extraction failed",
-            }
+            return self.failed_result(raw_text)
 
         return {
             "raw_text": raw_text,
             "contact_info": self.extract_contact_info(raw_text),
-            "experience": self.extract_experience(raw_text),
-            "education": self.extract_education(raw_text),
-            "skills": self.extract_skills(raw_text),
+            **self.extract_sections(raw_text),
         }
 
+    # --------------------------------------------------
+    # PARALLEL BATCH PARSING
+    # --------------------------------------------------
+
+    def parse_many(
+        self,
+        files: Iterable[Union[str, Tuple[str, str], Tuple[Hashable, str, Source]]],
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Iterator[Tuple[Hashable, Dict]]:
+        """
+        Parse many files across a process pool, yielding (key, parsed) pairs
+        in completion order.
+
+        `files` holds paths, (path, extension) tuples, or (key, extension,
+        source) tuples for files that are not read from `key` - e.g. bytes
+        already in memory; the path or key is what gets yielded. `workers`
+        defaults to the CPU count; with one worker (or one file) everything
+        runs in this process. Otherwise files run on a process pool shared
+        by every call in this process, with at most `workers` of this
+        call's files in flight. `timeout` caps the seconds spent on a
+        single file; it is enforced in pool workers and on the main thread,
+        so files parsed inline from another thread run without it. Each
+        result carries the milliseconds spent on it as `parse_ms`. Files
+        that fail, time out or take down their worker process are yielded
+        with the same "Extraction failed" result parse_cv() returns for
+        unreadable files, and the remaining files keep going.
+        """
+        jobs = []
+        for f in files:
+            key, extension, *source = (f, os.path.splitext(f)[1]) if isinstance(f, str) else tuple(f)
+            jobs.append((key, extension, source[0] if source else key))
+        workers = workers or os.cpu_count() or 1
+
+        if workers <= 1 or len(jobs) <= 1:
+            for key, extension, source in jobs:
+                yield key, _parse_job(self, source, extension, timeout)
+            return
+
+        crashed = yield from self._parse_in_pool(jobs, workers, timeout)
+
+        # A worker died and took every in-flight file with it. Re-run those
+        # files one at a time so a single bad file can only fail itself.
+        for job in crashed:
+            isolated = yield from self._parse_in_pool([job], 1, timeout)
+            for key, _, _ in isolated:
+                logger.error(f"Parser worker crashed on {key}")
+                yield key, self.failed_result("Error: parser worker crashed")
+
+    def _parse_in_pool(self, jobs, workers, timeout):
+        # Yields (key, parsed) as files finish and returns the jobs that
+        # were in flight when a worker died
+        crashed = []
+        queued = deque(jobs)
+        running = {}
+        try:
+            while queued or running:
+                while queued and len(running) < workers:
+                    key, extension, source = job = queued.popleft()
+                    pool = _shared_pool(workers)
+                    try:
+                        running[pool.submit(_parse_job, self, source, extension, timeout)] = (job, pool)
+                    except RuntimeError:
+                        # Broken, or shut down by a caller that found it broken
+                        _discard_pool(pool)
+                        queued.appendleft(job)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, pool = running.pop(future)
+                    key = job[0]
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        crashed.append(job)
+                        _discard_pool(pool)
+                        continue
+                    except Exception as e:
+                        logger.error(f"Parse error for {key}: {e}")
+                        result = self.failed_result(f"Error parsing file: {e}")
+                    yield key, result
+        finally:
+            # Stopped early: drop this call's files that have not started
+            for future in running:
+                future.cancel()
+        return crashed
+
     # --------------------------------------------------
     # MATCHING FUNCTION
     # --------------------------------------------------
@@ -229,20 +546,14 @@ class CVParser:
         # -------- Experience Matching --------
         if required_experience:
             years = []
-            duration_matches = re.findall(
-                r'(\d+)\s*(?:\+)?(?:-|to)?\s*(\d+)?\s*(?:years|yrs|year)',
-                exp_text
-            )
+            duration_matches = DURATION_RE.findall(exp_text)
             for y1, y2 in duration_matches:
                 if y1.isdigit():
                     years.append(int(y1))
                 if y2 and y2.isdigit():
                     years.append(int(y2))
 
-            year_ranges = re.findall(
-                r'\b((?:19|20)\d{2})\s*[-–]\s*((?:19|20)\d{2})\b',
-                exp_text
-            )
+            year_ranges = YEAR_RANGE_RE.findall(exp_text)
             for start, end in year_ranges:
                 years.append(max(0, int(end) - int(start)))
 
@@ -275,7 +586,7 @@ class CVParser:
 
         # -------- Skills Matching --------
         if required_skills:
-            cv_skills = re.split(r",|;|\n", skills_text)
+            cv_skills = CRITERIA_SKILL_SPLIT_RE.split(skills_text)
             cv_skills = [s.strip().lower() for s in cv_skills if s.strip()]
 
             matched_skills = [
@@ -0,0 +1,41 @@
+"""
+Compiled regular expressions shared by CVParser and CVScorer.
+
+Hot paths use these module-level objects instead of handing raw pattern
+strings to re.search()/re.findall(), which pays a cache lookup (and a
+compile on a cache miss) on every call.
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+# ---------------- CONTACT ----------------
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'
+PHONE_PATTERN = r'(?:\+\d{1,3}\s?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+INTL_PHONE_PATTERN = r'\+\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}'
+LONG_NUMBER_PATTERN = r'\b\d{10,15}\b'
+
+CONTACT_PATTERNS = [EMAIL_PATTERN, PHONE_PATTERN, INTL_PHONE_PATTERN, LONG_NUMBER_PATTERN]
+
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+PHONE_RE = re.compile(PHONE_PATTERN)
+
+# ---------------- DATES & NUMBERS ----------------
+YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+METRIC_RE = re.compile(r'\b\d+%|\$\d+|\b\d+\s?(k|m|million|thousand)\b')
+DURATION_RE = re.compile(r'(\d+)\s*(?:\+)?(?:-|to)?\s*(\d+)?\s*(?:years|yrs|year)')
+YEAR_RANGE_RE = re.compile(r'\b((?:19|20)\d{2})\s*[-–]\s*((?:19|20)\d{2})\b')
+
+# ---------------- LIST SPLITTING ----------------
+SKILL_LIST_SPLIT_RE = re.compile(r'[,\n•\-*]+')
+CRITERIA_SKILL_SPLIT_RE = re.compile(r',|;|\n')
+
+
+@lru_cache(maxsize=64)
+def _compile_all(patterns: Tuple[str, ...], flags: int) -> Tuple[re.Pattern, ...]:
+    return tuple(re.compile(pattern, flags) for pattern in patterns)
+
+
+def compile_all(patterns: Iterable[str], flags: int = 0) -> Tuple[re.Pattern, ...]:
+    """Compile a configurable pattern list once per distinct (patterns, flags)."""
+    return _compile_all(tuple(patterns), flags)
@@ -0,0 +1,138 @@
+"""
+Per-file progress of a batch as server-sent events.
+
+jobs.save_uploads() numbers a batch's rows as they finish (event_seq)
+while holding the batch row's lock, so rows become visible in number order
+whichever thread or process finished them, and a stream that remembers
+the last number it sent misses nothing. Each poll sends, per finished row:
+
+    parsed  {"id", "filename", "parse_ms", "cached"}
+    scored  {"id", "filename", "score_ms", "job_match_score", "overall_score", "html"}
+    failed  {"id", "filename", "parse_ms", "error"}
+
+where `html` is the row's ranked_results table row, then a `progress`
+event (jobs.batch_progress()), and `done` once the batch has finished. The
+row's number is the SSE id of its last event, so a reconnecting
+EventSource resumes where it left off (Last-Event-ID).
+
+Under ASGI, astream() keeps the connection open and polls. A sync worker
+would be held for as long, so WSGI servers answer with one snapshot()
+instead, and the browser's EventSource reconnects after `retry:`,
+polling without pinning a worker.
+"""
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from . import jobs
+from .models import CVBatch, CVUpload, CVUploadQuerySet
+
+# Finished rows read per poll; the rest follow on the next one
+POLL_LIMIT = 200
+HEARTBEAT_SECONDS = 15
+
+ROW_FIELDS = (*CVUploadQuerySet.LISTING_FIELDS, "error", "event_seq", "parse_ms", "score_ms")
+
+
+def poll_interval() -> float:
+    return max(0.05, float(getattr(settings, "CV_PROGRESS_POLL_INTERVAL", 0.5)))
+
+
+def stream_timeout() -> float:
+    return float(getattr(settings, "CV_PROGRESS_STREAM_TIMEOUT", 300))
+
+
+def format_event(event: str, data: Dict, event_id: Optional[int] = None) -> str:
+    """One text/event-stream message."""
+    lines = [f"event: {event}", f"data: {json.dumps(data)}"]
+    if event_id is not None:
+        lines.insert(0, f"id: {event_id}")
+    return "\n".join(lines) + "\n\n"
+
+
+def row_events(cv: CVUpload) -> List[str]:
+    """The parsed and scored/failed events of a finished row."""
+    parsed = {"id": cv.pk, "filename": cv.filename, "parse_ms": cv.parse_ms, "cached": cv.parse_ms is None}
+    if cv.status == CVUpload.STATUS_FAILED:
+        return [format_event("failed", {**parsed, "error": cv.error}, cv.event_seq)]
+    return [
+        format_event("parsed", parsed),
+        format_event("scored", {
+            "id": cv.pk,
+            "filename": cv.filename,
+            "score_ms": cv.score_ms,
+            "job_match_score": cv.job_match_score,
+            "overall_score": cv.overall_score,
+            "html": render_to_string("analyzer/ranked_result_row.html", {"cv": cv}),
+        }, cv.event_seq),
+    ]
+
+
+def poll(batch_id, after: int) -> Tuple[List[str], int, bool]:
+    """
+    Events for the batch's rows finished after event number `after`.
+    Returns the messages, the last event number sent and whether the
+    stream is over (batch finished or deleted).
+    """
+    # The batch is read first: once it is done, every row it finished
+    # with was committed before it
+    batch = CVBatch.objects.filter(pk=batch_id).first()
+    if batch is None:
+        return [format_event("done", {"deleted": True})], after, True
+
+    rows = list(
+        CVUpload.objects.filter(batch_id=batch_id, event_seq__gt=after)
+        .only(*ROW_FIELDS)
+        .order_by("event_seq")[:POLL_LIMIT]
+    )
+    messages = []
+    for cv in rows:
+        messages.extend(row_events(cv))
+        after = cv.event_seq
+
+    finished = batch.is_finished and len(rows) < POLL_LIMIT
+    if rows or finished:
+        progress = jobs.batch_progress(batch)
+        messages.append(format_event("progress", progress))
+        if finished:
+            messages.append(format_event("done", progress))
+    return messages, after, finished
+
+
+def retry_field() -> str:
+    # How long a disconnected EventSource waits before reconnecting
+    return f"retry: {int(poll_interval() * 2000)}\n\n"
+
+
+def snapshot(batch_id, after: int = 0) -> str:
+    """One poll() as a complete event stream, for WSGI servers."""
+    messages, _, _ = poll(batch_id, after)
+    return retry_field() + "".join(messages)
+
+
+async def astream(batch_id, after: int = 0) -> AsyncIterator[str]:
+    """
+    Event stream for StreamingHttpResponse under ASGI, for up to
+    CV_PROGRESS_STREAM_TIMEOUT seconds: waiting between polls holds no
+    thread.
+    """
+    deadline = time.monotonic() + stream_timeout()
+    beat = time.monotonic()
+    yield retry_field()
+    while True:
+        messages, after, finished = await sync_to_async(poll)(batch_id, after)
+        if messages:
+            yield "".join(messages)
+            beat = time.monotonic()
+        elif time.monotonic() - beat >= HEARTBEAT_SECONDS:
+            # Comments keep proxies from timing out and reveal closed clients
+            yield ": keep-alive\n\n"
+            beat = time.monotonic()
+        if finished or time.monotonic() >= deadline:
+            return
+        await asyncio.sleep(poll_interval())
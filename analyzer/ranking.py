@@ -0,0 +1,176 @@
+"""
+Candidate ranking in the database: hard filters and the match score become
+SQL, and results come back one page at a time with keyset ("cursor")
+pagination, so ranking cost does not grow with the CVs a user has stored.
+"""
+import base64
+import binascii
+import json
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.db.models import Case, Count, FloatField, Min, Q, QuerySet, Value, When
+from django.db.models.fields.json import KT
+from django.db.models.functions import Coalesce, Round
+from django.db.models.lookups import Contains
+
+from . import skill_index
+from .models import stored_rank_score
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that was not produced by rank_candidates()."""
+
+
+class RankedPage(NamedTuple):
+    cvs: List  # rows with `rank_score` and `rank` set
+    next_cursor: Optional[str]
+
+
+def page_size() -> int:
+    return max(1, int(getattr(settings, "CV_RESULTS_PAGE_SIZE", 50)))
+
+
+# --------------------------------------------------
+# SQL EXPRESSIONS
+# --------------------------------------------------
+
+def _json_list_has(path: str, value: str):
+    # Matches '"value"' inside the JSON text of a stored list, which works
+    # the same on SQLite and Postgres (JSON containment does not on SQLite).
+    # Postgres returns non-ASCII characters as is; SQLite returns the text
+    # as stored, which JSONField writes \u-escaped.
+    condition = Contains(KT(path), json.dumps(value, ensure_ascii=False))
+    escaped = json.dumps(value)
+    if escaped != condition.rhs:
+        condition = condition | Contains(KT(path), escaped)
+    return condition
+
+
+def _hit(condition) -> Case:
+    return Case(When(condition, then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+
+
+def _sum(expressions: List):
+    total = expressions[0]
+    for expression in expressions[1:]:
+        total = total + expression
+    return total
+
+
+def match_score_expression(criteria: Dict):
+    """
+    features.match_score() as a database expression over the stored
+    feature record and columns.
+    """
+    required_experience = criteria.get("required_experience")
+    required_education = (criteria.get("required_education") or "").lower()
+    required_skills = criteria.get("required_skills") or []
+
+    terms = []
+    if required_experience is not None:
+        terms.append(_hit(Q(experience_years__gte=required_experience)))
+    if required_education:
+        terms.append(_hit(_json_list_has("features__education_terms", required_education)))
+    if required_skills:
+        skill_hits = [_hit(_json_list_has("features__skills", skill)) for skill in sorted(set(required_skills))]
+        terms.append(_sum(skill_hits) / Value(float(len(required_skills))))
+
+    if not terms:
+        return Value(0.0, output_field=FloatField())
+    return Round(_sum(terms) / Value(float(len(terms))) * Value(100.0), 2, output_field=FloatField())
+
+
+def apply_filters(
+    queryset: QuerySet,
+    min_years: Optional[int] = None,
+    min_degree_level: Optional[int] = None,
+    must_have_skills: Iterable[str] = ()
+) -> QuerySet:
+    """Hard filters on the stored features; CVs failing any are dropped."""
+    if min_years is not None:
+        queryset = queryset.filter(experience_years__gte=min_years)
+    if min_degree_level:
+        queryset = queryset.filter(degree_level__gte=min_degree_level)
+    if must_have_skills:
+        # Posting-list lookup on the skill index
+        queryset = queryset.filter(id__in=skill_index.matching_upload_ids(must_have_skills))
+    return queryset
+
+
+def ranked(queryset: QuerySet, criteria: Optional[Dict] = None, **filters) -> QuerySet:
+    """
+    Processed CVs from `queryset` that pass `filters` (see apply_filters),
+    best first, with their score as `rank_score`; a missing score counts
+    as 0 in the order and in cursors. Without `criteria` the stored
+    job_match_score is used (models.stored_rank_score()), which the
+    ranked-result indexes can return in order; with `criteria` the score is
+    computed in SQL.
+    """
+    if criteria is None:
+        score = stored_rank_score()
+    else:
+        score = Coalesce(match_score_expression(criteria), Value(0.0), output_field=FloatField())
+    queryset = apply_filters(queryset.filter(processed=True), **filters)
+    return queryset.annotate(rank_score=score).order_by("-rank_score", "id")
+
+
+def summarize(ranked_queryset: QuerySet) -> Dict:
+    """Count and lowest score of a ranked() queryset in one aggregate query."""
+    stats = ranked_queryset.order_by().aggregate(total=Count("id"), lowest_score=Min("rank_score"))
+    stats["lowest_score"] = stats["lowest_score"] or 0
+    return stats
+
+
+# --------------------------------------------------
+# CURSOR PAGINATION
+# --------------------------------------------------
+
+def encode_cursor(score: float, pk: int, rank: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([score, pk, rank]).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        score, pk, rank = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), int(pk), int(rank)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+def _value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def rank_candidates(
+    queryset: QuerySet,
+    criteria: Optional[Dict] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    **filters
+) -> RankedPage:
+    """
+    One page of ranked() results after `cursor`, at most `limit` rows
+    (settings.CV_RESULTS_PAGE_SIZE by default). Works on model and
+    values() querysets alike.
+    """
+    limit = limit or page_size()
+    queryset = ranked(queryset, criteria, **filters)
+    rank = 0
+    if cursor:
+        score, pk, rank = decode_cursor(cursor)
+        queryset = queryset.filter(Q(rank_score__lt=score) | Q(rank_score=score, id__gt=pk))
+
+    rows = list(queryset[:limit + 1])
+    cvs = rows[:limit]
+    for offset, row in enumerate(cvs, start=rank + 1):
+        if isinstance(row, dict):
+            row["rank"] = offset
+        else:
+            row.rank = offset
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = cvs[-1]
+        next_cursor = encode_cursor(_value(last, "rank_score"), _value(last, "id"), rank + len(cvs))
+    return RankedPage(cvs, next_cursor)
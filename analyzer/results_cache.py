@@ -0,0 +1,59 @@
+"""
+Rendered results of finished batches, cached per batch and results version.
+
+A finished batch's ranking only changes when it is re-matched or one of its
+CVs is deleted; both bump CVBatch.results_version (invalidate()), which is
+part of every cache key and ETag together with SCORING_VERSION. Stale
+entries are never read again and expire or get culled by the backend.
+"""
+import hashlib
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+
+from .cv_scorer import SCORING_VERSION
+from .models import CVBatch
+
+
+def _cache():
+    return caches[getattr(settings, "CV_RESULTS_CACHE_ALIAS", "cv_results")]
+
+
+def is_cacheable(batch: CVBatch) -> bool:
+    return batch.is_finished
+
+
+def _stamp(batch: CVBatch, params) -> str:
+    query = "&".join(f"{key}={value}" for key, value in sorted(params.items()))
+    digest = hashlib.sha256(query.encode()).hexdigest()[:16]
+    return f"{SCORING_VERSION}:{batch.pk}:{batch.results_version}:{digest}"
+
+
+def cache_key(batch: CVBatch, params) -> str:
+    """Key for one rendering (filters + page, from `params`) of a batch."""
+    return f"cvresults:{_stamp(batch, params)}"
+
+
+def etag(batch: CVBatch, params, request) -> str:
+    """
+    ETag of the results page. Besides the cache stamp it covers the user and
+    their CSRF cookie, since the page embeds forms with a CSRF token.
+    """
+    csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+    seed = f"{_stamp(batch, params)}:{request.user.pk}:{csrf}"
+    return f'"{hashlib.sha256(seed.encode()).hexdigest()[:32]}"'
+
+
+def get_fragment(batch: CVBatch, params) -> Optional[Dict]:
+    return _cache().get(cache_key(batch, params))
+
+
+def store_fragment(batch: CVBatch, params, fragment: Dict) -> None:
+    _cache().set(cache_key(batch, params), fragment, getattr(settings, "CV_RESULTS_CACHE_TIMEOUT", 3600))
+
+
+def invalidate(batch_id) -> None:
+    """Retire every cached rendering and ETag of a batch."""
+    CVBatch.objects.filter(pk=batch_id).update(results_version=F("results_version") + 1)
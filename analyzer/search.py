@@ -0,0 +1,216 @@
+"""
+Full-text search over extracted CV text.
+
+PostgreSQL keeps a weighted tsvector in CVContent.search_vector (GIN
+indexed); SQLite keeps a contentless FTS5 table, analyzer_cvcontent_fts,
+keyed by upload id, so the text is not stored a second time (migrations
+0011 and 0018). Both are written from Python by index_documents()
+whenever CVContent is saved, so compressed content is indexed too.
+Removing an entry from a contentless table takes the text it was indexed
+with: unindex() is called with the stored CVContent before it is
+replaced, and the CVContent pre_delete handler in analyzer.signals does
+the same on deletes. Snippets are cut in Python from CVContent.texts().
+Searches join analyzer_cvupload, so deleted CVs never show up even where
+an index entry outlives them. Other databases, or SQLite builds without
+FTS5, fall back to a substring scan.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.utils.html import escape
+
+FTS_TABLE = "analyzer_cvcontent_fts"
+PG_CONFIG = "english"
+
+# Highlight markers put around matches by the database; swapped for <mark>
+# after HTML-escaping the snippet
+_START, _STOP = "\x02", "\x03"
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Skills matter most, then experience, then anything else in the CV
+PG_DOCUMENT_SQL = (
+    f"setweight(to_tsvector('{PG_CONFIG}', %s), 'A') || "
+    f"setweight(to_tsvector('{PG_CONFIG}', %s), 'B') || "
+    f"to_tsvector('{PG_CONFIG}', %s)"
+)
+FTS_COLUMN_WEIGHTS = (10.0, 3.0, 1.0)  # skills, experience, raw_text
+SNIPPET_WORDS = 16
+
+
+def _resolve(db) -> Optional[str]:
+    if db.vendor == "postgresql":
+        return db.vendor
+    if db.vendor == "sqlite" and FTS_TABLE in db.introspection.table_names():
+        return db.vendor
+    return None
+
+
+def backend(using: str = DEFAULT_DB_ALIAS) -> Optional[str]:
+    """"postgresql" or "sqlite" when `using` has a full-text index, else None."""
+    # Resolved once per database connection, not per process: a new
+    # connection may be to another database (tests swap in the test one)
+    db = connections[using]
+    db.ensure_connection()
+    cached = getattr(db, "_search_backend", None)
+    if cached is None or cached[0] is not db.connection:
+        cached = db._search_backend = (db.connection, _resolve(db))
+    return cached[1]
+
+
+def index_documents(documents: Iterable[Tuple[int, Dict[str, str]]]) -> None:
+    """
+    (Re)index (upload id, extracted texts) pairs. On SQLite, uploads that
+    were indexed before must have been unindex()ed first.
+    """
+    rows = [
+        (upload_id, texts.get("skills") or "", texts.get("experience") or "", texts.get("raw_text") or "")
+        for upload_id, texts in documents
+    ]
+    mode = backend()
+    if not rows or mode is None:
+        return
+    with connection.cursor() as cursor:
+        if mode == "postgresql":
+            cursor.executemany(
+                f"UPDATE analyzer_cvcontent SET search_vector = {PG_DOCUMENT_SQL} WHERE upload_id = %s",
+                [(skills, experience, raw_text, upload_id) for upload_id, skills, experience, raw_text in rows],
+            )
+        else:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, skills, experience, raw_text) VALUES (%s, %s, %s, %s)", rows
+            )
+
+
+def unindex_contents(contents: Iterable) -> None:
+    """
+    Remove the SQLite index entries of stored CVContent rows, which must
+    still hold the text they were indexed with. PostgreSQL needs nothing:
+    its document lives in the row itself.
+    """
+    if backend() != "sqlite":
+        return
+    rows = []
+    for content in contents:
+        texts = content.texts(["skills", "experience", "raw_text"])
+        rows.append((content.upload_id, texts["skills"], texts["experience"], texts["raw_text"]))
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, skills, experience, raw_text) "
+            "VALUES ('delete', %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def unindex(upload_ids: Iterable[int]) -> None:
+    """Remove the index entries of uploads whose stored text is about to be replaced."""
+    from .models import CVContent
+
+    if backend() != "sqlite":
+        return
+    unindex_contents(
+        CVContent.objects.only("upload_id", "skills", "experience", "raw_text", "packed")
+        .filter(upload_id__in=list(upload_ids))
+    )
+
+
+def fts_query(text: str) -> str:
+    """User input as an FTS5 query: every word must match (stemmed)."""
+    return " ".join(f'"{word}"' for word in _WORD_RE.findall(text))
+
+
+def highlight(snippet: Optional[str]) -> str:
+    """HTML-escaped snippet with matches wrapped in <mark>."""
+    return str(escape(snippet or "")).replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+def make_snippet(text: str, query: str, words: int = SNIPPET_WORDS) -> str:
+    """
+    Up to `words` words of `text` from around the first word matching the
+    query, with matches between the highlight markers. A query word matches
+    the words it is a prefix of, a rough stand-in for stemming.
+    """
+    prefixes = tuple(word.lower() for word in _WORD_RE.findall(query))
+    tokens = (text or "").split()
+
+    def matches(token):
+        return bool(prefixes) and any(word.lower().startswith(prefixes) for word in _WORD_RE.findall(token))
+
+    first = next((index for index, token in enumerate(tokens) if matches(token)), 0)
+    start = max(0, min(first - words // 4, len(tokens) - words))
+    window = [f"{_START}{token}{_STOP}" if matches(token) else token for token in tokens[start:start + words]]
+    return ("… " if start else "") + " ".join(window) + (" …" if start + words < len(tokens) else "")
+
+
+def _snippets(upload_ids: List[int], query: str) -> Dict[int, str]:
+    # Cut from the stored text in Python: the FTS5 table keeps no text, and
+    # this works for compressed content
+    from .models import CVContent
+
+    contents = CVContent.objects.only("upload_id", "raw_text", "packed").in_bulk(upload_ids)
+    return {
+        upload_id: make_snippet(content.texts(["raw_text"])["raw_text"], query)
+        for upload_id, content in contents.items()
+    }
+
+
+def search(query: str, user_id: Optional[int] = None, limit: int = 20) -> List[Dict]:
+    """
+    Best-matching CVs for `query`, optionally only `user_id`'s, as dicts of
+    upload id, rank (higher is better) and highlighted snippet.
+    """
+    if not _WORD_RE.search(query or ""):
+        return []
+    mode = backend()
+    if mode == "postgresql":
+        sql = f"""
+            SELECT c.upload_id, ts_rank_cd(c.search_vector, q) AS rank, NULL
+            FROM analyzer_cvcontent c
+            JOIN analyzer_cvupload u ON u.id = c.upload_id,
+                 websearch_to_tsquery('{PG_CONFIG}', %s) q
+            WHERE c.search_vector @@ q {"AND u.user_id = %s" if user_id is not None else ""}
+            ORDER BY rank DESC, c.upload_id
+            LIMIT %s
+        """
+        params = [query]
+    elif mode == "sqlite":
+        weights = ", ".join(str(w) for w in FTS_COLUMN_WEIGHTS)
+        sql = f"""
+            SELECT {FTS_TABLE}.rowid, -bm25({FTS_TABLE}, {weights}) AS rank, NULL
+            FROM {FTS_TABLE}
+            JOIN analyzer_cvupload u ON u.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH %s {"AND u.user_id = %s" if user_id is not None else ""}
+            ORDER BY rank DESC, {FTS_TABLE}.rowid
+            LIMIT %s
+        """
+        params = [fts_query(query)]
+    else:
+        return _scan(query, user_id, limit)
+
+    if user_id is not None:
+        params.append(user_id)
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    snippets = _snippets([upload_id for upload_id, _, _ in rows], query)
+    rows = [(upload_id, rank, snippets.get(upload_id)) for upload_id, rank, _ in rows]
+    return [
+        {"upload_id": upload_id, "rank": round(rank, 4), "snippet": highlight(snippet)}
+        for upload_id, rank, snippet in rows
+    ]
+
+
+def _scan(query: str, user_id: Optional[int], limit: int) -> List[Dict]:
+    # No full-text index: substring match on uncompressed text, unranked
+    from .models import CVContent
+
+    contents = CVContent.objects.filter(raw_text__icontains=query.strip())
+    if user_id is not None:
+        contents = contents.filter(upload__user_id=user_id)
+    return [
+        {"upload_id": upload_id, "rank": 0.0, "snippet": ""}
+        for upload_id in contents.order_by("upload_id").values_list("upload_id", flat=True)[:limit]
+    ]
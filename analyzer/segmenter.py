@@ -0,0 +1,149 @@
+import re
+from typing import Dict, FrozenSet, Iterator, List, Tuple
+
+
+def _alternation(terms) -> str:
+    """
+    A regex matching any of `terms`, factored into a prefix tree so the
+    engine tests one branch per character instead of every term. Optional
+    groups are greedy, so the longest term at a position wins.
+    """
+    tree: Dict[str, dict] = {}
+    for term in terms:
+        node = tree
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(tree)
+
+
+class SectionSegmenter:
+    """
+    Split CV text into sections in a single pass.
+
+    Section keywords and stop words are compiled once into one regex
+    alternation (see _alternation()), longest term first. Each term maps to the sections it
+    heads and the sections it stops. The lower-cased document is searched
+    for terms front to back while its lines are consumed, and each match
+    labels the line it falls in. The per-section capture rules run over
+    those labels and the search stops as soon as every section is
+    complete, so the rest of the document is never scanned. Each section
+    behaves as if scanned on its own: a header line (re)starts capture, a
+    stop word ends it, and capture stops after `max_lines` lines. Adding a
+    section adds terms to the regex, not another pass over the document.
+    """
+
+    def __init__(
+        self,
+        keywords: Dict[str, List[str]],
+        stop_sections: Dict[str, List[str]],
+        max_lines: Dict[str, int]
+    ):
+        self.sections = list(keywords)
+        self.max_lines = dict(max_lines)
+
+        terms = set()
+        for words in keywords.values():
+            terms.update(words)
+        for words in stop_sections.values():
+            terms.update(words)
+
+        # A term implies every keyword / stop word it contains.
+        labels: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {}
+        for term in terms:
+            headers = frozenset(
+                name for name, words in keywords.items()
+                if any(w in term for w in words)
+            )
+            stops = frozenset(
+                name for name, words in stop_sections.items()
+                if any(w in term for w in words)
+            )
+            labels[term] = (headers, stops)
+
+        # Drop terms made redundant by a shorter term with the same labels
+        # ("work experience" adds nothing once "experience" is searched).
+        self._labels = {
+            term: labels[term] for term in terms
+            if term and not any(
+                other != term and other in term and labels[other] == labels[term]
+                for other in terms
+            )
+        }
+        self._terms_re = re.compile(_alternation(self._labels)) if self._labels else None
+
+    def _matches(self, lower: str) -> Iterator[Tuple[int, str]]:
+        # (position, term) of every term occurrence, searched lazily. The
+        # longest term at a position wins (shorter ones there are contained
+        # in it); searching on from the next character also finds terms that
+        # overlap a match without being contained in it.
+        if self._terms_re is None:
+            return
+        search = self._terms_re.search
+        match = search(lower)
+        while match is not None:
+            yield match.start(), match.group()
+            match = search(lower, match.start() + 1)
+
+    def headers_in(self, text: str) -> FrozenSet[str]:
+        """Sections whose header keyword appears anywhere in `text`."""
+        found = frozenset()
+        for _, term in self._matches(text.lower()):
+            found |= self._labels[term][0]
+        return found
+
+    def segment(self, text: str) -> Dict[str, str]:
+        if not text or text.startswith("Error"):
+            return {name: f"No {name} section found" for name in self.sections}
+
+        captured = {name: [] for name in self.sections}
+        capturing = set()
+        done = set()
+
+        lower = text.lower()
+        matches = self._matches(lower)
+        pending = next(matches, None)
+        line_end = -1
+        # lower() keeps the line breaks, so lower lines give the offsets
+        for line, lower_line in zip(text.split("\n"), lower.split("\n")):
+            line_end += len(lower_line) + 1
+            headers = stops = frozenset()
+            while pending is not None and pending[0] < line_end:
+                term_headers, term_stops = self._labels[pending[1]]
+                headers |= term_headers
+                stops |= term_stops
+                pending = next(matches, None)
+
+            line = line.strip()
+            if not line:
+                continue
+
+            for name in list(capturing):
+                if name in headers:
+                    continue
+                if name in stops:
+                    capturing.discard(name)
+                    done.add(name)
+                    continue
+                captured[name].append(line)
+                if len(captured[name]) >= self.max_lines[name]:
+                    capturing.discard(name)
+                    done.add(name)
+
+            if headers:
+                capturing.update(headers - done)
+            if len(done) == len(self.sections):
+                break
+
+        return {
+            name: "\n".join(section_lines) or f"No {name} section found"
+            for name, section_lines in captured.items()
+        }
@@ -1,5 +1,18 @@
+from itertools import chain
+
 from rest_framework import serializers
-from .models import CVUpload
+
+from . import archives, jobs
+from .features import EDUCATION_LEVELS
+from .models import CONTENT_TEXT_FIELDS, CVBatch, CVUpload
+
+
+def validate_cv_file(value):
+    reason = archives.check_cv_file(value.name, value.size)
+    if reason:
+        raise serializers.ValidationError(f"{value.name}: {reason}")
+    return value
+
 
 class CVUploadSerializer(serializers.ModelSerializer):
     class Meta:
@@ -40,16 +53,173 @@ class CVUploadSerializer(serializers.ModelSerializer):
         ]
 
     def validate_file(self, value):
-        allowed_extensions = ['.pdf', '.doc', '.docx', '.txt']
-        max_size = 5 * 1024 * 1024  # 5 MB
+        return validate_cv_file(value)
+
+
+# --------------------------------------------------
+# BATCH API
+# --------------------------------------------------
 
-        ext = value.name.lower().rsplit('.', 1)[-1]
-        ext = f'.{ext}'
+class SkillListField(serializers.Field):
+    """A JSON list or a comma-separated string of skills, lowercased."""
 
-        if ext not in allowed_extensions:
-            raise serializers.ValidationError(f"Unsupported file type: {ext}")
+    default_error_messages = {"invalid": "Give a list or a comma-separated string of skills."}
 
-        if value.size > max_size:
-            raise serializers.ValidationError("File exceeds 5MB size limit")
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = data.split(",")
+        if not isinstance(data, (list, tuple)):
+            self.fail("invalid")
+        return [str(skill).strip().lower() for skill in data if str(skill).strip()]
 
+    def to_representation(self, value):
+        return list(value or [])
+
+
+class BatchCreateSerializer(serializers.Serializer):
+    """
+    A batch submission: CV files (`cv_files`, repeatable) and/or a zip/tar
+    `archive` of them, plus the job criteria to match against. Archive
+    members are only read, and checked, by jobs.submit_batch.
+    """
+
+    job_name = serializers.CharField(max_length=100)
+    required_experience = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+    required_education = serializers.CharField(required=False, allow_blank=True)
+    required_skills = SkillListField(required=False)
+    cv_files = serializers.ListField(child=serializers.FileField(), required=False)
+    archive = serializers.FileField(required=False)
+    store = serializers.BooleanField(default=True, help_text="False to analyze without keeping the files")
+
+    def validate_required_education(self, value):
+        value = (value or "").strip().lower()
+        if value and value not in EDUCATION_LEVELS:
+            raise serializers.ValidationError(f"Choose one of: {', '.join(EDUCATION_LEVELS)}.")
         return value
+
+    def validate_cv_files(self, value):
+        return [validate_cv_file(file) for file in value]
+
+    def validate_archive(self, value):
+        if not archives.is_archive(value.name):
+            raise serializers.ValidationError(
+                f"{value.name}: use one of {', '.join(archives.ARCHIVE_EXTENSIONS)}"
+            )
+        return archives.ArchiveReader(value)
+
+    def validate(self, attrs):
+        if not attrs.get("cv_files") and not attrs.get("archive"):
+            raise serializers.ValidationError("Upload at least one CV in cv_files or an archive.")
+        return attrs
+
+    def files(self):
+        """The loose CVs, then the archive's members as they are read."""
+        return chain(self.validated_data.get("cv_files", []), self.validated_data.get("archive") or [])
+
+    def rejected(self):
+        """Archive members skipped so far, with the reason."""
+        archive = self.validated_data.get("archive")
+        return archive.rejected if archive else []
+
+    def criteria(self):
+        """Cleaned criteria in the shape jobs.enqueue_batch expects."""
+        return {
+            "required_experience": self.validated_data.get("required_experience"),
+            "required_education": self.validated_data.get("required_education", ""),
+            "required_skills": self.validated_data.get("required_skills", []),
+        }
+
+
+class CVBatchSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CVBatch
+        fields = [
+            'id',
+            'status',
+            'job_name',
+            'created_at',
+            'finished_at',
+            'total_files',
+            'required_experience',
+            'required_education',
+            'required_skills',
+            'progress'
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, batch):
+        progress = jobs.batch_progress(batch)
+        return {name: progress[name] for name in ("processed", "failed", "pending", "percent")}
+
+
+class ContentTextField(serializers.Field):
+    """
+    Extracted text of a CV, read from context["texts"] ({upload id: texts})
+    so a page of results loads its CVContent rows in one query.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(source="*", read_only=True, **kwargs)
+
+    def to_representation(self, cv):
+        return self.context["texts"].get(cv.pk, {}).get(self.field_name, "")
+
+
+class CVResultSerializer(serializers.ModelSerializer):
+    """
+    A ranked CV of a batch. Pass `fields` to return only those fields;
+    DEFAULT_FIELDS leaves out the extracted text and suggestions.
+    """
+
+    rank = serializers.IntegerField(read_only=True)
+    rank_score = serializers.FloatField(read_only=True)
+    filename = serializers.CharField(read_only=True)
+    raw_text = ContentTextField()
+    contact_info = ContentTextField()
+    experience = ContentTextField()
+    education = ContentTextField()
+    skills = ContentTextField()
+
+    class Meta:
+        model = CVUpload
+        fields = [
+            'id',
+            'rank',
+            'rank_score',
+            'filename',
+            'file_stored',
+            'uploaded_at',
+            'status',
+            'target_job_role',
+            'job_match_score',
+            'overall_score',
+            'contact_score',
+            'experience_score',
+            'education_score',
+            'skills_score',
+            'format_score',
+            'experience_years',
+            'degree_level',
+            'suggestions',
+            *CONTENT_TEXT_FIELDS
+        ]
+        read_only_fields = fields
+
+    DEFAULT_FIELDS = [name for name in Meta.fields if name not in ("suggestions", *CONTENT_TEXT_FIELDS)]
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def columns(cls, fields):
+        """CVUpload columns the given fields read."""
+        model_fields = {field.name for field in CVUpload._meta.concrete_fields}
+        columns = {"id", *(name for name in fields if name in model_fields)}
+        if "filename" in fields:
+            columns.add("file")
+        return sorted(columns)
@@ -1,9 +1,12 @@
-# analyzer/apps.py
-from django.apps import AppConfig
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
 
-class AnalyzerConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'analyzer'
+from . import search
+from .models import CVContent
 
-    def ready(self):
-        import analyzer.signals  # ensures signals are registered
+
+@receiver(pre_delete, sender=CVContent)
+def unindex_deleted_content(sender, instance, **kwargs):
+    # The contentless FTS5 table can only drop an entry given its text,
+    # which is gone once the row is
+    search.unindex_contents([instance])
@@ -0,0 +1,160 @@
+"""
+Inverted skill index: a normalized Skill dictionary and CVSkill postings
+(skill -> CVs), written when a CV's text is saved. "CVs with skills X, Y
+and/or Z" becomes a lookup on the (skill, upload) posting index instead of
+substring matching against every CV's skills text.
+"""
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count, QuerySet, Sum
+
+from utiliy.keyword import KEYWORDS
+
+from .models import CVSkill, CVUpload, Skill
+
+MATCH_ALL = "all"
+MATCH_ANY = "any"
+
+# Listed skills longer than this are sentences, not skills
+MAX_SKILL_WORDS = 4
+
+_SPACE_RE = re.compile(r"\s+")
+_ITEM_SPLIT_RE = re.compile(r"[,;|\n•·]+")
+_EDGE_RE = re.compile(r"^[\s\-*–—:.()]+|[\s\-*–—:.()]+$")
+
+
+def normalize_skill(name: str) -> str:
+    """Lowercase, single-spaced, without bullets or surrounding punctuation."""
+    return _EDGE_RE.sub("", _SPACE_RE.sub(" ", (name or "").lower())).strip()
+
+
+@lru_cache(maxsize=1)
+def vocabulary() -> Dict[str, int]:
+    """Normalized KEYWORDS skills and how many roles list each."""
+    return dict(Counter(
+        normalize_skill(keyword) for keywords in KEYWORDS.values() for keyword in set(keywords)
+    ))
+
+
+@lru_cache(maxsize=1)
+def _vocabulary_re() -> re.Pattern:
+    terms = sorted((term for term in vocabulary() if term), key=len, reverse=True)
+    return re.compile(r"(?<![\w+#])(" + "|".join(re.escape(term) for term in terms) + r")(?![\w+#])")
+
+
+def skill_weight(role_count: int) -> float:
+    """Inverse role frequency: a skill few roles use says more about a CV."""
+    return round(1 + math.log(len(KEYWORDS) / max(role_count, 1)), 4)
+
+
+def extract_skills(skills_text: str) -> Set[str]:
+    """
+    Normalized skills of a CV: every short item listed in its skills
+    section ("Technical: a, b" lists a and b), plus every KEYWORDS skill
+    mentioned there as a whole word.
+    """
+    text = (skills_text or "").lower()
+    found = set()
+    for item in _ITEM_SPLIT_RE.split(text):
+        item = normalize_skill(item.split(":")[-1])
+        if item and len(item.split()) <= MAX_SKILL_WORDS and len(item) <= 100:
+            found.add(item)
+    found.update(_vocabulary_re().findall(text))
+    return found
+
+
+# --------------------------------------------------
+# INDEXING
+# --------------------------------------------------
+
+def ensure_skills(names: Iterable[str]) -> Dict[str, int]:
+    """Skill ids by name, adding missing names to the dictionary."""
+    names = set(names)
+    ids = dict(Skill.objects.filter(name__in=names).values_list("name", "id"))
+    missing = names - ids.keys()
+    if missing:
+        counts = vocabulary()
+        Skill.objects.bulk_create(
+            [
+                Skill(name=name, role_count=counts.get(name, 0), weight=skill_weight(counts.get(name, 0)))
+                for name in missing
+            ],
+            ignore_conflicts=True,
+        )
+        ids.update(Skill.objects.filter(name__in=missing).values_list("name", "id"))
+    return ids
+
+
+def index_skills(documents: Iterable[Tuple[int, str]], batch_size: int = 500) -> int:
+    """
+    Replace the postings of (upload id, skills text) pairs. Returns the
+    number of postings written.
+    """
+    skills_by_upload = {upload_id: extract_skills(skills_text) for upload_id, skills_text in documents}
+    if not skills_by_upload:
+        return 0
+    with transaction.atomic():
+        ids = ensure_skills(name for names in skills_by_upload.values() for name in names)
+        CVSkill.objects.filter(upload_id__in=skills_by_upload).delete()
+        postings = CVSkill.objects.bulk_create(
+            [
+                CVSkill(skill_id=ids[name], upload_id=upload_id)
+                for upload_id, names in skills_by_upload.items() for name in names
+            ],
+            batch_size=batch_size,
+        )
+    return len(postings)
+
+
+# --------------------------------------------------
+# QUERIES
+# --------------------------------------------------
+
+def matching_upload_ids(skills: Iterable[str], match: str = MATCH_ALL) -> QuerySet:
+    """
+    Upload ids (as a values queryset, usable as a subquery) whose postings
+    contain all / any of `skills`.
+    """
+    names = {normalize_skill(skill) for skill in skills} - {""}
+    postings = (
+        CVSkill.objects.filter(skill__name__in=names)
+        .values("upload_id")
+        .annotate(hits=Count("skill_id"))
+    )
+    if match == MATCH_ALL:
+        postings = postings.filter(hits=len(names))
+    return postings.values("upload_id")
+
+
+def find_uploads(
+    skills: Iterable[str],
+    match: str = MATCH_ALL,
+    weighted: bool = False,
+    queryset: QuerySet = None
+) -> QuerySet:
+    """
+    CVs from `queryset` (all CVs by default) having all / any of `skills`,
+    annotated with `skill_hits` and, if `weighted`, `skill_score` (the sum
+    of the matched skills' weights), best first.
+    """
+    names = {normalize_skill(skill) for skill in skills} - {""}
+    queryset = CVUpload.objects.all() if queryset is None else queryset
+    if not names:
+        return queryset.none()
+
+    # The join is restricted to the requested skills, so the aggregates
+    # below only count matched postings
+    queryset = queryset.filter(skill_postings__skill__name__in=names).annotate(
+        skill_hits=Count("skill_postings")
+    )
+    if match == MATCH_ALL:
+        queryset = queryset.filter(skill_hits=len(names))
+    if weighted:
+        queryset = queryset.annotate(skill_score=Sum("skill_postings__skill__weight"))
+        return queryset.order_by("-skill_score", "-skill_hits", "id")
+    return queryset.order_by("-skill_hits", "id")
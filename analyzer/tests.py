@@ -1,3 +1,1458 @@
-from django.test import TestCase
+import io
+import itertools
+import json
+import os
+import random
+import re
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from datetime import timedelta
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import Q
+from unittest import skipUnless
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from unittest import mock
+
+import numpy as np
+
+from analyzer import archives, async_jobs, jobs, parse_cache, progress, ranking, search, skill_index, views
+from analyzer.benchmark import build_file_corpus, percentile, synthetic_corpus, write_pdf
+from analyzer.models import CVBatch, CVContent, CVUpload, CVUploadQuerySet, Skill
+from analyzer.cv_scorer import SECTION_FEATURES, CVScorer
+from analyzer.features import FEATURES_VERSION, degree_level, experience_years, extract_features, match_score
+from analyzer.parser import PARSER_VERSION, CVParser, _shared_pool
+from analyzer.patterns import CONTACT_PATTERNS, compile_all
+from utiliy.keyword import KEYWORDS
+from utiliy.keyword_matcher import KEYWORD_MATCHER, KeywordAutomaton, normalize_text
+from utiliy.title_index import JOB_TITLE_INDEX, resolve_job_title
+
+
+class ScoreBatchTests(SimpleTestCase):
+    def setUp(self):
+        self.scorer = CVScorer()
+        self.corpus = synthetic_corpus(300, seed=7)
+        # Empty and sparse sections take the early-return paths
+        self.corpus[0]["experience"] = ""
+        self.corpus[1]["education"] = "   "
+        self.corpus[2]["skills"] = "sql"
+        self.corpus.append({})
+
+    def test_matches_score_cv(self):
+        for job_name in ["data analyst", ""]:
+            expected = [self.scorer.score_cv(parsed, job_name) for parsed in self.corpus]
+            self.assertEqual(self.scorer.score_batch(self.corpus, job_name), expected)
+
+    def test_matches_score_cv_at_rounding_boundary(self):
+        # experience 45 and skills 20 weigh in at 18.75 overall
+        parsed = {"raw_text": "x", "experience": "Analyst 2019\nGrew revenue 10%", "skills": "excel, word, r"}
+        expected = self.scorer.score_cv(parsed)
+        self.assertEqual(expected["section_scores"]["experience"], 45)
+        self.assertEqual(expected["section_scores"]["skills"], 20)
+        self.assertEqual(expected["overall_score"], 18.8)
+        self.assertEqual(self.scorer.score_batch([parsed]), [expected])
+
+    def test_overall_scores_match_overall_score(self):
+        # Every reachable combination of section scores
+        reachable = [
+            sorted({min(sum(points for (points, _), hit in zip(features, hits) if hit), 100)
+                    for hits in itertools.product([False, True], repeat=len(features))})
+            for features in (SECTION_FEATURES[section] for section in self.scorer.weights)
+        ]
+        combos = list(itertools.product(*reachable))
+        expected = [self.scorer.overall_score(dict(zip(self.scorer.weights, combo))) for combo in combos]
+        self.assertEqual(self.scorer.overall_scores(np.array(combos, dtype=float)), expected)
+
+    def test_empty_batch(self):
+        self.assertEqual(self.scorer.score_batch([], "data analyst"), [])
+
+
+class BenchmarkCorpusTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_generated_files_parse(self):
+        parser = CVParser()
+        for path, extension in build_file_corpus(self.directory, 6, max_size=6):
+            parsed = parser.parse_cv(path, extension)
+            self.assertIn("@example.com", parsed["contact_info"], path)
+            self.assertNotIn("No skills section found", parsed["skills"], path)
+
+    def test_parses_bytes_and_file_objects_like_paths(self):
+        parser = CVParser()
+        for path, extension in build_file_corpus(self.directory, 3, max_size=6):
+            expected = parser.parse_cv(path, extension)
+            with open(path, "rb") as f:
+                data = f.read()
+                self.assertEqual(parser.parse_cv(f, extension), expected, path)
+            self.assertEqual(parser.parse_cv(data, extension), expected, path)
+            self.assertEqual(parser.parse_cv(SimpleUploadedFile(os.path.basename(path), data), extension), expected)
+
+        crlf = b"Jane Doe\r\njane@example.com\r\nSkills\r\nSQL, Excel\r\n"
+        self.assertEqual(parser.extract_text_from_txt(crlf), "Jane Doe\njane@example.com\nSkills\nSQL, Excel")
+
+    def test_percentile_nearest_rank(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile([5.0], 95), 5.0)
+
+
+class CrashingSource:
+    """A parse source that kills the worker process that unpickles it."""
+
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+class ParseManyTests(SimpleTestCase):
+    def setUp(self):
+        self.parser = CVParser()
+        self.texts = [cv["raw_text"].encode() for cv in synthetic_corpus(3, seed=5)]
+
+    def parse_many(self, files, **kwargs):
+        return {
+            key: {k: v for k, v in parsed.items() if k != "parse_ms"}
+            for key, parsed in self.parser.parse_many(files, workers=2, **kwargs)
+        }
+
+    def test_worker_crash_fails_only_its_own_file(self):
+        files = [(f"cv_{i}", ".txt", text) for i, text in enumerate(self.texts)]
+        results = self.parse_many(files + [("crash", ".txt", CrashingSource())])
+
+        self.assertEqual(results.pop("crash"), self.parser.failed_result("Error: parser worker crashed"))
+        self.assertEqual(results, {key: self.parser.parse_cv(text, ".txt") for key, _, text in files})
+
+    def test_pool_is_kept_until_a_worker_dies(self):
+        files = [(f"cv_{i}", ".txt", text) for i, text in enumerate(self.texts)]
+        self.parse_many(files)
+        pool = _shared_pool(1)
+        self.parse_many(files)
+        self.assertIs(_shared_pool(1), pool)
+
+        self.parse_many(files + [("crash", ".txt", CrashingSource())])
+        self.assertIsNot(_shared_pool(1), pool)
+
+    @skipUnless(hasattr(os, "mkfifo"), "needs named pipes")
+    def test_timeout_fails_only_its_own_file(self):
+        # Opening a pipe nobody writes to blocks until the alarm fires
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        stuck = os.path.join(directory, "stuck.txt")
+        os.mkfifo(stuck)
+
+        files = [(f"cv_{i}", ".txt", text) for i, text in enumerate(self.texts)]
+        results = self.parse_many(files + [stuck], timeout=0.5)
+
+        self.assertEqual(results.pop(stuck), self.parser.failed_result("Error: parsing timed out after 0.5s"))
+        self.assertEqual(results, {key: self.parser.parse_cv(text, ".txt") for key, _, text in files})
+
+
+@override_settings(CV_PARSE_CACHE_ALIAS="default")
+class ParseCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.parser = CVParser()
+        text = synthetic_corpus(1, seed=2)[0]["raw_text"].encode()
+        self.parsed = {**self.parser.parse_cv(text, ".txt"), "parse_ms": 3.0}
+        parse_cache.store_parsed("abc", ".txt", self.parser, self.parsed)
+
+    def test_hit_without_parse_timing(self):
+        cached = parse_cache.get_parsed("abc", ".TXT", CVParser())
+        self.assertEqual(cached, {k: v for k, v in self.parsed.items() if k != "parse_ms"})
+        self.assertIsNone(parse_cache.get_parsed("abd", ".txt", self.parser))
+
+    def test_parser_version_change_misses(self):
+        with mock.patch("analyzer.parser.PARSER_VERSION", PARSER_VERSION + 1):
+            self.assertIsNone(parse_cache.get_parsed("abc", ".txt", CVParser()))
+
+    def test_keyword_or_limit_change_misses(self):
+        parser = CVParser()
+        parser.skills_keywords = parser.skills_keywords + ["stack"]
+        self.assertIsNone(parse_cache.get_parsed("abc", ".txt", parser))
+        self.assertIsNone(parse_cache.get_parsed("abc", ".txt", CVParser(max_pages=2)))
+
+    def test_failures_are_not_cached(self):
+        parse_cache.store_parsed("bad", ".txt", self.parser, self.parser.failed_result("Error reading TXT file"))
+        self.assertIsNone(parse_cache.get_parsed("bad", ".txt", self.parser))
+
+
+class PdfStreamingTests(SimpleTestCase):
+    PAGES = [
+        ["Jane Doe", "jane@example.com", "Experience", "Analyst at Acme 2019 - 2022", "Built sales dashboards"],
+        ["Education", "BSc Statistics, State University", "Skills", "Python, SQL", "Excel"],
+        ["Projects", "Sales forecast model", "Churn analysis", "Survey tool", "Pricing study"],
+        ["Interests", "Chess", "Running", "Photography", "Cooking"],
+    ]
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "cv.pdf")
+        write_pdf(self.path, "\n".join(line for page in self.PAGES for line in page), lines_per_page=5)
+
+    def test_page_cap(self):
+        pages = list(CVParser(max_pages=2).iter_pdf_pages(self.path))
+        self.assertEqual(len(pages), 2)
+        self.assertIn("Python, SQL", pages[1])
+
+    def test_char_cap(self):
+        text = CVParser(max_chars=30).extract_text_from_pdf(self.path)
+        self.assertEqual(len(text), 30)
+        self.assertTrue(CVParser().extract_text_from_pdf(self.path).startswith(text))
+
+    def test_early_stop_reads_one_page_past_the_last_header(self):
+        full = CVParser().parse_cv(self.path, ".pdf")
+        early = CVParser(early_stop=True).parse_cv(self.path, ".pdf")
+        self.assertIn("Pricing study", early["raw_text"])
+        self.assertNotIn("Chess", early["raw_text"])
+        self.assertIn("Chess", full["raw_text"])
+        for section in ["contact_info", "experience", "education", "skills"]:
+            self.assertEqual(early[section], full[section], section)
+
+
+def scan_section(text, keywords, stop_words, section_name, max_lines):
+    """The line-by-line section scan CVParser ran once per section before SectionSegmenter."""
+    if not text or text.startswith("Error"):
+        return f"No {section_name} section found"
+
+    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    capture = False
+    section_lines = []
+
+    for line in lines:
+        lower = line.lower()
+
+        if any(k in lower for k in keywords):
+            capture = True
+            continue
+
+        if capture and any(stop in lower for stop in stop_words):
+            break
+
+        if capture:
+            section_lines.append(line)
+            if len(section_lines) >= max_lines:
+                break
+
+    return "\n".join(section_lines) or f"No {section_name} section found"
+
+
+class SegmenterTests(SimpleTestCase):
+    TEXTS = [
+        "",
+        "Error reading PDF: broken",
+        "Jane Doe\nSkills\nPython\nExperience\nAnalyst\nSkills again\nSQL",
+        # A header inside another section's body restarts that section
+        "Experience\nAcme\nWork Experience\nGlobex\nEducation\nMSc",
+        # One line can head one section and stop another
+        "Summary\nAnalyst\nSkills and Experience\nPython\nProjects\nDashboards",
+        "Certifications\n" + "\n".join(f"Course {i}" for i in range(20)) + "\nEducation\nBSc",
+        "Profile\n\n   \nTools: Excel\nTechnologies\nAWS\nCareer\nAbout me\nPortfolio site",
+    ]
+
+    def test_matches_the_per_section_scan(self):
+        parser = CVParser()
+        keywords = {name: getattr(parser, f"{name}_keywords") for name in parser.section_max_lines}
+        texts = self.TEXTS + [cv["raw_text"] for cv in synthetic_corpus(200, seed=11, max_size=4)]
+        for text in texts:
+            sections = parser.extract_sections(text)
+            for name, max_lines in parser.section_max_lines.items():
+                expected = scan_section(text, keywords[name], parser.stop_sections[name], name, max_lines)
+                self.assertEqual(sections[name], expected, (name, text[:60]))
+
+class KeywordMatcherTests(SimpleTestCase):
+    def texts(self):
+        rng = random.Random(13)
+        words = [keyword for keywords in KEYWORDS.values() for keyword in keywords] + ["and", "the", "led"]
+        texts = [cv["raw_text"] for cv in synthetic_corpus(50, seed=13)]
+        texts += [" ".join(rng.choices(words, k=rng.randint(0, 40))) for _ in range(100)]
+        # Keywords run together and split by punctuation
+        texts += ["powerbitableau", "node.js/express", "scikit-learn & keras", "SQLSQL", ""]
+        return texts
+
+    def test_matches_the_substring_scan(self):
+        for text in self.texts():
+            resume = normalize_text(text)
+            found = KEYWORD_MATCHER.scan(text)
+            for role, keywords in KEYWORDS.items():
+                present = [k for k in keywords if normalize_text(k) in resume]
+                missing = [k for k in keywords if k not in present]
+                self.assertEqual(KEYWORD_MATCHER.split_keywords(role, found), (present, missing), (role, text[:60]))
+                self.assertEqual(KEYWORD_MATCHER.match_role(role, text), (present, missing), (role, text[:60]))
+
+    def test_automaton_finds_overlapping_patterns(self):
+        rng = random.Random(17)
+        patterns = ["a", "ab", "bab", "bc", "bca", "c", "caa", "abcab"]
+        automaton = KeywordAutomaton(patterns)
+        for _ in range(200):
+            text = "".join(rng.choices("abc", k=rng.randint(0, 12)))
+            self.assertEqual(automaton.find(text), {p for p in patterns if p in text}, text)
+
+
+class JobTitleIndexTests(SimpleTestCase):
+    def overlap_scan(self, user_job_title):
+        """The linear title scan resolve_job_title() replaced."""
+        user_words = set(normalize_text(user_job_title).split())
+        if not user_words:
+            return None
+        best_match = None
+        best_score = 0
+        for job_title in KEYWORDS:
+            job_words = set(normalize_text(job_title).split())
+            overlap = len(user_words & job_words) / max(len(user_words), len(job_words))
+            if overlap > best_score:
+                best_score = overlap
+                best_match = job_title
+        return best_match if best_score >= 0.3 else None
+
+    def test_matches_the_overlap_scan_for_known_words(self):
+        titles = list(KEYWORDS)
+        queries = titles + [t.upper() for t in titles] + [
+            "senior data analyst", "analyst", "data", "web", "engineer", "learning",
+            "full stack web developer", "machine learning data engineer", "plumber", "", "!!!",
+        ]
+        for query in queries:
+            self.assertEqual(resolve_job_title(query), self.overlap_scan(query), query)
+
+    def test_corrects_one_typo_in_long_words_only(self):
+        self.assertEqual(resolve_job_title("data analsyt"), "data analyst")
+        self.assertEqual(resolve_job_title("machine lerning engineer"), "machine learning engineer")
+        self.assertEqual(JOB_TITLE_INDEX.correct_token("dat"), "dat")
+
+class SharedPatternTests(SimpleTestCase):
+    def test_contact_info_matches_per_call_regexes(self):
+        parser = CVParser()
+        texts = [cv["raw_text"] for cv in synthetic_corpus(50, seed=19)]
+        texts += ["Call +44 20 7946 0958 or (555) 123-4567", "JANE@EXAMPLE.ORG 0123456789012", "nothing here"]
+        for text in texts:
+            matches = []
+            for pattern in parser.contact_patterns:
+                matches.extend(re.findall(pattern, text, re.IGNORECASE))
+            expected = "; ".join(sorted(set(matches))) or "No contact information found"
+            self.assertEqual(parser.extract_contact_info(text), expected, text[:60])
+
+    def test_patterns_compile_once_per_list(self):
+        parser = CVParser()
+        self.assertIs(parser.contact_regexes, CVParser().contact_regexes)
+        self.assertIs(compile_all(list(CONTACT_PATTERNS), re.IGNORECASE), parser.contact_regexes)
+
+        parser.contact_patterns = [r"linkedin\.com/in/\w+"]
+        self.assertEqual(parser.extract_contact_info("LinkedIn.com/in/jane"), "LinkedIn.com/in/jane")
+
+@override_settings(CV_QUEUE_MODE="sync", CV_PARSER_WORKERS=1, CV_CLAIM_LEASE=60)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user("queue")
+        files = [
+            SimpleUploadedFile(f"cv_{i}.txt", cv["raw_text"].encode()) for i, cv in enumerate(synthetic_corpus(5, seed=4))
+        ]
+        self.batch = jobs.enqueue_batch(self.user, files, "data analyst", {})
+
+    def expire(self, cv_uploads):
+        CVUpload.objects.filter(pk__in=[cv.pk for cv in cv_uploads]).update(
+            claimed_at=timezone.now() - timedelta(seconds=61)
+        )
+
+    def test_expired_claims_are_claimed_again(self):
+        dead = jobs.claim_next(self.batch.pk, limit=2)
+        self.assertTrue(all(cv.status == CVUpload.STATUS_PROCESSING and cv.claimed_at for cv in dead))
+        self.assertEqual(len(jobs.claim_next(self.batch.pk, limit=5)), 3)
+        self.assertEqual(jobs.claim_next(self.batch.pk, limit=5), [])
+
+        self.expire(dead)
+        self.assertEqual([cv.pk for cv in jobs.claim_next(self.batch.pk, limit=5)], [cv.pk for cv in dead])
+
+    def test_racing_workers_never_claim_the_same_row(self):
+        # Worker B claims between worker A listing its candidates and
+        # claiming them, so both start from the same candidate rows
+        claimable = jobs.claimable
+        calls = []
+        other = []
+
+        def racing_claimable():
+            calls.append(None)
+            if len(calls) == 2:  # A's first conditional UPDATE
+                other.extend(jobs.claim_next(self.batch.pk, limit=2))
+            return claimable()
+
+        with mock.patch("analyzer.jobs.claimable", side_effect=racing_claimable):
+            mine = jobs.claim_next(self.batch.pk, limit=2)
+
+        self.assertEqual(len(mine), 2)
+        self.assertEqual(len(other), 2)
+        self.assertFalse({cv.pk for cv in mine} & {cv.pk for cv in other})
+        self.assertEqual(self.batch.uploads.filter(status=CVUpload.STATUS_PROCESSING).count(), 4)
+
+    def test_rows_of_a_batch_deleted_while_claimed_are_skipped(self):
+        corpus = synthetic_corpus(2, seed=6)
+        files = [SimpleUploadedFile(f"other_{i}.txt", cv["raw_text"].encode()) for i, cv in enumerate(corpus)]
+        other = jobs.enqueue_batch(self.user, files, "data analyst", {})
+        claimed = jobs.claim_next(limit=10)
+        self.assertEqual({cv.batch_id for cv in claimed}, {self.batch.pk, other.pk})
+
+        other.delete()
+        scorer = CVScorer()
+        jobs.save_uploads([jobs.score_upload(cv, corpus[0], scorer) for cv in claimed])
+
+        self.batch.refresh_from_db()
+        self.assertTrue(self.batch.is_finished)
+        self.assertEqual(self.batch.uploads.filter(status=CVUpload.STATUS_DONE).count(), 5)
+        self.assertEqual(CVContent.objects.count(), 5)
+
+    def test_batch_of_a_dead_worker_finishes(self):
+        self.expire(jobs.claim_next(self.batch.pk, limit=2))
+        self.assertEqual(jobs.run_batch(), 5)
+        self.batch.refresh_from_db()
+        self.assertTrue(self.batch.is_finished)
+        self.assertEqual(self.batch.uploads.filter(status=CVUpload.STATUS_DONE).count(), 5)
+
+
+@override_settings(CV_QUEUE_MODE="sync", CV_PARSER_WORKERS=1, CV_BULK_BATCH_SIZE=10)
+class BulkQueueTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user("bulk")
+        self.texts = [cv["raw_text"] for cv in synthetic_corpus(25, seed=3)]
+
+    def files(self, count):
+        return [
+            SimpleUploadedFile(f"cv_{i}.txt", text.encode()) for i, text in enumerate(self.texts[:count])
+        ]
+
+    def enqueue_queries(self, count):
+        with CaptureQueriesContext(connection) as ctx:
+            jobs.enqueue_batch(self.user, self.files(count), "data analyst", {})
+        return len(ctx.captured_queries)
+
+    def test_enqueue_queries_grow_per_chunk_not_per_file(self):
+        # 25 rows in chunks of 10 need two more INSERTs than 5 rows
+        self.assertEqual(self.enqueue_queries(25), self.enqueue_queries(5) + 2)
+
+    def test_batch_is_scored_and_saved(self):
+        batch = jobs.enqueue_batch(self.user, self.files(12), "data analyst", {"required_skills": ["sql"]})
+        self.assertEqual(jobs.run_batch(batch.pk), 12)
+        batch.refresh_from_db()
+        self.assertTrue(batch.is_finished)
+        self.assertEqual(batch.uploads.filter(status=CVUpload.STATUS_DONE).count(), 12)
+        self.assertFalse(batch.uploads.filter(overall_score__isnull=True).exists())
+
+
+class ListingQuerySetTests(TestCase):
+    def test_large_text_fields_are_deferred(self):
+        CVUpload.objects.create(file="cvs/a.pdf", raw_text="x" * 10000, skills="sql", processed=True)
+        cv = CVUpload.objects.for_listing().get()
+        self.assertTrue({"suggestions", "error"} <= cv.get_deferred_fields())
+        self.assertEqual(cv.filename, "a.pdf")
+
+        summary = CVUpload.objects.summaries().get()
+        self.assertEqual(set(summary), set(CVUploadQuerySet.LISTING_FIELDS))
+
+
+class CVContentTests(TestCase):
+    def test_text_is_stored_in_content_table(self):
+        cv = CVUpload.objects.create(file="cvs/a.pdf", raw_text="Jane Doe", skills="sql, python")
+        content = CVContent.objects.get(upload=cv)
+        self.assertEqual(content.skills, "sql, python")
+
+        cv = CVUpload.objects.with_content().get()
+        with self.assertNumQueries(0):
+            self.assertEqual(cv.raw_text, "Jane Doe")
+            self.assertEqual(cv.education, "")
+
+    @override_settings(CV_CONTENT_COMPRESS=True)
+    def test_compressed_round_trip(self):
+        cv = CVUpload.objects.create(file="cvs/a.pdf", raw_text="Jane Doe " * 500, experience="Led 3 teams")
+        content = CVContent.objects.get(upload=cv)
+        self.assertEqual(content.raw_text, "")
+        self.assertLess(len(content.packed), 500)
+        self.assertEqual(CVUpload.objects.get().raw_text, "Jane Doe " * 500)
+        self.assertEqual(CVUpload.objects.get().experience, "Led 3 teams")
+
+    def test_upload_without_content_reads_blank(self):
+        cv = CVUpload.objects.create(file="cvs/a.pdf")
+        self.assertEqual(CVUpload.objects.get(pk=cv.pk).skills, "")
+        self.assertFalse(CVContent.objects.exists())
+
+
+@skipUnless(connection.vendor in ("sqlite", "postgresql"), "query plans are checked on SQLite and Postgres")
+class RankedQueryPlanTests(TestCase):
+    """The ranked-results queries must read rows in index order, never sort."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("ranked")
+        batch = jobs.CVBatch.objects.create(user=cls.user)
+        CVUpload.objects.bulk_create([
+            CVUpload(user=cls.user, batch=batch, file=f"cvs/{i}.pdf", processed=i % 4 != 0, job_match_score=i % 97)
+            for i in range(400)
+        ])
+        cls.batch = batch
+
+    def plan(self, queryset):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                # Tiny test tables would otherwise be read sequentially
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("SET LOCAL enable_bitmapscan = off")
+        return queryset.explain()
+
+    def assert_ordered_by_index(self, queryset, index_name):
+        plan = self.plan(queryset)
+        self.assertIn(index_name, plan)
+        if connection.vendor == "sqlite":
+            self.assertNotIn("TEMP B-TREE", plan)
+        else:
+            self.assertNotIn("Sort", plan)
+        return plan
+
+    def test_user_ranked_results(self):
+        queryset = ranking.ranked(CVUpload.objects.filter(user=self.user))
+        self.assert_ordered_by_index(queryset, "cvupload_user_rank_idx")
+
+    def test_user_ranked_ids_are_index_only(self):
+        queryset = ranking.ranked(CVUpload.objects.filter(user=self.user)).values_list("id", "job_match_score")
+        plan = self.assert_ordered_by_index(queryset, "cvupload_user_rank_idx")
+        self.assertIn("COVERING INDEX" if connection.vendor == "sqlite" else "Index Only Scan", plan)
+
+    def test_batch_ranked_results(self):
+        queryset = ranking.ranked(self.batch.uploads.for_listing())
+        self.assert_ordered_by_index(queryset, "cvupload_batch_rank_idx")
+
+    def test_ranked_page_after_cursor(self):
+        queryset = ranking.ranked(CVUpload.objects.filter(batch=self.batch).for_listing())
+        queryset = queryset.filter(Q(rank_score__lt=50) | Q(rank_score=50, id__gt=10))[:51]
+        self.assert_ordered_by_index(queryset, "cvupload_batch_rank_idx")
+
+    def test_user_recent_uploads(self):
+        queryset = CVUpload.objects.filter(user=self.user).order_by("-uploaded_at")
+        self.assert_ordered_by_index(queryset, "cvupload_user_recent_idx")
+
+
+@override_settings(CV_QUEUE_MODE="sync", CV_PARSER_WORKERS=1, CV_BULK_BATCH_SIZE=4)
+class RematchTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user("rematch")
+        texts = [cv["raw_text"] for cv in synthetic_corpus(10, seed=5)]
+        files = [SimpleUploadedFile(f"cv_{i}.txt", text.encode()) for i, text in enumerate(texts)]
+        self.batch = jobs.enqueue_batch(self.user, files, "data analyst", {"required_experience": 50})
+        jobs.run_batch(self.batch.pk)
+
+    def scores(self):
+        return list(self.batch.uploads.order_by("id").values_list("job_match_score", flat=True))
+
+    def test_rematch_updates_scores_without_parsing(self):
+        self.assertEqual(set(self.scores()), {0})
+        with mock.patch("analyzer.parser.CVParser.parse_cv") as parse_cv:
+            updated = jobs.rematch_batch(self.batch, {"required_experience": 0})
+        parse_cv.assert_not_called()
+        self.assertEqual(updated, 10)
+        self.assertEqual(set(self.scores()), {100})
+        self.batch.refresh_from_db()
+        self.assertEqual(self.batch.required_experience, 0)
+
+    def test_rematch_queries_grow_per_chunk(self):
+        with CaptureQueriesContext(connection) as ctx:
+            jobs.rematch_batch(self.batch, {"required_skills": ["sql"]})
+        # batch update + upload read + 3 chunked bulk updates, plus savepoint statements
+        self.assertLessEqual(len(ctx.captured_queries), 8)
+
+    def test_rematch_view(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse("rematch_batch", args=[self.batch.pk]),
+            {"required_experience": "0", "required_skills": ""}
+        )
+        self.assertRedirects(response, reverse("batch_results", args=[self.batch.pk]), fetch_redirect_response=False)
+        self.assertEqual(set(self.scores()), {100})
+
+
+class FeatureTests(TestCase):
+    def test_extraction(self):
+        self.assertEqual(experience_years("Analyst 2015 - 2018\nEngineer 2018 – 2021"), 6)
+        self.assertEqual(degree_level("Master of Science, Bachelor of Arts"), 4)
+        self.assertEqual(degree_level("Self-taught"), 0)
+
+        features = extract_features({"education": "Masters in Physics", "skills": "SQL; Python, sql"})
+        self.assertEqual(features["skills"], ["python", "sql"])
+        self.assertEqual(match_score(features, {"required_education": "masters", "required_skills": ["sql"]}), 100)
+
+    def test_processed_uploads_store_features(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        user = User.objects.create_user("features")
+        texts = [cv["raw_text"] for cv in synthetic_corpus(5, seed=9)]
+        files = [SimpleUploadedFile(f"cv_{i}.txt", text.encode()) for i, text in enumerate(texts)]
+        with override_settings(MEDIA_ROOT=media_root):
+            batch = jobs.enqueue_batch(user, files, "data analyst", {"required_skills": ["sql"]})
+            jobs.run_batch(batch.pk)
+
+        scorer = CVScorer()
+        for cv in batch.uploads.all():
+            self.assertEqual(cv.features["version"], FEATURES_VERSION)
+            self.assertEqual(cv.experience_years, cv.features["experience_years"])
+            # Section scores and the match come back from the record alone
+            self.assertEqual(scorer.score_hits(cv.features["hits"])["overall_score"], cv.overall_score)
+            self.assertEqual(match_score(cv.features, batch.criteria), cv.job_match_score)
+
+        # Rows without a record get one on re-match
+        batch.uploads.update(features=None, experience_years=None, degree_level=None)
+        jobs.rematch_batch(batch, {"required_skills": ["sql"]})
+        self.assertFalse(batch.uploads.filter(features__isnull=True).exists())
+        self.assertFalse(batch.uploads.filter(experience_years__isnull=True).exists())
+
+
+@override_settings(CV_QUEUE_MODE="sync", CV_PARSER_WORKERS=1)
+class RankingTests(TestCase):
+    CRITERIA = [
+        {"required_experience": 10},
+        {"required_education": "masters"},
+        {"required_skills": ["sql", "python", "excel"]},
+        {"required_experience": 5, "required_education": "bachelors", "required_skills": ["sql", "tableau"]},
+        {},
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.user = User.objects.create_user("ranking")
+        corpus = synthetic_corpus(24, seed=11)
+        # Comma-separated skills, as matching splits them
+        texts = [cv["raw_text"].replace("Skills\nTechnical: ", "Skills\n") for cv in corpus]
+        files = [SimpleUploadedFile(f"cv_{i}.txt", text.encode()) for i, text in enumerate(texts)]
+        with override_settings(MEDIA_ROOT=cls.media_root):
+            cls.batch = jobs.enqueue_batch(cls.user, files, "data analyst", {"required_skills": ["sql"]})
+            jobs.run_batch(cls.batch.pk)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+    def uploads(self):
+        return CVUpload.objects.filter(batch=self.batch)
+
+    def test_sql_score_matches_python(self):
+        for criteria in self.CRITERIA:
+            for cv in ranking.ranked(self.uploads(), criteria):
+                self.assertAlmostEqual(cv.rank_score, match_score(cv.features, criteria), places=1)
+
+    def test_cursor_pages_cover_ranking_once(self):
+        expected = list(ranking.ranked(self.uploads(), self.CRITERIA[2]).values_list("id", flat=True))
+        seen, cursor = [], None
+        while True:
+            page = ranking.rank_candidates(self.uploads(), self.CRITERIA[2], limit=5, cursor=cursor)
+            self.assertEqual([cv.rank for cv in page.cvs], list(range(len(seen) + 1, len(seen) + len(page.cvs) + 1)))
+            seen.extend(cv.id for cv in page.cvs)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(seen, expected)
+
+    def test_hard_filters(self):
+        filters = {"min_years": 4, "min_degree_level": 3, "must_have_skills": ["sql"]}
+        kept = list(ranking.ranked(self.uploads(), **filters))
+        for cv in self.uploads():
+            passes = (
+                cv.experience_years >= 4 and cv.degree_level >= 3
+                and cv.skill_postings.filter(skill__name="sql").exists()
+            )
+            self.assertEqual(passes, cv in kept)
+
+    def test_non_ascii_skills_match(self):
+        cv = self.uploads().first()
+        cv.set_features({**cv.features, "skills": ["análisis de datos", "sql"]})
+        cv.save()
+        criteria = {"required_skills": ["análisis de datos"]}
+        self.assertEqual(ranking.ranked(self.uploads(), criteria).get(pk=cv.pk).rank_score, 100.0)
+
+    def test_cursor_pages_past_missing_scores(self):
+        unscored = list(self.uploads().order_by("id")[:7].values_list("id", flat=True))
+        CVUpload.objects.filter(pk__in=unscored).update(job_match_score=None)
+        expected = list(ranking.ranked(self.uploads()).values_list("id", flat=True))
+        scores = ranking.ranked(self.uploads()).filter(pk__in=unscored).values_list("rank_score", flat=True)
+        self.assertEqual(set(scores), {0.0})
+        seen, cursor = [], None
+        while True:
+            page = ranking.rank_candidates(self.uploads(), limit=5, cursor=cursor)
+            seen.extend(cv.id for cv in page.cvs)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ranking.InvalidCursor):
+            ranking.rank_candidates(self.uploads(), cursor="not-a-cursor")
+
+    def test_results_page_and_api(self):
+        self.client.force_login(self.user)
+        with override_settings(CV_RESULTS_PAGE_SIZE=10):
+            response = self.client.get(reverse("batch_results", args=[self.batch.pk]), {"must_have": "sql"})
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(response.context["cvs"]), 10)
+
+        response = self.client.get(
+            reverse("batch_ranking", args=[self.batch.pk]),
+            {"required_skills": "sql, python", "limit": 5}
+        )
+        data = response.json()
+        self.assertEqual(len(data["results"]), 5)
+        self.assertEqual([row["rank"] for row in data["results"]], [1, 2, 3, 4, 5])
+        self.assertTrue(data["next_cursor"])
+        self.assertNotIn("raw_text", data["results"][0])
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("search")
+        self.other = User.objects.create_user("other")
+        self.cvs = {}
+        for user, name, skills, raw_text in [
+            (self.user, "analyst", "sql, tableau", "Data analyst building <b>dashboards</b> in Tableau"),
+            (self.user, "engineer", "python, kubernetes", "Backend engineer who deployed services and dashboards"),
+            (self.other, "private", "sql, tableau", "Another analyst with dashboards"),
+        ]:
+            cv = CVUpload(user=user, file=f"cvs/{name}.txt", processed=True)
+            cv.set_texts(raw_text=raw_text, skills=skills)
+            cv.save()
+            self.cvs[name] = cv
+
+    def test_ranked_and_scoped_to_user(self):
+        hits = search.search("dashboards", user_id=self.user.pk)
+        self.assertEqual({hit["upload_id"] for hit in hits}, {self.cvs["analyst"].pk, self.cvs["engineer"].pk})
+
+        hits = search.search("tableau dashboards", user_id=self.user.pk)
+        self.assertEqual([hit["upload_id"] for hit in hits], [self.cvs["analyst"].pk])
+
+    def test_index_follows_saves_and_deletes(self):
+        if search.backend() is None:
+            self.skipTest("no full-text index on this database")
+        hits = search.search("dashboards", user_id=self.user.pk)
+        # Skills are weighted above the rest of the text; matches are highlighted
+        self.assertIn("<mark>", hits[0]["snippet"])
+        self.assertIn("&lt;b&gt;", search.search("analyst", user_id=self.user.pk)[0]["snippet"])
+
+        engineer = self.cvs["engineer"]
+        engineer.set_texts(raw_text="Backend engineer", skills="python")
+        engineer.save()
+        self.assertEqual(len(search.search("dashboards", user_id=self.user.pk)), 1)
+
+        self.cvs["analyst"].delete()
+        self.assertEqual(search.search("dashboards", user_id=self.user.pk), [])
+
+    def fts_rows(self, query):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, raw_text FROM {search.FTS_TABLE} WHERE {search.FTS_TABLE} MATCH %s ORDER BY rowid",
+                [query],
+            )
+            return cursor.fetchall()
+
+    def test_sqlite_index_keeps_no_text_or_stale_entries(self):
+        if search.backend() != "sqlite":
+            self.skipTest("no FTS5 index on this database")
+        analyst, engineer, private = self.cvs["analyst"], self.cvs["engineer"], self.cvs["private"]
+        self.assertEqual(self.fts_rows("dashboards"), [(analyst.pk, None), (engineer.pk, None), (private.pk, None)])
+
+        with override_settings(CV_CONTENT_COMPRESS=True):
+            engineer.set_texts(raw_text="Backend engineer", skills="python")
+            engineer.save()
+            private.set_texts(raw_text="Another analyst with reports")
+            private.save()
+        self.assertEqual(self.fts_rows("dashboards"), [(analyst.pk, None)])
+        self.assertEqual(self.fts_rows("reports"), [(private.pk, None)])
+
+        # Compressed and plain rows both leave the index when deleted
+        CVUpload.objects.filter(pk__in=[analyst.pk, private.pk]).delete()
+        self.assertEqual(self.fts_rows("dashboards OR reports"), [])
+        self.assertEqual(self.fts_rows("engineer"), [(engineer.pk, None)])
+
+    def test_backend_is_resolved_per_connection(self):
+        self.assertEqual(search.backend(), search._resolve(connection))
+        with mock.patch("analyzer.search._resolve", return_value=None) as resolve:
+            search.backend()
+            resolve.assert_not_called()
+            connection._search_backend = (object(), "sqlite")
+            self.assertIsNone(search.backend())
+            resolve.assert_called_once_with(connection)
+        del connection._search_backend
+
+    def test_python_snippets_read_compressed_text(self):
+        words = " ".join(f"word{i}" for i in range(30))
+        self.assertEqual(
+            search.make_snippet(f"{words} Tableau dashboards here", "dashboard", words=4),
+            "… word29 Tableau \x02dashboards\x03 here",
+        )
+        self.assertEqual(search.make_snippet("short text", "missing"), "short text")
+
+        with override_settings(CV_CONTENT_COMPRESS=True):
+            cv = CVUpload(user=self.user, file="cvs/packed.txt", processed=True)
+            cv.set_texts(raw_text="Analyst who built <b>dashboards</b>", skills="sql")
+            cv.save()
+        self.assertEqual(CVContent.objects.get(pk=cv.pk).raw_text, "")
+        snippet = search.highlight(search._snippets([cv.pk], "dashboards")[cv.pk])
+        self.assertEqual(snippet, "Analyst who built <mark>&lt;b&gt;dashboards&lt;/b&gt;</mark>")
+
+    def test_search_endpoint(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("search_cvs"), {"q": "analyst"})
+        results = response.json()["results"]
+        self.assertEqual([result["filename"] for result in results], ["analyst.txt"])
+
+
+class SkillIndexTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("skills")
+        self.cvs = {}
+        for name, skills in [
+            ("both", "Technical: Python, SQL\n• Kubernetes"),
+            ("sql", "SQL; Excel"),
+            ("python", "- Python\nCommunication"),
+            ("none", "Carpentry"),
+        ]:
+            cv = CVUpload(user=self.user, file=f"cvs/{name}.txt", processed=True)
+            cv.set_texts(skills=skills)
+            cv.save()
+            self.cvs[name] = cv
+
+    def names(self, queryset):
+        return {cv.file.name.split("/")[-1][:-4] for cv in queryset}
+
+    def test_extract_skills(self):
+        self.assertEqual(
+            skill_index.extract_skills("Technical: Python, SQL\n• C++ and machine learning (scikit-learn)"),
+            {"python", "sql", "c++", "machine learning", "scikit-learn"},
+        )
+
+    def test_and_or_queries(self):
+        self.assertEqual(self.names(skill_index.find_uploads(["sql", "python"])), {"both"})
+        self.assertEqual(
+            self.names(skill_index.find_uploads(["SQL", " python "], match=skill_index.MATCH_ANY)),
+            {"both", "sql", "python"},
+        )
+        self.assertEqual(self.names(skill_index.find_uploads(["sql", "cobol"])), set())
+
+        ranked = list(skill_index.find_uploads(["sql", "python", "excel"], match=skill_index.MATCH_ANY))
+        self.assertEqual(ranked[0].skill_hits, 2)
+
+    def test_weighting_and_reindex(self):
+        communication = Skill.objects.get(name="communication")
+        kubernetes = Skill.objects.get(name="kubernetes")
+        self.assertGreater(communication.role_count, kubernetes.role_count)
+        self.assertLess(communication.weight, kubernetes.weight)
+
+        ranked = skill_index.find_uploads(["kubernetes", "communication"], match="any", weighted=True)
+        self.assertEqual([cv.pk for cv in ranked], [self.cvs["both"].pk, self.cvs["python"].pk])
+
+        cv = self.cvs["both"]
+        cv.set_texts(skills="Cobol")
+        cv.save()
+        self.assertFalse(skill_index.find_uploads(["kubernetes"]).exists())
+        self.assertEqual(self.names(skill_index.find_uploads(["cobol"])), {"both"})
+
+    def test_skill_search_endpoint(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("skill_search"), {"skills": "sql,python", "match": "any"})
+        results = response.json()["results"]
+        self.assertEqual(results[0]["id"], self.cvs["both"].pk)
+        self.assertEqual(results[0]["skill_hits"], 2)
+
+
+@override_settings(CV_QUEUE_MODE="sync", CV_PARSER_WORKERS=1)
+class ResultsCacheTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        caches["cv_results"].clear()
+
+        self.user = User.objects.create_user("cached")
+        self.client.force_login(self.user)
+        self.client.cookies["csrftoken"] = "a" * 32  # part of the ETag
+        texts = [cv["raw_text"] for cv in synthetic_corpus(6, seed=3)]
+        files = [SimpleUploadedFile(f"cv_{i}.txt", text.encode()) for i, text in enumerate(texts)]
+        self.batch = jobs.enqueue_batch(self.user, files, "data analyst", {"required_experience": 50})
+        jobs.run_batch(self.batch.pk)
+        self.url = reverse("batch_results", args=[self.batch.pk])
+
+    def test_repeat_views_are_cached_and_conditional(self):
+        with mock.patch("analyzer.views._render_ranked_results", wraps=views._render_ranked_results) as render:
+            first = self.client.get(self.url)
+            second = self.client.get(self.url)
+            self.assertEqual(render.call_count, 1)
+        self.assertContains(second, "cv_0.txt")
+        self.assertEqual(first["ETag"], second["ETag"])
+
+        with self.assertNumQueries(3):  # session, user, batch
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        # Each filter/page combination is its own entry
+        filtered = self.client.get(self.url, {"min_years": "1"})
+        self.assertNotEqual(filtered["ETag"], first["ETag"])
+
+    def test_rematch_and_delete_invalidate(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertContains(self.client.get(self.url), "0.0%")
+
+        self.client.post(reverse("rematch_batch", args=[self.batch.pk]), {"required_experience": "0"})
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "100.0%")
+        etag = response["ETag"]
+
+        cv = self.batch.uploads.first()
+        request = APIRequestFactory().delete("/")
+        force_authenticate(request, user=self.user)
+        self.assertEqual(views.api_delete_cv(request, cv_id=cv.pk).status_code, 204)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, f'data-cv-id="{cv.pk}"')
+
+    def test_unfinished_batches_are_not_cached(self):
+        jobs.CVBatch.objects.filter(pk=self.batch.pk).update(status=jobs.CVBatch.STATUS_RUNNING)
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header("ETag"))
+
+
+def zip_of(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return SimpleUploadedFile("cvs.zip", buffer.getvalue(), content_type="application/zip")
+
+
+def tar_of(members, name="cvs.tar.gz"):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tf:
+        for path, data in members.items():
+            data = data.encode() if isinstance(data, str) else data
+            info = tarfile.TarInfo(path)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(CV_QUEUE_MODE="sync", CV_PARSER_WORKERS=1)
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user("archives")
+        self.texts = [cv["raw_text"] for cv in synthetic_corpus(4, seed=9)]
+
+    def members(self):
+        return {
+            "cvs/a.txt": self.texts[0],
+            "cvs/b.txt": self.texts[1],
+            "cvs/notes.md": "not a cv",
+            "cvs/empty.txt": "",
+            "cvs/huge.txt": "x" * (5 * 1024 * 1024 + 1),
+            "cvs/.DS_Store": "hidden",
+        }
+
+    def stored_files(self):
+        return [name for _, _, names in os.walk(self.media_root) for name in names]
+
+    def test_zip_and_tar_members_stream_into_a_batch(self):
+        for upload in (zip_of(self.members()), tar_of(self.members()), tar_of(self.members(), "cvs.tar")):
+            reader = archives.ArchiveReader(upload)
+            batch = jobs.enqueue_batch(self.user, reader, "data analyst", {})
+            self.assertEqual(batch.total_files, 2, upload.name)
+            # Stored under the member's base name (plus a suffix when taken)
+            self.assertEqual(sorted(cv.filename[0] for cv in batch.uploads.all()), ["a", "b"])
+            self.assertEqual(sorted(reader.rejected), [
+                "cvs/.DS_Store: hidden or system file",
+                "cvs/empty.txt: file is empty",
+                "cvs/huge.txt: exceeds 5MB limit",
+                "cvs/notes.md: unsupported file type: .md",
+            ])
+
+    def test_dot_slash_tar_members_are_not_hidden(self):
+        # `tar -czf cvs.tgz .` names every member ./<path>
+        upload = tar_of({f"./{path}": data for path, data in self.members().items()}, "cvs.tgz")
+        reader = archives.ArchiveReader(upload)
+        self.assertEqual(sorted(member.name for member in reader), ["a.txt", "b.txt"])
+        self.assertIn("./cvs/.DS_Store: hidden or system file", reader.rejected)
+
+    def test_limits_abort_and_clean_up(self):
+        with self.assertRaisesMessage(archives.ArchiveError, "more than 3 files"):
+            jobs.enqueue_batch(self.user, archives.ArchiveReader(zip_of(self.members()), member_limit=3), "", {})
+        with self.assertRaisesMessage(archives.ArchiveError, "uncompressed"):
+            jobs.enqueue_batch(
+                self.user, archives.ArchiveReader(tar_of(self.members()), size_limit=len(self.texts[0]) + 1), "", {}
+            )
+        with self.assertRaises(archives.ArchiveError):
+            list(archives.ArchiveReader(SimpleUploadedFile("cvs.tgz", b"not a tarball")))
+        self.assertFalse(CVBatch.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_encrypted_and_unsupported_members_are_rejected(self):
+        upload = zip_of({"a.txt": self.texts[0], "secret.txt": self.texts[1], "packed.txt": self.texts[2]})
+        data = bytearray(upload.read())
+        # Flag secret.txt as encrypted and give packed.txt an unknown compression
+        # method, in both its local header and its central directory entry
+        local, central = b"PK\x03\x04", b"PK\x01\x02"
+        for offset in (data.find(local, 1), data.find(central, data.find(central) + 1)):
+            data[offset + (6 if data[offset:offset + 4] == local else 8)] |= 1
+        for offset in (data.rfind(local), data.rfind(central)):
+            data[offset + (8 if data[offset:offset + 4] == local else 10)] = 98
+        reader = archives.ArchiveReader(SimpleUploadedFile("cvs.zip", bytes(data)))
+        self.assertEqual([member.name for member in reader], ["a.txt"])
+        self.assertEqual(reader.rejected, ["secret.txt: encrypted", "packed.txt: unsupported compression method"])
+
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("upload"), {
+            "job_name": "data analyst",
+            "cv_files": [SimpleUploadedFile("cvs.zip", bytes(data))],
+        }, follow=True)
+        self.assertContains(response, "secret.txt: encrypted")
+        self.assertEqual(CVBatch.objects.get(user=self.user).total_files, 1)
+
+    def test_upload_view_accepts_archives(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("upload"), {
+            "job_name": "data analyst",
+            "cv_files": [
+                SimpleUploadedFile("c.txt", self.texts[2].encode()),
+                tar_of({"d.txt": self.texts[3], "e.exe": "x"}, "more.tgz"),
+                zip_of(self.members()),
+            ],
+        }, follow=True)
+        batch = CVBatch.objects.get(user=self.user)
+        self.assertEqual(batch.total_files, 4)
+        self.assertEqual(batch.uploads.filter(status=CVUpload.STATUS_DONE).count(), 4)
+        self.assertContains(response, "e.exe: unsupported file type")
+
+
+@override_settings(CV_QUEUE_MODE="sync", CV_PARSER_WORKERS=1)
+class BatchApiTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user("ats")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=self.user).key}")
+        self.texts = [cv["raw_text"] for cv in synthetic_corpus(5, seed=5)]
+
+    def submit(self, **data):
+        return self.client.post(reverse("api_create_batch"), {
+            "job_name": "data analyst",
+            "required_experience": 2,
+            "required_education": "Bachelors",
+            "required_skills": "SQL, python",
+            **data,
+        }, format="multipart")
+
+    def create_batch(self):
+        response = self.submit(
+            cv_files=[SimpleUploadedFile(f"cv_{i}.txt", text.encode()) for i, text in enumerate(self.texts[:3])],
+            archive=zip_of({
+                "dump/cv_3.txt": self.texts[3],
+                "dump/cv_4.txt": self.texts[4],
+                "__MACOSX/dump/._cv_4.txt": "resource fork",
+            }),
+        )
+        self.assertEqual(response.status_code, 202, response.content)
+        return response.json()
+
+    def test_submit_and_poll(self):
+        data = self.create_batch()
+        self.assertEqual(data["total_files"], 5)
+        self.assertEqual(data["status"], "done")
+        self.assertEqual(data["required_education"], "bachelors")
+        self.assertEqual(data["required_skills"], ["sql", "python"])
+        self.assertEqual(data["progress"]["processed"], 5)
+        self.assertTrue(data["results_url"].endswith(reverse("api_batch_results", args=[data["id"]])))
+
+        detail = self.client.get(data["status_url"]).json()
+        self.assertEqual(detail["progress"]["percent"], 100.0)
+
+    def test_rejects_invalid_submissions(self):
+        self.assertEqual(self.submit().status_code, 400)
+        response = self.submit(archive=zip_of({"cv.exe": "x"}))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["rejected"], ["cv.exe: unsupported file type: .exe"])
+        self.assertEqual(self.submit(archive=SimpleUploadedFile("cvs.zip", b"not a zip")).status_code, 400)
+        self.assertFalse(CVBatch.objects.exists())
+
+    def test_results_pages_and_field_selection(self):
+        url = self.create_batch()["results_url"]
+        expected = list(
+            ranking.ranked(CVUpload.objects.filter(batch__user=self.user)).values_list("id", flat=True)
+        )
+
+        seen, next_url = [], f"{url}?limit=2"
+        while next_url:
+            data = self.client.get(next_url).json()
+            seen.extend(row["id"] for row in data["results"])
+            next_url = data["next"]
+        self.assertEqual(seen, expected)
+        self.assertNotIn("raw_text", data["results"][0])
+        self.assertIn("job_match_score", data["results"][0])
+
+        with self.assertNumQueries(4):  # token + user, batch, page, content
+            data = self.client.get(url, {"fields": "id,rank,skills"}).json()
+        self.assertEqual(set(data["results"][0]), {"id", "rank", "skills"})
+        row = data["results"][0]
+        self.assertEqual(row["skills"], CVUpload.objects.get(pk=row["id"]).skills)
+
+        self.assertEqual(self.client.get(url, {"fields": "id,password"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"cursor": "bogus"}).status_code, 400)
+
+    def test_batches_are_private(self):
+        url = self.create_batch()["status_url"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=User.objects.create_user('other')).key}")
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.client.credentials()
+        self.assertIn(self.client.get(url).status_code, (401, 403))
+
+
+@override_settings(CV_QUEUE_MODE="sync", CV_PARSER_WORKERS=1)
+class InMemorySubmitTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user("memory")
+        self.texts = [cv["raw_text"] for cv in synthetic_corpus(3, seed=4)]
+
+    def files(self):
+        # Same name twice: stored names must still differ
+        return [SimpleUploadedFile("cv.txt", text.encode()) for text in self.texts]
+
+    def submit(self, store):
+        with mock.patch("analyzer.parse_cache.get_parsed", return_value=None), \
+                mock.patch("analyzer.parser.CVParser.parse_cv", autospec=True, side_effect=CVParser.parse_cv) as parse_cv:
+            batch = jobs.submit_batch(self.user, self.files(), "data analyst", {"required_skills": ["sql"]}, store=store)
+        self.assertEqual([type(call.args[1]) for call in parse_cv.call_args_list], [bytes] * 3)
+        batch.refresh_from_db()
+        self.assertTrue(batch.is_finished)
+        self.assertEqual(batch.uploads.filter(status=CVUpload.STATUS_DONE).count(), 3)
+        return batch
+
+    def test_parses_from_memory_while_storing(self):
+        batch = self.submit(store=True)
+        uploads = list(batch.uploads.order_by("id"))
+        self.assertEqual(len({cv.file.name for cv in uploads}), 3)
+        for cv, text in zip(uploads, self.texts):
+            self.assertTrue(cv.file_stored)
+            with cv.file.open("rb") as f:
+                self.assertEqual(f.read(), text.encode())
+
+    def test_analyze_only_keeps_no_files(self):
+        batch = self.submit(store=False)
+        self.assertEqual(os.listdir(self.media_root), [])
+        cv = batch.uploads.first()
+        self.assertFalse(cv.file_stored)
+        self.assertEqual(cv.filename, "cv.txt")
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("batch_results", args=[batch.pk]))
+        self.assertContains(response, "cv.txt")
+        self.assertNotContains(response, 'title="Download"')
+
+    def test_reads_a_chunk_ahead_of_processing(self):
+        texts = [cv["raw_text"] for cv in synthetic_corpus(10, seed=8)]
+        read = []
+
+        def files():
+            for i, text in enumerate(texts):
+                read.append(i)
+                yield SimpleUploadedFile(f"cv_{i}.txt", text.encode())
+
+        seen = []
+
+        def process_chunk(cv_uploads, *args):
+            batch = CVBatch.objects.get(pk=cv_uploads[0].batch_id)
+            seen.append((len(cv_uploads), len(read), batch.is_finished))
+            self.assertTrue(all(cv.status == CVUpload.STATUS_PROCESSING and cv.claimed_at for cv in cv_uploads))
+            return real_process_chunk(cv_uploads, *args)
+
+        real_process_chunk = jobs._process_chunk
+        with mock.patch("analyzer.jobs._process_chunk", side_effect=process_chunk):
+            batch = jobs.submit_batch(self.user, files(), "data analyst", {}, store=False)
+        # Chunks of 4: each is processed once the next has been read, never later
+        self.assertEqual(seen, [(4, 8, False), (4, 10, False), (2, 10, False)])
+        batch.refresh_from_db()
+        self.assertEqual(batch.total_files, 10)
+        self.assertTrue(batch.is_finished)
+        self.assertEqual(batch.uploads.filter(status=CVUpload.STATUS_DONE).count(), 10)
+
+    def test_archive_error_removes_batch_and_files(self):
+        members = {f"cvs/{i}.txt": cv["raw_text"] for i, cv in enumerate(synthetic_corpus(9, seed=9))}
+        with self.assertRaises(archives.ArchiveError):
+            jobs.submit_batch(
+                self.user, archives.ArchiveReader(zip_of(members), member_limit=8), "data analyst", {}
+            )
+        self.assertFalse(CVBatch.objects.exists())
+        self.assertEqual([files for _, _, files in os.walk(self.media_root) if files], [])
+
+    @override_settings(CV_QUEUE_MODE="worker")
+    def test_worker_mode_stores_and_queues(self):
+        batch = jobs.submit_batch(self.user, self.files(), "data analyst", {})
+        self.assertEqual(batch.uploads.filter(status=CVUpload.STATUS_QUEUED).count(), 3)
+        self.assertEqual(jobs.run_batch(batch.pk), 3)
+
+
+@override_settings(CV_QUEUE_MODE="sync", CV_PARSER_WORKERS=1)
+class AsyncSubmitTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user("async")
+        self.texts = [cv["raw_text"] for cv in synthetic_corpus(3, seed=5)]
+        parse_cache_patch = mock.patch("analyzer.parse_cache.get_parsed", return_value=None)
+        parse_cache_patch.start()
+        self.addCleanup(parse_cache_patch.stop)
+
+    def files(self):
+        return [SimpleUploadedFile("cv.txt", text.encode()) for text in self.texts]
+
+    def test_parses_from_memory_and_stores(self):
+        batch = async_to_sync(async_jobs.asubmit_batch)(
+            self.user, self.files(), "data analyst", {"required_skills": ["sql"]}
+        )
+        batch.refresh_from_db()
+        self.assertTrue(batch.is_finished)
+        uploads = list(batch.uploads.order_by("id"))
+        self.assertEqual([cv.status for cv in uploads], [CVUpload.STATUS_DONE] * 3)
+        self.assertEqual(len({cv.file.name for cv in uploads}), 3)
+        for cv, text in zip(uploads, self.texts):
+            with cv.file.open("rb") as f:
+                self.assertEqual(f.read(), text.encode())
+
+    def test_failed_insert_removes_stored_files(self):
+        with mock.patch("analyzer.jobs._create_batch", side_effect=RuntimeError("insert failed")):
+            with self.assertRaisesMessage(RuntimeError, "insert failed"):
+                async_to_sync(async_jobs.asubmit_batch)(self.user, self.files(), "data analyst", {})
+        self.assertEqual([files for _, _, files in os.walk(self.media_root) if files], [])
+        self.assertFalse(CVBatch.objects.exists())
+
+    def test_failed_chunk_fails_the_batch(self):
+        with override_settings(CV_PARSER_WORKERS=2), \
+                mock.patch("analyzer.async_jobs.process_chunk", side_effect=RuntimeError("extract failed")):
+            with self.assertRaisesMessage(RuntimeError, "extract failed"):
+                async_to_sync(async_jobs.asubmit_batch)(self.user, self.files() * 4, "data analyst", {})
+        batch = CVBatch.objects.get(user=self.user)
+        self.assertTrue(batch.is_finished)
+        # The chunk that failed and the one read ahead of it
+        self.assertEqual(
+            list(batch.uploads.values_list("status", "error")),
+            [(CVUpload.STATUS_FAILED, "extract failed")] * 12,
+        )
+
+    def test_upload_view(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("upload_async"), {
+            "job_name": "data analyst",
+            "required_skills": "sql",
+            "cv_files": self.files(),
+        })
+        batch = CVBatch.objects.get(user=self.user)
+        self.assertRedirects(response, reverse("batch_results", args=[batch.pk]), fetch_redirect_response=False)
+        self.assertEqual(self.client.session["batch_id"], str(batch.pk))
+        self.assertEqual(batch.uploads.filter(status=CVUpload.STATUS_DONE).count(), 3)
+
+    def test_upload_view_rejects_empty_batch(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("upload_async"), {
+            "job_name": "data analyst",
+            "cv_files": [SimpleUploadedFile("notes.exe", b"x")],
+        })
+        self.assertRedirects(response, reverse("upload_async"), fetch_redirect_response=False)
+        self.assertFalse(CVBatch.objects.exists())
+
+    def test_upload_and_suggest_view(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("upload_and_suggest_async"), {
+            "job_name": "data analyst",
+            "file": self.files()[0],
+        })
+        self.assertEqual(response.status_code, 200)
+        cv = CVUpload.objects.with_content().get(user=self.user)
+        self.assertTrue(cv.processed)
+        self.assertEqual(cv.raw_text, self.texts[0])
+        self.assertEqual(response.context["cv"].pk, cv.pk)
+
+    def test_upload_and_suggest_view_reports_a_failed_save(self):
+        self.client.force_login(self.user)
+        with mock.patch.object(CVUpload, "save", side_effect=RuntimeError("disk full")):
+            response = self.client.post(reverse("upload_and_suggest_async"), {
+                "job_name": "data analyst",
+                "file": self.files()[0],
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([str(m) for m in response.context["messages"]], ["Error processing CV: disk full"])
+        self.assertFalse(CVUpload.objects.exists())
+
+
+@override_settings(CV_QUEUE_MODE="thread", CV_PARSER_WORKERS=1)
+class AsyncThreadModeTests(TransactionTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        parse_cache_patch = mock.patch("analyzer.parse_cache.get_parsed", return_value=None)
+        parse_cache_patch.start()
+        self.addCleanup(parse_cache_patch.stop)
+
+    def test_batch_finishes_after_the_caller_returns(self):
+        user = User.objects.create_user("async-thread")
+        files = [SimpleUploadedFile("cv.txt", cv["raw_text"].encode()) for cv in synthetic_corpus(2, seed=6)]
+        # The caller's event loop and sync thread are gone before the batch is processed
+        batch = async_to_sync(async_jobs.asubmit_batch)(user, files, "data analyst", {})
+        deadline = time.monotonic() + 30
+        while not batch.is_finished and time.monotonic() < deadline:
+            time.sleep(0.05)
+            batch.refresh_from_db()
+        self.assertTrue(batch.is_finished)
+        self.assertEqual(batch.uploads.filter(status=CVUpload.STATUS_DONE).count(), 2)
+
+
+def sse_events(text):
+    """(id, event, data) of each message in a text/event-stream body."""
+    events = []
+    for message in text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines() if line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@override_settings(CV_QUEUE_MODE="sync", CV_PARSER_WORKERS=1, CV_PROGRESS_POLL_INTERVAL=0.05)
+class ProgressEventTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user("progress")
+        self.client.force_login(self.user)
+        parse_cache_patch = mock.patch("analyzer.parse_cache.get_parsed", return_value=None)
+        parse_cache_patch.start()
+        self.addCleanup(parse_cache_patch.stop)
+
+    def files(self):
+        texts = [cv["raw_text"] for cv in synthetic_corpus(3, seed=6)]
+        return [SimpleUploadedFile(f"cv{i}.txt", text.encode()) for i, text in enumerate(texts)] + [
+            SimpleUploadedFile("broken.docx", b"not a docx")
+        ]
+
+    def stream(self, batch, **headers):
+        response = self.client.get(reverse("batch_events", args=[batch.pk]), **headers)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertFalse(response.streaming)
+        return sse_events(response.content.decode())
+
+    def test_finished_rows_are_numbered_and_timed(self):
+        batch = jobs.submit_batch(self.user, self.files(), "data analyst", {})
+        batch.refresh_from_db()
+        self.assertEqual(batch.event_seq, 4)
+        uploads = list(batch.uploads.order_by("event_seq"))
+        self.assertEqual([cv.event_seq for cv in uploads], [1, 2, 3, 4])
+        for cv in uploads:
+            self.assertIsNotNone(cv.parse_ms)
+            self.assertIsNotNone(cv.score_ms)
+
+    def test_stream_sends_file_events_then_done(self):
+        batch = jobs.submit_batch(self.user, self.files(), "data analyst", {"required_skills": ["sql"]})
+        events = self.stream(batch)
+
+        kinds = [event for _, event, _ in events]
+        self.assertEqual(kinds.count("parsed"), 3)
+        self.assertEqual(kinds.count("scored"), 3)
+        self.assertEqual(kinds[-2:], ["progress", "done"])
+        failed = [data for _, event, data in events if event == "failed"]
+        self.assertEqual([data["filename"] for data in failed], ["broken.docx"])
+        self.assertTrue(failed[0]["error"])
+
+        scored = [(event_id, data) for event_id, event, data in events if event == "scored"]
+        for event_id, data in scored:
+            cv = CVUpload.objects.get(pk=data["id"])
+            self.assertEqual(int(event_id), cv.event_seq)
+            self.assertEqual(data["job_match_score"], cv.job_match_score)
+            self.assertIn(f'data-cv-id="{cv.pk}"', data["html"])
+        self.assertEqual(events[-1][2]["processed"], 3)
+        self.assertEqual(events[-1][2]["failed"], 1)
+
+    def test_stream_resumes_after_last_event_id(self):
+        batch = jobs.submit_batch(self.user, self.files(), "data analyst", {})
+        events = self.stream(batch, HTTP_LAST_EVENT_ID="3")
+        ids = [event_id for event_id, _, _ in events if event_id]
+        self.assertEqual(ids, ["4"])
+
+    def test_async_stream_matches_snapshot(self):
+        batch = jobs.submit_batch(self.user, self.files(), "data analyst", {})
+
+        async def collect():
+            return "".join([chunk async for chunk in progress.astream(batch.pk)])
+
+        self.assertEqual(sse_events(async_to_sync(collect)()), sse_events(progress.snapshot(batch.pk)))
+
+    @override_settings(CV_QUEUE_MODE="worker")
+    def test_snapshot_of_unfinished_batch_ends_at_once(self):
+        batch = jobs.submit_batch(self.user, self.files(), "data analyst", {})
+        response = self.client.get(reverse("batch_events", args=[batch.pk]))
+        self.assertEqual(response.content.decode(), "retry: 100\n\n")
+
+    @override_settings(CV_QUEUE_MODE="worker", CV_PROGRESS_FLUSH_INTERVAL=0)
+    def test_unfinished_batch_streams_into_the_results_page(self):
+        batch = jobs.submit_batch(self.user, self.files()[:3], "data analyst", {})
+        self.assertEqual(progress.poll(batch.pk, 0), ([], 0, False))
+
+        response = self.client.get(reverse("batch_results", args=[batch.pk]))
+        self.assertContains(response, reverse("batch_events", args=[batch.pk]))
+        self.assertContains(response, "Results will appear here as CVs are scored.")
+
+        # With no flush interval every scored CV is saved (and streamable) on its own
+        with mock.patch("analyzer.jobs.save_uploads", wraps=jobs.save_uploads) as save_uploads:
+            jobs.run_batch(batch.pk)
+        self.assertEqual(len([call for call in save_uploads.call_args_list if call.args[0]]), 3)
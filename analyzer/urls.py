@@ -5,9 +5,22 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('upload/', views.upload, name='upload'),
     path('upload-and-suggest/', views.upload_and_suggest, name='upload_and_suggest'),
+    path('upload/async/', views.upload_async, name='upload_async'),
+    path('upload-and-suggest/async/', views.upload_and_suggest_async, name='upload_and_suggest_async'),
     path('matched-results/', views.matched_results, name='matched_results'),
+    path('matched-results/<uuid:batch_id>/', views.matched_results, name='batch_results'),
+    path('matched-results/<uuid:batch_id>/rematch/', views.rematch_batch, name='rematch_batch'),
+    path('batches/<uuid:batch_id>/status/', views.batch_status, name='batch_status'),
+    path('batches/<uuid:batch_id>/events/', views.batch_events, name='batch_events'),
+    path('batches/<uuid:batch_id>/ranking/', views.batch_ranking, name='batch_ranking'),
     path('cv-suggestions/<int:cv_id>/', views.cv_suggestions, name='cv_suggestions'),
-    
+    path('search/', views.search_cvs, name='search_cvs'),
+    path('search/skills/', views.skill_search, name='skill_search'),
+
+    path('api/batches/', views.api_create_batch, name='api_create_batch'),
+    path('api/batches/<uuid:batch_id>/', views.api_batch_detail, name='api_batch_detail'),
+    path('api/batches/<uuid:batch_id>/results/', views.api_batch_results, name='api_batch_results'),
+    path('api/cv/<int:cv_id>/delete/', views.api_delete_cv, name='api_delete_cv'),
 ]
 
 
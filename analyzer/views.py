@@ -2,18 +2,27 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.files.storage import default_storage
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.safestring import mark_safe
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from asgiref.sync import sync_to_async
+import asyncio
 import os
-import re
 import logging
+from itertools import chain
 
-from .models import CVUpload
-from .forms import CVUploadForm
+from . import archives, async_jobs, jobs, progress, ranking, results_cache, search, skill_index
+from .models import CONTENT_TEXT_FIELDS, CVBatch, CVContent, CVUpload, CVUploadQuerySet
+from .forms import CandidateFilterForm, CVUploadForm, MatchCriteriaForm
+from .serializers import BatchCreateSerializer, CVBatchSerializer, CVResultSerializer
 from .parser import CVParser
-from .cv_scorer import CVScorer
 from utiliy.suggestions import generate_job_keyword_suggestions
 
 logger = logging.getLogger(__name__)
@@ -25,116 +34,35 @@ def home(request):
 
 @login_required
 def upload(request):
-    """Bulk CV upload and matching"""
+    """Bulk CV upload: queue the files and hand them to the job queue"""
     if request.method == "POST":
         form = CVUploadForm(request.POST, request.FILES)
         files = request.FILES.getlist("cv_files")
-        job_name = (request.POST.get("job_name") or "").strip()
 
         if form.is_valid():
-            required_experience = form.cleaned_data.get('required_experience')
-            required_education = (form.cleaned_data.get('required_education') or '').lower()
-            required_skills = form.cleaned_data.get('required_skills', [])  # Already a list
+            criteria = form.criteria()
 
-            # Clear previous CVs for this user
+            # Clear previous CVs (and their batches) for this user
+            CVBatch.objects.filter(user=request.user).delete()
             CVUpload.objects.filter(user=request.user).delete()
 
-            uploaded_cvs = []
-            parser = CVParser()
-            scorer = CVScorer()
-
-            for file in files:
-                file_ext = os.path.splitext(file.name)[1].lower()
-                if file.size > 5 * 1024 * 1024:
-                    messages.error(request, f"File too large (max 5MB): {file.name}")
-                    continue
-
-                cv_upload = CVUpload(
-                    user=request.user,
-                    file=file,
-                    target_job_role=form.cleaned_data.get('job_name', '')
+            accepted, readers = _split_uploads(request, files)
+            try:
+                batch = jobs.submit_batch(
+                    request.user,
+                    chain(accepted, *readers),
+                    form.cleaned_data.get('job_name', ''),
+                    criteria,
+                    store=not form.cleaned_data.get('analyze_only')
                 )
-                cv_upload.save()
-
-                try:
-                    # Parse CV content
-                    parsed_data = parser.parse_cv(cv_upload.file.path, file_ext)
-
-                    # Score CV
-                    scoring_results = scorer.score_cv(parsed_data, job_name)
-
-                    # Save parsed data
-                    cv_upload.raw_text = parsed_data.get("raw_text", "")
-                    cv_upload.experience = parsed_data.get("experience", "")
-                    cv_upload.education = parsed_data.get("education", "")
-                    cv_upload.skills = parsed_data.get("skills", "")
-
-                    # Save scoring
-                    scores = scoring_results.get("section_scores", {})
-                    cv_upload.overall_score = scoring_results.get("overall_score", 0)
-                    cv_upload.contact_score = scores.get("contact", 0)
-                    cv_upload.experience_score = scores.get("experience", 0)
-                    cv_upload.education_score = scores.get("education", 0)
-                    cv_upload.skills_score = scores.get("skills", 0)
-                    cv_upload.format_score = scores.get("format", 0)
-
-                    # Calculate matching score
-                    matching_score = 0
-                    total_criteria = 0
-
-                    # Experience
-                    if required_experience is not None:
-                        total_criteria += 1
-                        exp_years = 0
-                        try:
-                            for start_str, end_str in re.findall(r'(\d{4})\s*[-–]\s*(\d{4})', cv_upload.experience):
-                                exp_years += max(0, int(end_str) - int(start_str))
-                            if exp_years == 0:
-                                years = [int(s) for s in re.findall(r'\b(19|20)\d{2}\b', cv_upload.experience)]
-                                if years:
-                                    exp_years = max(years) - min(years)
-                        except Exception:
-                            exp_years = 0
-                        if exp_years >= required_experience:
-                            matching_score += 1
-
-                    # Education
-                    if required_education:
-                        total_criteria += 1
-                        if required_education in (cv_upload.education or '').lower():
-                            matching_score += 1
-
-                    # Skills
-                    if required_skills:
-                        total_criteria += 1
-                        cv_skills = [s.strip().lower() for s in re.split(r',|;', cv_upload.skills or '') if s.strip()]
-                        if cv_skills:
-                            matched_skills = set(required_skills) & set(cv_skills)
-                            skill_ratio = len(matched_skills) / len(required_skills)
-                            matching_score += skill_ratio
-
-                    cv_upload.matching_score = round((matching_score / total_criteria) * 100, 2) if total_criteria else 0
-                    cv_upload.processed = True
-                    cv_upload.save()
-                    uploaded_cvs.append(cv_upload)
-
-                except Exception as e:
-                    logger.error(f"Error processing {file.name}: {e}")
-                    messages.error(request, f"Error processing {file.name}: {str(e)}")
-                    if cv_upload.pk:
-                        if cv_upload.file and default_storage.exists(cv_upload.file.name):
-                            default_storage.delete(cv_upload.file.name)
-                        cv_upload.delete()
-
-            if not uploaded_cvs:
-                messages.error(request, "No valid files were processed.")
+            except (archives.ArchiveError, jobs.EmptyBatch) as e:
+                messages.error(request, str(e) if readers else "No valid files were processed.")
                 return redirect('upload')
+            _warn_rejected(request, readers)
 
-            # Sort by matching score
-            matched_cvs = sorted(uploaded_cvs, key=lambda x: x.matching_score, reverse=True)
-            request.session["matched_cv_ids"] = [cv.id for cv in matched_cvs]
-            request.session["job_title"] = form.cleaned_data.get('job_name', '')
-            return redirect("matched_results")
+            request.session["batch_id"] = str(batch.pk)
+            request.session["job_title"] = batch.job_name
+            return redirect("batch_results", batch_id=batch.pk)
 
     else:
         form = CVUploadForm()
@@ -142,25 +70,293 @@ def upload(request):
     return render(request, "analyzer/upload.html", {"form": form})
 
 
+def _split_uploads(request, files):
+    # Loose CVs are checked here; archive members as they are read
+    accepted, readers = [], []
+    for file in files:
+        if archives.is_archive(file.name):
+            readers.append(archives.ArchiveReader(file))
+            continue
+        reason = archives.check_cv_file(file.name, file.size)
+        if reason:
+            messages.error(request, f"Skipped {file.name}: {reason}")
+            continue
+        accepted.append(file)
+    return accepted, readers
+
+
+def _warn_rejected(request, readers):
+    rejected = [reason for reader in readers for reason in reader.rejected]
+    if rejected:
+        more = f" (and {len(rejected) - 5} more)" if len(rejected) > 5 else ""
+        messages.warning(request, f"Skipped archive files: {'; '.join(rejected[:5])}{more}")
+
+
+def _uploaded_files(request):
+    # First access to request.POST/FILES parses the multipart body (and may
+    # spool files to disk), so async views run this in a thread
+    return request.FILES
+
+
+def _bound_upload_form(request):
+    form = CVUploadForm(request.POST, _uploaded_files(request))
+    form.is_valid()
+    return form, request.FILES.getlist("cv_files")
+
+
 @login_required
-def matched_results(request):
-    matched_ids = request.session.get("matched_cv_ids", [])
-    if not matched_ids:
+async def upload_async(request):
+    """
+    upload() for ASGI servers: batches processed in the request are parsed
+    by async_jobs.asubmit_batch(), each chunk's files concurrently, without
+    holding a thread while they are.
+    """
+    if request.method != "POST":
+        return await sync_to_async(render)(request, "analyzer/upload.html", {"form": CVUploadForm()})
+
+    user = await request.auser()
+    form, files = await sync_to_async(_bound_upload_form, thread_sensitive=False)(request)
+    if not form.is_valid():
+        return await sync_to_async(render)(request, "analyzer/upload.html", {"form": form})
+
+    # Clear previous CVs (and their batches) for this user
+    await CVBatch.objects.filter(user=user).adelete()
+    await CVUpload.objects.filter(user=user).adelete()
+
+    accepted, readers = _split_uploads(request, files)
+    try:
+        batch = await async_jobs.asubmit_batch(
+            user,
+            chain(accepted, *readers),
+            form.cleaned_data.get('job_name', ''),
+            form.criteria(),
+            store=not form.cleaned_data.get('analyze_only')
+        )
+    except (archives.ArchiveError, jobs.EmptyBatch) as e:
+        messages.error(request, str(e) if readers else "No valid files were processed.")
+        return redirect('upload_async')
+    _warn_rejected(request, readers)
+
+    await request.session.aset("batch_id", str(batch.pk))
+    await request.session.aset("job_title", batch.job_name)
+    return redirect("batch_results", batch_id=batch.pk)
+
+
+@login_required
+def matched_results(request, batch_id=None):
+    batch_id = batch_id or request.session.get("batch_id")
+    batch = CVBatch.objects.filter(pk=batch_id, user=request.user).first() if batch_id else None
+    if batch is None:
         return render(request, "analyzer/matched_results.html", {
             "cvs": [],
             "job_title": request.session.get("job_title", ""),
             "error_message": "No CVs have been uploaded or matched yet."
         })
 
-    cvs = CVUpload.objects.filter(id__in=matched_ids, processed=True).order_by('-matching_score')
-    request.session["matched_cv_ids"] = list(cvs.values_list('id', flat=True))
-    job_title = request.session.get("job_title", "")
-
-    return render(request, "analyzer/matched_results.html", {
-        "cvs": cvs,
-        "job_title": job_title,
+    # A finished batch's results only change through re-matching or
+    # deletion, both of which retire its cache entries and ETags
+    cacheable = results_cache.is_cacheable(batch)
+    etag = results_cache.etag(batch, request.GET, request) if cacheable else None
+    if etag and not len(messages.get_messages(request)):
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+    filter_form = CandidateFilterForm(request.GET or None)
+    fragment = results_cache.get_fragment(batch, request.GET) if cacheable else None
+    if fragment is None:
+        try:
+            fragment = _render_ranked_results(request, batch, filter_form)
+        except ranking.InvalidCursor:
+            return redirect("batch_results", batch_id=batch.pk)
+        if cacheable:
+            results_cache.store_fragment(batch, request.GET, fragment)
+
+    response = render(request, "analyzer/matched_results.html", {
+        "batch": batch,
+        "progress": fragment["progress"],
+        "results_html": mark_safe(fragment["html"]) if fragment["html"] else "",
+        "total_cvs": fragment["total_cvs"],
+        "job_title": batch.job_name,
+        "criteria_form": MatchCriteriaForm.for_batch(batch),
+        "filter_form": filter_form,
+        "events_after": batch.event_seq,
         "error_message": None
     })
+    if etag:
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _render_ranked_results(request, batch, filter_form):
+    """
+    Rank the batch and render the results fragment (summary, table, chart).
+    Hard filters, ordering and paging all run in SQL on listing columns
+    only, so a page costs the same however many CVs the batch holds.
+    """
+    filters = filter_form.filters() if filter_form.is_valid() else {}
+    uploads = CVUpload.objects.filter(batch=batch).for_listing()
+    cursor = request.GET.get("cursor")
+    page = ranking.rank_candidates(uploads, cursor=cursor, **filters)
+
+    ranked_uploads = ranking.ranked(uploads, **filters)
+    stats = ranking.summarize(ranked_uploads)
+    leaders = page.cvs[:6] if page.cvs and page.cvs[0].rank == 1 else list(ranked_uploads[:6])
+    top3 = [cv.rank_score or 0 for cv in leaders[:3]]
+
+    query = request.GET.copy()
+    query.pop("cursor", None)
+
+    # An unfinished batch always gets the table, for scored CVs to stream into
+    live = not batch.is_finished
+    html = ""
+    if page.cvs or filter_form.is_bound or live:
+        html = render_to_string("analyzer/ranked_results.html", {
+            "cvs": page.cvs,
+            "leaders": leaders,
+            "total_cvs": stats["total"],
+            "cursor": cursor,
+            "next_cursor": page.next_cursor,
+            "filter_query": query.urlencode(),
+            "top3_avg": sum(top3) / len(top3) if top3 else 0,
+            "lowest_score": stats["lowest_score"],
+            "page_size": ranking.page_size(),
+            "live": live,
+        }, request=request)
+    return {"html": str(html), "total_cvs": stats["total"], "progress": jobs.batch_progress(batch)}
+
+
+@login_required
+def batch_ranking(request, batch_id):
+    """
+    JSON ranking API: ?min_years=&min_degree=&must_have=a,b filter,
+    ?required_experience=&required_education=&required_skills= re-rank with
+    ad-hoc criteria (computed in SQL), ?limit=&cursor= page through results.
+    """
+    batch = get_object_or_404(CVBatch, pk=batch_id, user=request.user)
+    filter_form = CandidateFilterForm(request.GET)
+    criteria_form = MatchCriteriaForm(request.GET)
+    if not (filter_form.is_valid() and criteria_form.is_valid()):
+        return JsonResponse({"errors": {**filter_form.errors, **criteria_form.errors}}, status=400)
+
+    criteria = None
+    if any(request.GET.get(name) for name in criteria_form.fields):
+        criteria = criteria_form.criteria()
+    try:
+        limit = min(max(1, int(request.GET.get("limit") or ranking.page_size())), 200)
+        page = ranking.rank_candidates(
+            CVUpload.objects.filter(batch=batch).summaries(),
+            criteria,
+            limit=limit,
+            cursor=request.GET.get("cursor"),
+            **filter_form.filters()
+        )
+    except ValueError:
+        return JsonResponse({"errors": {"cursor": ["Invalid cursor or limit."]}}, status=400)
+
+    return JsonResponse({
+        "results": [
+            {**row, "uploaded_at": row["uploaded_at"].isoformat()} for row in page.cvs
+        ],
+        "next_cursor": page.next_cursor,
+    })
+
+
+@login_required
+def rematch_batch(request, batch_id):
+    """Re-run only the matching stage of a finished batch with new criteria"""
+    batch = get_object_or_404(CVBatch, pk=batch_id, user=request.user)
+    if request.method != "POST":
+        return redirect("batch_results", batch_id=batch.pk)
+
+    form = MatchCriteriaForm(request.POST)
+    if not batch.is_finished:
+        messages.error(request, "Wait until every CV has been processed before changing the criteria.")
+    elif form.is_valid():
+        updated = jobs.rematch_batch(batch, form.criteria())
+        messages.success(request, f"Re-matched {updated} CV{'s' if updated != 1 else ''} with the new criteria.")
+    else:
+        messages.error(request, "Invalid criteria.")
+    return redirect("batch_results", batch_id=batch.pk)
+
+
+@login_required
+def batch_status(request, batch_id):
+    batch = get_object_or_404(CVBatch, pk=batch_id, user=request.user)
+    return JsonResponse(jobs.batch_progress(batch))
+
+
+@login_required
+def batch_events(request, batch_id):
+    """
+    Server-sent per-file progress events of a batch (see analyzer.progress),
+    from the event after Last-Event-ID or ?after=: a stream under ASGI, one
+    snapshot the browser polls for again under WSGI.
+    """
+    batch = get_object_or_404(CVBatch, pk=batch_id, user=request.user)
+    try:
+        after = max(0, int(request.headers.get("Last-Event-ID") or request.GET.get("after") or 0))
+    except ValueError:
+        after = 0
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(progress.astream(batch.pk, after), content_type="text/event-stream")
+    else:
+        # A stream would hold a sync worker for minutes (and outlive its timeout)
+        response = HttpResponse(progress.snapshot(batch.pk, after), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: pass events through unbuffered
+    return response
+
+
+@login_required
+def search_cvs(request):
+    """Full-text search over the user's CVs: ?q=terms&limit=, best match first"""
+    query = (request.GET.get("q") or "").strip()
+    try:
+        limit = min(max(1, int(request.GET.get("limit") or 20)), 100)
+    except ValueError:
+        return JsonResponse({"errors": {"limit": ["Enter a whole number."]}}, status=400)
+
+    hits = search.search(query, user_id=request.user.pk, limit=limit)
+    uploads = CVUpload.objects.filter(pk__in=[hit["upload_id"] for hit in hits]).in_bulk()
+    results = []
+    for hit in hits:
+        cv = uploads.get(hit["upload_id"])
+        if cv is None:
+            continue
+        results.append({
+            "id": cv.pk,
+            "filename": cv.filename,
+            "target_job_role": cv.target_job_role,
+            "job_match_score": cv.job_match_score,
+            "overall_score": cv.overall_score,
+            "rank": hit["rank"],
+            "snippet": hit["snippet"],
+        })
+    return JsonResponse({"query": query, "results": results})
+
+
+@login_required
+def skill_search(request):
+    """
+    The user's CVs by skill: ?skills=sql,python&match=all|any&weighted=1,
+    answered from the skill index postings
+    """
+    skills = [s.strip() for s in (request.GET.get("skills") or "").split(",") if s.strip()]
+    match = request.GET.get("match") or skill_index.MATCH_ALL
+    if match not in (skill_index.MATCH_ALL, skill_index.MATCH_ANY):
+        return JsonResponse({"errors": {"match": ["Use 'all' or 'any'."]}}, status=400)
+    weighted = request.GET.get("weighted") in ("1", "true")
+
+    uploads = skill_index.find_uploads(
+        skills, match=match, weighted=weighted, queryset=CVUpload.objects.filter(user=request.user)
+    )
+    fields = [*CVUploadQuerySet.LISTING_FIELDS, "skill_hits", *(["skill_score"] if weighted else [])]
+    results = [
+        {**row, "uploaded_at": row["uploaded_at"].isoformat()} for row in uploads.values(*fields)[:100]
+    ]
+    return JsonResponse({"skills": skills, "match": match, "results": results})
 
 
 @login_required
@@ -186,16 +382,12 @@ def upload_and_suggest(request):
 
         try:
             parser = CVParser()
-            # Parse CV
-            parsed_data = parser.parse_cv(cv_upload.file.path, file_ext)
+            # Parse CV from the upload itself rather than re-reading storage
+            parsed_data = parser.parse_cv(file, file_ext)
             # Generate suggestions
             suggestions = generate_job_keyword_suggestions(parsed_data.get("raw_text", ""), job_name)
 
-            # Save CV info
-            cv_upload.raw_text = parsed_data.get("raw_text", "")
-            cv_upload.processed = True
-            cv_upload.suggestions = "\n".join(suggestions)
-            cv_upload.save()
+            _save_suggestions(cv_upload, parsed_data, suggestions)
 
         except Exception as e:
             messages.error(request, f"Error processing CV: {e}")
@@ -206,9 +398,62 @@ def upload_and_suggest(request):
     })
 
 
+def _save_suggestions(cv_upload, parsed_data, suggestions):
+    cv_upload.raw_text = parsed_data.get("raw_text", "")
+    cv_upload.processed = True
+    cv_upload.suggestions = "\n".join(suggestions)
+    cv_upload.save()
+
+
+@login_required
+async def upload_and_suggest_async(request):
+    """
+    upload_and_suggest() for ASGI servers: the CV is stored and saved while
+    it is parsed on the shared extraction executor.
+    """
+    template = "analyzer/upload_and_suggest.html"
+    if request.method != "POST":
+        return await sync_to_async(render)(request, template)
+
+    user = await request.auser()
+    file = (await sync_to_async(_uploaded_files, thread_sensitive=False)(request)).get("file")
+    job_name = (request.POST.get("job_name") or "").strip()
+    if not file or not job_name:
+        messages.error(request, "Please upload a CV and specify a job title.")
+        return await sync_to_async(render)(request, template)
+
+    file_ext = os.path.splitext(file.name)[1].lower()
+    if file_ext not in ['.pdf', '.doc', '.docx', '.txt']:
+        messages.error(request, "Unsupported file format.")
+        return await sync_to_async(render)(request, template)
+
+    file.seek(0)
+    data = await sync_to_async(file.read, thread_sensitive=False)()
+    cv_upload = CVUpload(user=user, file=file, target_job_role=job_name)
+    saving = asyncio.ensure_future(sync_to_async(cv_upload.save)())
+
+    suggestions = []
+    try:
+        try:
+            parsed_data = await async_jobs.aparse(CVParser(), data, file_ext)
+            suggestions = await sync_to_async(generate_job_keyword_suggestions, thread_sensitive=False)(
+                parsed_data.get("raw_text", ""), job_name
+            )
+        finally:
+            await saving
+        await sync_to_async(_save_suggestions)(cv_upload, parsed_data, suggestions)
+    except Exception as e:
+        messages.error(request, f"Error processing CV: {e}")
+
+    return await sync_to_async(render)(request, template, {
+        "cv": cv_upload,
+        "suggestions": suggestions
+    })
+
+
 @login_required
 def cv_suggestions(request, cv_id):
-    cv = get_object_or_404(CVUpload, id=cv_id, user=request.user, processed=True)
+    cv = get_object_or_404(CVUpload.objects.with_content(), id=cv_id, user=request.user, processed=True)
     suggestions = (cv.suggestions or "").strip()
     return render(request, "analyzer/cv_suggestions.html", {
         "cv": cv,
@@ -216,6 +461,112 @@ def cv_suggestions(request, cv_id):
     })
 
 
+# --------------------------------------------------
+# BATCH API (session or token authentication)
+# --------------------------------------------------
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def api_create_batch(request):
+    """
+    Queue a batch from multipart CV files (`cv_files`) and/or a zip/tar
+    `archive`, with job criteria; `store=false` analyzes the files without
+    keeping them. Responds 202 with the batch id, links and the archive
+    members that were skipped.
+    """
+    serializer = BatchCreateSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    try:
+        batch = jobs.submit_batch(
+            request.user,
+            serializer.files(),
+            serializer.validated_data["job_name"],
+            serializer.criteria(),
+            store=serializer.validated_data["store"]
+        )
+    except (archives.ArchiveError, jobs.EmptyBatch) as e:
+        return Response(
+            {"errors": {"files": [str(e)]}, "rejected": serializer.rejected()},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    batch.refresh_from_db()
+    return Response(
+        {**CVBatchSerializer(batch).data, **_batch_links(request, batch), "rejected": serializer.rejected()},
+        status=status.HTTP_202_ACCEPTED
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def api_batch_detail(request, batch_id):
+    batch = get_object_or_404(CVBatch, pk=batch_id, user=request.user)
+    return Response({**CVBatchSerializer(batch).data, **_batch_links(request, batch)})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def api_batch_results(request, batch_id):
+    """
+    Processed CVs of a batch, best match first: ?limit=&cursor= page through
+    them, ?fields=id,filename,... pick fields (CVResultSerializer.Meta.fields;
+    text fields are only returned when asked for), and the
+    CandidateFilterForm parameters (min_years, min_degree, must_have) filter.
+    """
+    batch = get_object_or_404(CVBatch, pk=batch_id, user=request.user)
+    filter_form = CandidateFilterForm(request.query_params)
+    if not filter_form.is_valid():
+        return Response({"errors": filter_form.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    fields = CVResultSerializer.DEFAULT_FIELDS
+    if request.query_params.get("fields"):
+        fields = [name.strip() for name in request.query_params["fields"].split(",") if name.strip()]
+        unknown = sorted(set(fields) - set(CVResultSerializer.Meta.fields))
+        if unknown:
+            return Response(
+                {"errors": {"fields": [f"Unknown fields: {', '.join(unknown)}."]}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    try:
+        limit = min(max(1, int(request.query_params.get("limit") or ranking.page_size())), 500)
+        page = ranking.rank_candidates(
+            CVUpload.objects.filter(batch=batch).only(*CVResultSerializer.columns(fields)),
+            limit=limit,
+            cursor=request.query_params.get("cursor"),
+            **filter_form.filters()
+        )
+    except ValueError:
+        return Response({"errors": {"cursor": ["Invalid cursor or limit."]}}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Extracted text of the whole page in one query, only the columns asked for
+    texts = {}
+    text_fields = [name for name in fields if name in CONTENT_TEXT_FIELDS]
+    if text_fields and page.cvs:
+        contents = CVContent.objects.only("upload_id", "packed", *text_fields).in_bulk([cv.pk for cv in page.cvs])
+        texts = {pk: content.texts(text_fields) for pk, content in contents.items()}
+
+    next_url = None
+    if page.next_cursor:
+        query = request.query_params.copy()
+        query["cursor"] = page.next_cursor
+        next_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+    return Response({
+        "batch_id": str(batch.pk),
+        "status": batch.status,
+        "next_cursor": page.next_cursor,
+        "next": next_url,
+        "results": CVResultSerializer(page.cvs, many=True, fields=fields, context={"texts": texts}).data,
+    })
+
+
+def _batch_links(request, batch):
+    return {
+        "status_url": request.build_absolute_uri(reverse("api_batch_detail", args=[batch.pk])),
+        "results_url": request.build_absolute_uri(reverse("api_batch_results", args=[batch.pk])),
+    }
+
+
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def api_delete_cv(request, cv_id):
@@ -223,4 +574,6 @@ def api_delete_cv(request, cv_id):
     if cv.file and default_storage.exists(cv.file.name):
         default_storage.delete(cv.file.name)
     cv.delete()
+    if cv.batch_id:
+        results_cache.invalidate(cv.batch_id)
     return Response({"message": "CV deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
@@ -132,6 +132,12 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # Concurrent writers (background batches, async uploads) wait
+            # for the write lock instead of failing with "database is locked"
+            'OPTIONS': {
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
         }
     }
 
@@ -266,6 +272,83 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024   # 10MB
 
+# CV job queue: "thread" (background threads in the web process),
+# "worker" (run `python manage.py process_cv_queue`) or "sync" (inline)
+CV_QUEUE_MODE = os.getenv('CV_QUEUE_MODE', 'thread')
+CV_QUEUE_WORKERS = int(os.getenv('CV_QUEUE_WORKERS', '1'))
+# Seconds a claimed CV may go without progress before another worker (or
+# the next thread-mode batch) claims it again
+CV_CLAIM_LEASE = int(os.getenv('CV_CLAIM_LEASE', '600'))
+
+# Zip/tar uploads: most files and total uncompressed bytes per archive
+CV_ARCHIVE_MAX_MEMBERS = int(os.getenv('CV_ARCHIVE_MAX_MEMBERS', '500'))
+CV_ARCHIVE_MAX_TOTAL_SIZE = int(os.getenv('CV_ARCHIVE_MAX_TOTAL_SIZE', str(200 * 1024 * 1024)))
+
+# Rows per INSERT/UPDATE statement when queueing and saving batch uploads
+CV_BULK_BATCH_SIZE = int(os.getenv('CV_BULK_BATCH_SIZE', '500'))
+
+# Store extracted CV text zlib-compressed in CVContent.packed (not searchable
+# from the admin; existing rows stay as they are)
+CV_CONTENT_COMPRESS = os.getenv('CV_CONTENT_COMPRESS', 'False') == 'True'
+
+# Ranked results per page (matched_results and the batch ranking API)
+CV_RESULTS_PAGE_SIZE = int(os.getenv('CV_RESULTS_PAGE_SIZE', '50'))
+
+# Progress events (analyzer.progress): processing saves what it has scored
+# at least this often (seconds), the event stream polls for finished CVs
+# this often, and a stream ends after CV_PROGRESS_STREAM_TIMEOUT seconds
+# (the browser reconnects and resumes). Under WSGI there is no stream:
+# each request gets what is new, and browsers ask again after twice the
+# poll interval
+CV_PROGRESS_FLUSH_INTERVAL = float(os.getenv('CV_PROGRESS_FLUSH_INTERVAL', '1'))
+CV_PROGRESS_POLL_INTERVAL = float(os.getenv('CV_PROGRESS_POLL_INTERVAL', '0.5'))
+CV_PROGRESS_STREAM_TIMEOUT = float(os.getenv('CV_PROGRESS_STREAM_TIMEOUT', '300'))
+
+# Parse results are cached by file SHA-256 + parser version so re-uploaded
+# CVs skip text extraction. The file backend is shared by all worker
+# processes; MAX_ENTRIES bounds its size (old entries are culled).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'cv_parse': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CV_PARSE_CACHE_DIR', str(BASE_DIR / '.cache' / 'cv_parse')),
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CV_PARSE_CACHE_MAX_ENTRIES', '5000')),
+        },
+    },
+    # Rendered results of finished batches; set CV_RESULTS_CACHE_DIR to share
+    # them between worker processes through the file backend
+    'cv_results': {
+        'BACKEND': (
+            'django.core.cache.backends.filebased.FileBasedCache'
+            if os.getenv('CV_RESULTS_CACHE_DIR')
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CV_RESULTS_CACHE_DIR', 'cv-results'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CV_RESULTS_CACHE_MAX_ENTRIES', '1000')),
+        },
+    },
+}
+CV_PARSE_CACHE_ALIAS = 'cv_parse'
+CV_RESULTS_CACHE_ALIAS = 'cv_results'
+CV_RESULTS_CACHE_TIMEOUT = int(os.getenv('CV_RESULTS_CACHE_TIMEOUT', '3600'))
+
+# CVParser.parse_many process pool size (defaults to the CPU count) and
+# per-file parse timeout in seconds. The timeout is enforced in pool worker
+# processes; with one worker, files parsed inline by a queue thread have none
+CV_PARSER_WORKERS = int(os.getenv('CV_PARSER_WORKERS', '0')) or None
+CV_PARSE_TIMEOUT = float(os.getenv('CV_PARSE_TIMEOUT', '30'))
+
+# PDF streaming limits for queued uploads: stop after this many pages /
+# characters, and optionally once every CV section has been seen
+CV_PDF_MAX_PAGES = int(os.getenv('CV_PDF_MAX_PAGES', '20')) or None
+CV_PDF_MAX_CHARS = int(os.getenv('CV_PDF_MAX_CHARS', '200000')) or None
+CV_PDF_EARLY_STOP = os.getenv('CV_PDF_EARLY_STOP', 'False') == 'True'
+
 LOGIN_URL = '/accounts/google/login/'  
 
 # settings.py
@@ -0,0 +1,114 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+from utiliy.keyword import KEYWORDS
+
+_NON_ALPHA_RE = re.compile(r'[^a-z\s]')
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and remove non-alphabetic characters for comparison."""
+    return _NON_ALPHA_RE.sub('', text.lower())
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of patterns, compiled into a
+    DFA so matching is a single dict lookup per input character.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        goto: List[Dict[str, int]] = [{}]
+        fail: List[int] = [0]
+        output: List[Tuple[str, ...]] = [()]
+
+        for pattern in set(patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    fail.append(0)
+                    output.append(())
+                    nxt = len(goto) - 1
+                    goto[state][ch] = nxt
+                state = nxt
+            output[state] = (pattern,)
+
+        # Breadth-first: fill failure links, inherit outputs and build the
+        # DFA rows. Transitions that lead back to the root are left out and
+        # resolved with dict.get(ch, 0) while matching.
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{}] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            row = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                output[nxt] = output[nxt] + output[fail[nxt]]
+                row[ch] = nxt
+                queue.append(nxt)
+            delta[state] = row
+
+        self._delta = delta
+        self._output = output
+
+    def find(self, text: str) -> Set[str]:
+        """Return every pattern that occurs in `text` as a substring."""
+        delta = self._delta
+        output = self._output
+        state = 0
+        hits = set()
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                hits.add(state)
+
+        found = set()
+        for state in hits:
+            found.update(output[state])
+        return found
+
+
+class KeywordMatcher:
+    """
+    Finds role keywords in a resume. Matching follows the original rule: a
+    keyword is present when its normalized form is a substring of the
+    normalized resume. match_role() checks one role's keywords directly;
+    scan() finds the keywords of every role with one automaton pass, for
+    callers that query all roles.
+    """
+
+    def __init__(self, keywords_by_role: Dict[str, List[str]]):
+        self._roles = {
+            role: [(keyword, normalize_text(keyword)) for keyword in keywords]
+            for role, keywords in keywords_by_role.items()
+        }
+        self._automaton = KeywordAutomaton(
+            norm for keywords in self._roles.values() for _, norm in keywords
+        )
+
+    def scan(self, resume_text: str) -> Set[str]:
+        """Normalized keywords (of any role) present in the resume."""
+        return self._automaton.find(normalize_text(resume_text))
+
+    def match_role(self, role: str, resume_text: str) -> Tuple[List[str], List[str]]:
+        """Split a role's keywords into (present, missing) for one resume."""
+        resume = normalize_text(resume_text)
+        present = [k for k, norm in self._roles[role] if norm in resume]
+        missing = [k for k, _ in self._roles[role] if k not in present]
+        return present, missing
+
+    def split_keywords(self, role: str, found: Set[str]) -> Tuple[List[str], List[str]]:
+        """Split a role's keywords into (present, missing) given scan() output."""
+        present = [k for k, norm in self._roles[role] if not norm or norm in found]
+        missing = [k for k, _ in self._roles[role] if k not in present]
+        return present, missing
+
+
+# Built once at import from the role table
+KEYWORD_MATCHER = KeywordMatcher(KEYWORDS)
+
@@ -0,0 +1,88 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from utiliy.keyword import KEYWORDS
+from utiliy.keyword_matcher import normalize_text
+
+MIN_OVERLAP = 0.3  # minimum 30% overlap
+MIN_FUZZY_TOKEN_LENGTH = 4  # short tokens (qa, ml, ui...) are never typo-corrected
+
+
+def _deletes(token: str) -> Set[str]:
+    """Every variant of `token` with one character removed."""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+class JobTitleIndex:
+    """
+    Inverted index from normalized title tokens to roles.
+
+    Resolution keeps the original overlap rule: the role with the highest
+    |user words & title words| / max(|user words|, |title words|) wins,
+    earlier roles win ties. Only roles sharing a token with the query are
+    scored. Query tokens not in the vocabulary are corrected to a known
+    token within one edit using a precomputed delete table.
+    """
+
+    def __init__(self, titles: Iterable[str]):
+        self._titles: List[str] = []
+        self._title_words: List[Set[str]] = []
+        self._postings: Dict[str, List[int]] = {}
+        for title in titles:
+            words = set(normalize_text(title).split())
+            position = len(self._titles)
+            self._titles.append(title)
+            self._title_words.append(words)
+            for word in words:
+                self._postings.setdefault(word, []).append(position)
+
+        self._delete_table: Dict[str, Set[str]] = {}
+        for word in self._postings:
+            if len(word) < MIN_FUZZY_TOKEN_LENGTH:
+                continue
+            for variant in _deletes(word) | {word}:
+                self._delete_table.setdefault(variant, set()).add(word)
+
+        self.resolve = lru_cache(maxsize=1024)(self._resolve)
+
+    def correct_token(self, token: str) -> str:
+        """Return the known token closest to `token`, or `token` itself."""
+        if token in self._postings or len(token) < MIN_FUZZY_TOKEN_LENGTH:
+            return token
+        candidates = set(self._delete_table.get(token, ()))
+        for variant in _deletes(token):
+            candidates.update(self._delete_table.get(variant, ()))
+        if not candidates:
+            return token
+        # Prefer the token used by most titles, then alphabetical for stability
+        return min(candidates, key=lambda word: (-len(self._postings[word]), word))
+
+    def _resolve(self, user_job_title: str) -> Optional[str]:
+        user_words = {self.correct_token(word) for word in normalize_text(user_job_title).split()}
+        if not user_words:
+            return None
+
+        shared: Dict[int, int] = {}
+        for word in user_words:
+            for position in self._postings.get(word, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        best_match = None
+        best_score = 0
+        for position in sorted(shared):
+            overlap = shared[position] / max(len(user_words), len(self._title_words[position]))
+            if overlap > best_score:
+                best_score = overlap
+                best_match = self._titles[position]
+        return best_match if best_score >= MIN_OVERLAP else None
+
+
+# Built once at import from the role table
+JOB_TITLE_INDEX = JobTitleIndex(KEYWORDS.keys())
+
+
+def resolve_job_title(user_job_title: str) -> Optional[str]:
+    """Best matching role in KEYWORDS for a free-text job title, or None."""
+    if not user_job_title:
+        return None
+    return JOB_TITLE_INDEX.resolve(user_job_title)